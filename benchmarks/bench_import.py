@@ -0,0 +1,102 @@
+"""
+Measures the cold start cost of the package: the time to run each statement in STATEMENTS in a fresh interpreter,
+and which of the heavy optional dependencies it loaded.
+
+    python benchmarks/bench_import.py [--repeat 10] [--save results.json] [--compare results.json]
+
+--compare exits with status 1 when a statement is more than --tolerance times slower than the saved run.
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+from typing import Dict, List
+
+STATEMENTS = {
+    "package": "import tradier_python",
+    "client": "from tradier_python import TradierAPI",
+    "client_and_models": "from tradier_python import TradierAPI, Quote",
+    "first_parse": (
+        "from tradier_python import TradierAPI\n"
+        "from tradier_python.models import MarketsAPIResponse\n"
+        "MarketsAPIResponse(clock=None)"
+    ),
+    "async_client": "from tradier_python import AsyncTradierAPI",
+}
+HEAVY_MODULES = ("pydantic", "requests", "httpx", "numpy", "websockets")
+
+_PROBE = """
+import sys
+from time import perf_counter
+start = perf_counter()
+exec(compile(sys.argv[1], "<statement>", "exec"))
+elapsed = perf_counter() - start
+print(elapsed, *[m for m in sys.argv[2:] if m in sys.modules])
+"""
+
+
+def measure(statement: str) -> (float, List[str]):
+    """(seconds, heavy modules loaded) of running statement in a fresh interpreter"""
+    output = subprocess.run(
+        [sys.executable, "-c", _PROBE, statement, *HEAVY_MODULES],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout.split()
+    return float(output[0]), output[1:]
+
+
+def run(repeat: int = 10) -> Dict[str, dict]:
+    results = {}
+    for name, statement in STATEMENTS.items():
+        runs = [measure(statement) for _ in range(repeat)]
+        results[name] = {
+            "seconds": min(seconds for seconds, _ in runs),
+            "modules": runs[0][1],
+        }
+    return results
+
+
+def report(results: Dict[str, dict]):
+    for name, result in results.items():
+        modules = ", ".join(result["modules"]) or "-"
+        print(f"{name:<20} {result['seconds'] * 1000:8.1f} ms   loads: {modules}")
+
+
+def regressions(results: dict, baseline: dict, tolerance: float) -> list:
+    """descriptions of statements that got slower than tolerance times the baseline"""
+    found = []
+    for name, result in results.items():
+        then = baseline.get(name, {}).get("seconds")
+        if then and result["seconds"] > then * tolerance:
+            found.append(
+                f"{name}: {result['seconds'] * 1000:.1f} ms, was {then * 1000:.1f} ms"
+            )
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--save")
+    parser.add_argument("--compare")
+    parser.add_argument("--tolerance", type=float, default=1.25)
+    args = parser.parse_args()
+
+    results = run(args.repeat)
+    report(results)
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(results, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            found = regressions(results, json.load(f), args.tolerance)
+        for line in found:
+            print(f"REGRESSION {line}")
+        if found:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
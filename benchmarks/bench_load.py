@@ -0,0 +1,132 @@
+"""
+Load test of TradierAPI against LocalTradierServer under simulated production conditions: network latency, a rate of
+failing requests and Tradier's rate limits. Runs --requests calls from --workers threads and reports throughput,
+response statuses and per-endpoint latency percentiles (from a MetricsCollector).
+
+    python benchmarks/bench_load.py [--requests 500] [--workers 8] [--latency 0.02] [--jitter 0.01]
+                                    [--error-rate 0.01] [--rate-limit 120] [--cassette cassette.json]
+
+The workload alternates quotes and orders requests served from the recorded fixtures in benchmarks/fixtures; with
+--cassette, responses come from a recorded cassette instead (see tradier_python.transport).
+"""
+
+import argparse
+import itertools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List
+
+from bench_parse import load_fixture
+from tradier_python import MetricsCollector, TradierAPI, TradierAPIError
+from tradier_python.local_server import LocalTradierServer
+from tradier_python.transport import Cassette
+
+WORKLOAD: List[Callable[[TradierAPI], object]] = [
+    lambda t: t.get_quotes("AAPL,SPY"),
+    lambda t: t.get_orders(),
+]
+
+
+def run(
+    requests: int = 500,
+    workers: int = 8,
+    latency: float = 0.02,
+    jitter: float = 0.01,
+    error_rate: float = 0.01,
+    rate_limit: int = None,
+    cassette: str = None,
+    seed: int = 0,
+) -> dict:
+    responses = {
+        "/v1/markets/quotes": load_fixture("quotes.json"),
+        "/v1/accounts/VA000000/orders": load_fixture("orders.json"),
+    }
+    limits = None
+    if rate_limit:
+        limits = {"market": rate_limit, "standard": rate_limit, "trading": rate_limit}
+    server = LocalTradierServer(
+        responses,
+        cassette=Cassette.load(cassette) if cassette else None,
+        latency=(max(latency - jitter, 0.0), latency + jitter),
+        error_rate=error_rate,
+        rate_limits=limits,
+        seed=seed,
+    )
+    collector = MetricsCollector()
+    calls = itertools.cycle(WORKLOAD)
+    lock = threading.Lock()
+    errors = 0
+
+    def call(_):
+        nonlocal errors
+        with lock:
+            fn = next(calls)
+        try:
+            fn(t)
+        except TradierAPIError:
+            with lock:
+                errors += 1
+
+    with server:
+        t = TradierAPI("token", "VA000000", endpoint=server.url, hooks=[collector])
+        for session in (t.session, t.trading_session):
+            adapter = session.get_adapter(server.url)
+            adapter.init_poolmanager(workers, workers)
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(call, range(requests)))
+        elapsed = time.perf_counter() - start
+        t.close()
+        statuses = dict(server.statuses)
+    return {
+        "requests": requests,
+        "seconds": elapsed,
+        "throughput": requests / elapsed,
+        "errors": errors,
+        "statuses": statuses,
+        "endpoints": collector.summary(),
+    }
+
+
+def report(results: dict):
+    print(
+        f"{results['requests']} requests in {results['seconds']:.2f} s "
+        f"({results['throughput']:.0f}/s), {results['errors']} failed, statuses {results['statuses']}"
+    )
+    print(f"  {'endpoint':<44} {'count':>6} {'p50':>9} {'p90':>9} {'p99':>9}")
+    for name, endpoint in results["endpoints"].items():
+        total = endpoint["total"]
+        print(
+            f"  {name:<44} {endpoint['count']:>6} {total['p50'] * 1000:6.1f} ms "
+            f"{total['p90'] * 1000:6.1f} ms {total['p99'] * 1000:6.1f} ms"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=0.02)
+    parser.add_argument("--jitter", type=float, default=0.01)
+    parser.add_argument("--error-rate", type=float, default=0.01)
+    parser.add_argument("--rate-limit", type=int)
+    parser.add_argument("--cassette")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    report(
+        run(
+            args.requests,
+            args.workers,
+            args.latency,
+            args.jitter,
+            args.error_rate,
+            args.rate_limit,
+            args.cassette,
+            args.seed,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
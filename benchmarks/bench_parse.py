@@ -0,0 +1,74 @@
+"""
+Times response parsing in each parse mode on the recorded fixtures in benchmarks/fixtures.
+
+    python benchmarks/bench_parse.py [--quotes 1000] [--repeat 20]
+"""
+
+import argparse
+import copy
+import json
+import os
+import timeit
+
+from tradier_python.models import MarketsAPIResponse
+from tradier_python.parsing import PARSE_MODES, parse_response
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures")
+
+
+def load_fixture(name: str) -> dict:
+    with open(os.path.join(FIXTURES, name)) as f:
+        return json.load(f)
+
+
+def quotes_payload(n: int) -> dict:
+    """scales the recorded quotes response up to n quotes"""
+    recorded = load_fixture("quotes.json")["quotes"]["quote"]
+    quotes = []
+    for i in range(n):
+        quote = copy.deepcopy(recorded[i % len(recorded)])
+        quote["symbol"] = f"{quote['symbol']}{i}"
+        quotes.append(quote)
+    return {"quotes": {"quote": quotes}}
+
+
+def bench_quotes(n: int, repeat: int) -> dict:
+    """best time per parse mode, for parsing alone and for decoding the response body and parsing it"""
+    data = quotes_payload(n)
+    body = json.dumps(data).encode("utf-8")
+    results = {}
+    for mode in PARSE_MODES:
+        parse = timeit.Timer(
+            lambda: parse_response(mode, MarketsAPIResponse, data, "quotes", "quote")
+        )
+        decode_parse = timeit.Timer(
+            lambda: parse_response(
+                mode, MarketsAPIResponse, json.loads(body), "quotes", "quote"
+            )
+        )
+        results[mode] = (
+            min(parse.repeat(repeat=repeat, number=1)),
+            min(decode_parse.repeat(repeat=repeat, number=1)),
+        )
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--quotes", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    results = bench_quotes(args.quotes, args.repeat)
+    full_parse, full_total = results["full"]
+    print(f"{args.quotes} quotes, best of {args.repeat}")
+    print(f"  {'mode':<10} {'parse':>10} {'':>8} {'decode+parse':>14} {'':>6}")
+    for mode, (parse, total) in results.items():
+        print(
+            f"  {mode:<10} {parse * 1000:7.2f} ms {full_parse / parse:6.1f}x "
+            f"{total * 1000:11.2f} ms {full_total / total:5.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,227 @@
+"""
+Benchmarks response parsing and client overhead on the recorded fixtures in benchmarks/fixtures, scaled up to
+realistic response sizes. For every response shape it measures:
+
+* parse time in each parse mode, on the decoded JSON
+* peak and retained memory allocated while parsing (tracemalloc), in each parse mode
+* end to end time of the client call against a local server, and how much of it is spent on top of transport (a
+  bare requests GET of the same body): JSON decoding, request() bookkeeping and parsing. The time to decode the
+  body alone is reported alongside.
+
+    python benchmarks/bench_suite.py [--scale 1.0] [--repeat 10] [--save results.json] [--compare results.json]
+
+--compare exits with status 1 when a parse or client time is more than --tolerance times the saved one.
+"""
+
+import argparse
+import copy
+import json
+import sys
+import timeit
+import tracemalloc
+from datetime import date
+from typing import Callable, Dict, NamedTuple, Tuple
+
+import requests
+
+from bench_parse import load_fixture
+from tradier_python import TradierAPI
+from tradier_python.local_server import LocalTradierServer
+from tradier_python.models import AccountsAPIResponse, MarketsAPIResponse
+from tradier_python.parsing import PARSE_MODES, get_decoder, parse_response
+
+
+class Shape(NamedTuple):
+    fixture: str
+    size: int
+    path: str
+    model: type
+    keys: Tuple[str, ...]
+    call: Callable[[TradierAPI], object]
+
+
+SHAPES: Dict[str, Shape] = {
+    "option_chain": Shape(
+        "option_chain.json",
+        2000,
+        "/v1/markets/options/chains",
+        MarketsAPIResponse,
+        ("options", "option"),
+        lambda t: t.get_option_chains("AAPL", date(2021, 10, 15), greeks=True),
+    ),
+    "history": Shape(
+        "history.json",
+        10000,
+        "/v1/markets/history",
+        MarketsAPIResponse,
+        ("history", "day"),
+        lambda t: t.get_historical_quotes("AAPL"),
+    ),
+    "timesales_tick": Shape(
+        "timesales_tick.json",
+        20000,
+        "/v1/markets/timesales",
+        MarketsAPIResponse,
+        ("series", "data"),
+        lambda t: t.get_time_and_sales("AAPL", "tick"),
+    ),
+    "etb": Shape(
+        "etb.json",
+        10000,
+        "/v1/markets/etb",
+        MarketsAPIResponse,
+        ("securities", "security"),
+        lambda t: t.get_etb_list(),
+    ),
+    "orders": Shape(
+        "orders.json",
+        1000,
+        "/v1/accounts/VA000000/orders",
+        AccountsAPIResponse,
+        ("orders", "order"),
+        lambda t: t.get_orders(),
+    ),
+}
+
+
+def scaled_fixture(shape: Shape, scale: float = 1.0) -> dict:
+    """the recorded response of a shape with its items repeated up to shape.size * scale"""
+    data = load_fixture(shape.fixture)
+    outer, inner = shape.keys
+    recorded = data[outer][inner]
+    n = max(1, int(shape.size * scale))
+    data[outer][inner] = [copy.deepcopy(recorded[i % len(recorded)]) for i in range(n)]
+    return data
+
+
+def best(fn, repeat: int) -> float:
+    return min(timeit.Timer(fn).repeat(repeat=repeat, number=1))
+
+
+def allocations(fn) -> Tuple[int, int]:
+    """(peak, retained) bytes allocated while running fn"""
+    tracemalloc.start()
+    try:
+        result = fn()
+        retained, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del result
+    return peak, retained
+
+
+def bench_parse(shape: Shape, data: dict, repeat: int) -> dict:
+    results = {}
+    for mode in PARSE_MODES:
+        parse = lambda: parse_response(mode, shape.model, data, *shape.keys)
+        peak, retained = allocations(parse)
+        results[mode] = {
+            "parse": best(parse, repeat),
+            "peak_bytes": peak,
+            "retained_bytes": retained,
+        }
+    return results
+
+
+def bench_client(shape: Shape, body: bytes, repeat: int) -> dict:
+    with LocalTradierServer({shape.path: body}) as server:
+        session = requests.Session()
+        url = server.url.rstrip("/") + shape.path
+        transport = best(lambda: session.get(url).content, repeat)
+        decode = best(lambda: get_decoder()(body), repeat)
+        results = {"transport": transport, "decode": decode}
+        for mode in PARSE_MODES:
+            t = TradierAPI("token", "VA000000", endpoint=server.url, validate=mode)
+            total = best(lambda: shape.call(t), repeat)
+            results[mode] = {"total": total, "overhead": total - transport}
+        session.close()
+    return results
+
+
+def run(scale: float = 1.0, repeat: int = 10, shapes=None) -> dict:
+    results = {}
+    for name in shapes or SHAPES:
+        shape = SHAPES[name]
+        data = scaled_fixture(shape, scale)
+        body = json.dumps(data).encode("utf-8")
+        results[name] = {
+            "items": len(data[shape.keys[0]][shape.keys[1]]),
+            "bytes": len(body),
+            "parse": bench_parse(shape, data, repeat),
+            "client": bench_client(shape, body, repeat),
+        }
+    return results
+
+
+def report(results: dict):
+    for name, result in results.items():
+        client = result["client"]
+        print(
+            f"{name}: {result['items']} items, {result['bytes'] / 1024:.0f} KiB, "
+            f"transport {client['transport'] * 1000:.2f} ms, decode {client['decode'] * 1000:.2f} ms"
+        )
+        print(
+            f"  {'mode':<10} {'parse':>10} {'peak':>10} {'retained':>10} {'client':>10} {'overhead':>10}"
+        )
+        for mode in PARSE_MODES:
+            parse, total = result["parse"][mode], client[mode]
+            print(
+                f"  {mode:<10} {parse['parse'] * 1000:7.2f} ms {parse['peak_bytes'] / 1024:6.0f} KiB "
+                f"{parse['retained_bytes'] / 1024:6.0f} KiB {total['total'] * 1000:7.2f} ms "
+                f"{total['overhead'] * 1000:7.2f} ms"
+            )
+
+
+def regressions(results: dict, baseline: dict, tolerance: float) -> list:
+    """descriptions of parse and client times that got slower than tolerance times the baseline"""
+    found = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        for mode in PARSE_MODES:
+            pairs = (
+                (
+                    "parse",
+                    result["parse"][mode]["parse"],
+                    baseline[name]["parse"][mode]["parse"],
+                ),
+                (
+                    "client",
+                    result["client"][mode]["total"],
+                    baseline[name]["client"][mode]["total"],
+                ),
+            )
+            for what, now, then in pairs:
+                if then > 0 and now > then * tolerance:
+                    found.append(
+                        f"{name} {mode} {what}: {now * 1000:.2f} ms, was {then * 1000:.2f} ms"
+                    )
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--scale", type=float, default=1.0)
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--shape", action="append", choices=list(SHAPES))
+    parser.add_argument("--save")
+    parser.add_argument("--compare")
+    parser.add_argument("--tolerance", type=float, default=1.25)
+    args = parser.parse_args()
+
+    results = run(args.scale, args.repeat, args.shape)
+    report(results)
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(results, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            found = regressions(results, json.load(f), args.tolerance)
+        for line in found:
+            print(f"REGRESSION {line}")
+        if found:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
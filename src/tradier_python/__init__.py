@@ -1,2 +1,112 @@
-from tradier_python.models import *
-from tradier_python.tradier_api import TradierAPI, TradierAPIError
+"""
+Importing the package is cheap: the clients, the models and their dependencies (pydantic, requests, httpx, numpy,
+websockets) are only imported when one of the names below is first used.
+"""
+
+import importlib
+from typing import TYPE_CHECKING
+
+# public name -> module that defines it; the models are looked up in tradier_python.models
+_EXPORTS = {
+    "TradierAPI": "tradier_api",
+    "TradierAPIError": "tradier_api",
+    "TradierOrderError": "tradier_api",
+    "AsyncTradierAPI": "async_api",
+    "OptionChainFrame": "option_frame",
+    "OptionChainIndex": "option_chain",
+    "OptionSymbol": "occ",
+    "decode_option_symbol": "occ",
+    "decode_option_symbols": "occ",
+    "encode_option_symbol": "occ",
+    "encode_option_symbols": "occ",
+    "BarStore": "bar_store",
+    "EtbIndex": "etb",
+    "HistoryStore": "history_store",
+    "AsyncOrderTracker": "order_tracker",
+    "OrderTracker": "order_tracker",
+    "MetricsCollector": "instrumentation",
+    "RequestMetrics": "instrumentation",
+    "AsyncQuoteWatcher": "quote_watcher",
+    "QuoteWatcher": "quote_watcher",
+    "MemoryCacheBackend": "cache",
+    "ResponseCache": "cache",
+    "SqliteCacheBackend": "cache",
+    "RateLimiter": "ratelimit",
+    "AsyncRecordingTransport": "transport",
+    "Cassette": "transport",
+    "RecordingAdapter": "transport",
+    "AccountStream": "streaming",
+    "AsyncAccountStream": "streaming",
+    "AsyncMarketStream": "streaming",
+    "MarketStream": "streaming",
+    "OrderEvent": "streaming",
+}
+
+if TYPE_CHECKING:  # pragma: no cover
+    from tradier_python.models import *
+    from tradier_python.tradier_api import (
+        TradierAPI,
+        TradierAPIError,
+        TradierOrderError,
+    )
+    from tradier_python.async_api import AsyncTradierAPI
+    from tradier_python.option_frame import OptionChainFrame
+    from tradier_python.option_chain import OptionChainIndex
+    from tradier_python.occ import (
+        OptionSymbol,
+        decode_option_symbol,
+        decode_option_symbols,
+        encode_option_symbol,
+        encode_option_symbols,
+    )
+    from tradier_python.bar_store import BarStore
+    from tradier_python.etb import EtbIndex
+    from tradier_python.history_store import HistoryStore
+    from tradier_python.order_tracker import AsyncOrderTracker, OrderTracker
+    from tradier_python.instrumentation import MetricsCollector, RequestMetrics
+    from tradier_python.quote_watcher import AsyncQuoteWatcher, QuoteWatcher
+    from tradier_python.cache import (
+        MemoryCacheBackend,
+        ResponseCache,
+        SqliteCacheBackend,
+    )
+    from tradier_python.ratelimit import RateLimiter
+    from tradier_python.transport import (
+        AsyncRecordingTransport,
+        Cassette,
+        RecordingAdapter,
+    )
+    from tradier_python.streaming import (
+        AccountStream,
+        AsyncAccountStream,
+        AsyncMarketStream,
+        MarketStream,
+        OrderEvent,
+    )
+
+
+def _model_names() -> list:
+    return importlib.import_module("tradier_python.models").__all__
+
+
+def _public_names() -> list:
+    return sorted(set(_EXPORTS) | set(_model_names()))
+
+
+def __getattr__(name: str):
+    module = _EXPORTS.get(name)
+    if name == "__all__":
+        # `from tradier_python import *` imports the exports and the API models listed in models.__all__
+        value = _public_names()
+    elif module is not None:
+        value = getattr(importlib.import_module(f"tradier_python.{module}"), name)
+    elif not name.startswith("_") and name in _model_names():
+        value = getattr(importlib.import_module("tradier_python.models"), name)
+    else:
+        raise AttributeError(f"module 'tradier_python' has no attribute {name!r}")
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_public_names()))
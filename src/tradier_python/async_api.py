@@ -0,0 +1,1089 @@
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import date, datetime, timedelta
+from time import perf_counter
+from typing import (
+    TYPE_CHECKING,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+from urllib.parse import urljoin
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover - optional dependency
+    httpx = None
+
+from tradier_python.cache import ResponseCache
+from tradier_python.instrumentation import Instrumented, RequestMetrics, lane
+from tradier_python.models import *
+from tradier_python.parsing import (
+    JSONArrayParser,
+    check_parse_mode,
+    get_decoder,
+    parse_response,
+    raw_value,
+)
+from tradier_python.ratelimit import RateLimiter
+from tradier_python.stats import LatencyStats
+from tradier_python.timesales import (
+    TIMESALES_PATH,
+    TIMESALES_WINDOWS,
+    time_windows,
+    timesales_columns,
+    to_datetime,
+    window_filter,
+    window_params,
+)
+from tradier_python.tradier_api import (
+    MAX_QUERY_SYMBOLS_LENGTH,
+    QUOTES_BATCH_SIZE,
+    RESUBMITTABLE_STATUSES,
+    TradierAPIError,
+    TradierOrderError,
+    check_order_errors,
+    check_unique_tags,
+    chunked,
+    is_uncertain_failure,
+    merge_quotes,
+    new_order_tag,
+    split_symbols,
+)
+
+if TYPE_CHECKING:  # pragma: no cover
+    from tradier_python.option_frame import OptionChainFrame
+    from tradier_python.option_chain import OptionChainIndex
+
+
+async def aiter_pages(
+    fetch_page: Callable[[int], Awaitable[list]], limit: int = None
+) -> AsyncIterator:
+    """
+    Yields the items of pages 1, 2, ... returned by fetch_page, requesting page n + 1 while the items of page n are
+    consumed. Stops after an empty page or a page shorter than limit.
+    """
+    page = 1
+    task = asyncio.ensure_future(fetch_page(page))
+    try:
+        while True:
+            items = await task
+            if not items:
+                return
+            if limit is not None and len(items) < limit:
+                for item in items:
+                    yield item
+                return
+            page += 1
+            task = asyncio.ensure_future(fetch_page(page))
+            for item in items:
+                yield item
+    finally:
+        task.cancel()
+
+
+def clean_params(params: dict) -> dict:
+    """Drop unset parameters and stringify the rest the same way requests does, so both clients send identical
+    query strings."""
+    return {
+        k: v if isinstance(v, (str, bytes)) else str(v)
+        for k, v in params.items()
+        if v is not None
+    }
+
+
+class AsyncTradierAPI(Instrumented):
+    """
+    Asyncio client for the Tradier API. Exposes the same endpoint methods as TradierAPI, but every method is a
+    coroutine and all requests share one non-blocking connection pool, so many calls can be in flight at once.
+
+    Order placement, modification and cancellation use a separate trading client with its own pool. Call
+    warm_up_trading (or start_trading_keepalive) to open the trading connection before the first order.
+
+    hooks and decoder work as with TradierAPI; transport is an httpx transport, such as AsyncRecordingTransport.
+    """
+
+    def __init__(
+        self,
+        token,
+        default_account_id=None,
+        endpoint=None,
+        max_connections: int = 100,
+        timeout: float = 30.0,
+        validate: str = "full",
+        cache: ResponseCache = None,
+        rate_limiter: RateLimiter = None,
+        hooks: Iterable[Callable] = None,
+        decoder: Union[str, Callable] = None,
+        transport: "httpx.AsyncBaseTransport" = None,
+    ):
+        if httpx is None:
+            raise ImportError(
+                "AsyncTradierAPI requires httpx. Install it with `pip install tradier-python[async]`."
+            )
+
+        self.default_account_id = default_account_id
+        self.endpoint = endpoint if endpoint else SANDBOX_ENDPOINT
+        self.validate = check_parse_mode(validate)
+        self.decode = get_decoder(decoder)
+        self.cache = cache
+        self.rate_limiter = rate_limiter
+        self.hooks = list(hooks or [])
+        headers = {
+            "Authorization": f"Bearer {token}",
+            "Accept": "application/json",
+        }
+        self.session = httpx.AsyncClient(
+            headers=headers,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+            ),
+            timeout=timeout,
+            transport=transport,
+        )
+        self.trading_session = httpx.AsyncClient(
+            headers=headers, timeout=timeout, transport=transport
+        )
+        self.lane_stats = {"data": LatencyStats(), "trading": LatencyStats()}
+        self._keepalive_task = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+    async def aclose(self):
+        """stops the keepalive task and closes both connection pools"""
+        self.flush_metrics()
+        self.stop_trading_keepalive()
+        await self.session.aclose()
+        await self.trading_session.aclose()
+
+    async def warm_up_trading(self):
+        """Opens (or refreshes) the trading connection so the next order does not pay for the TLS handshake."""
+        try:
+            await self.trading_session.head(self.endpoint)
+        except httpx.HTTPError:
+            pass
+
+    async def start_trading_keepalive(self, interval: float = 30.0):
+        """Warms up the trading connection and pings it every interval seconds from a background task."""
+        self.stop_trading_keepalive()
+        await self.warm_up_trading()
+
+        async def ping():
+            while True:
+                await asyncio.sleep(interval)
+                await self.warm_up_trading()
+
+        self._keepalive_task = asyncio.ensure_future(ping())
+
+    def stop_trading_keepalive(self):
+        if self._keepalive_task is not None:
+            self._keepalive_task.cancel()
+            self._keepalive_task = None
+
+    def latency_stats(self) -> Dict[str, Dict[str, float]]:
+        """round-trip latency summary (seconds) of the "data" and "trading" lanes"""
+        return {lane: stats.summary() for lane, stats in self.lane_stats.items()}
+
+    async def request(
+        self, method: str, path: str, params: dict, data: dict = None
+    ) -> dict:
+        if method.upper() == "GET" and self.cache is not None:
+            cached = self.cache.get(path, params)
+            if cached is not None:
+                # an earlier response still waiting to be parsed must not be reported with this one's parse
+                self.flush_metrics()
+                self._cached_metrics(method, path)
+                return cached
+
+        response, metrics = await self._send(method, path, params, data)
+        start = perf_counter()
+        res_json = self.decode(response.content)
+        if metrics is not None:
+            metrics.decode = perf_counter() - start
+            self._defer(metrics)
+        if method.upper() == "GET" and self.cache is not None:
+            self.cache.set(path, params, res_json)
+        return res_json
+
+    async def _send(
+        self,
+        method: str,
+        path: str,
+        params: dict,
+        data: dict = None,
+        stream: bool = False,
+    ) -> Tuple["httpx.Response", Optional[RequestMetrics]]:
+        """sends a request, reading its body unless stream, and returns the response with its metrics if there are
+        hooks"""
+        self.flush_metrics()
+        start = perf_counter()
+        if self.rate_limiter is not None:
+            delay = self.rate_limiter.reserve(method, path)
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+        url = urljoin(self.endpoint, path)
+
+        request_lane = lane(method, path)
+        session = self.trading_session if request_lane == "trading" else self.session
+        sent = perf_counter()
+        request = session.build_request(
+            method.upper(),
+            url,
+            params=clean_params(params),
+            data=clean_params(data) if data else None,
+        )
+        response = await session.send(request, stream=True)
+        headers_received = perf_counter()
+        read = not stream or response.status_code != 200
+        if read:
+            await response.aread()
+        received = perf_counter()
+        self.lane_stats[request_lane].add(received - sent)
+        if self.rate_limiter is not None:
+            self.rate_limiter.update(
+                method, path, response.status_code, response.headers
+            )
+        metrics = self._response_metrics(
+            method, path, request_lane, response, sent - start, headers_received - sent
+        )
+        if metrics is not None and read:
+            metrics.transfer = received - headers_received
+            metrics.bytes = len(response.content)
+
+        if response.status_code != 200:
+            if metrics is not None:
+                self._emit(metrics)
+            raise TradierAPIError(
+                response.status_code, response.content.decode("utf-8"), params
+            )
+        return response, metrics
+
+    @asynccontextmanager
+    async def stream(
+        self, method: str, path: str, params: dict, data: dict = None
+    ) -> AsyncIterator["httpx.Response"]:
+        """makes a request and yields the response before its body has been read, for reading it incrementally"""
+        response, metrics = await self._send(method, path, params, data, stream=True)
+        if metrics is not None:
+            self._emit(metrics)
+        try:
+            yield response
+        finally:
+            await response.aclose()
+
+    def _parse(self, model, data: dict, *path: str):
+        return self._parse_measured(
+            lambda: parse_response(self.validate, model, data, *path)
+        )
+
+    async def get(self, path: str, params: dict) -> dict:
+        """makes a GET request to an endpoint"""
+        return await self.request("GET", path, params)
+
+    async def post(self, path: str, params: dict, data: dict = None) -> dict:
+        """makes a POST request to an endpoint"""
+        return await self.request("POST", path, params, data)
+
+    async def delete(self, path: str, params: dict):
+        """makes a DELETE request to an endpoint"""
+        return await self.request("DELETE", path, params)
+
+    async def put(self, path: str, params):
+        """makes a PUT request to an endpoint"""
+        return await self.request("PUT", path, params)
+
+    async def get_profile(self) -> Profile:
+        """
+        The user’s profile contains information pertaining to the user and his/her accounts.
+        https://documentation.tradier.com/brokerage-api/user/get-profile
+        """
+        url = "/v1/user/profile"
+        data = await self.get(url, {})
+        return self._parse(AccountsAPIResponse, data, "profile")
+
+    async def get_balances(self, account_id=None) -> Balances:
+        """
+        Get balances information for a specific user account.
+        https://documentation.tradier.com/brokerage-api/accounts/get-account-balance
+        """
+        if account_id is None:
+            account_id = self.default_account_id
+        url = f"/v1/accounts/{account_id}/balances"
+        data = await self.get(url, {})
+        return self._parse(AccountsAPIResponse, data, "balances")
+
+    async def get_positions(self, account_id=None) -> List[Position]:
+        """Get the current positions being held in an account.
+        https://documentation.tradier.com/brokerage-api/accounts/get-account-positions
+        """
+        if account_id is None:
+            account_id = self.default_account_id
+        url = f"/v1/accounts/{account_id}/positions"
+        data = await self.get(url, {})
+        return self._parse(AccountsAPIResponse, data, "positions", "position")
+
+    async def get_history(
+        self,
+        account_id=None,
+        page: int = None,
+        limit: int = None,
+        history_type: str = None,
+        start: date = None,
+        end: date = None,
+        symbol: str = None,
+    ) -> List[Event]:
+
+        if account_id is None:
+            account_id = self.default_account_id
+        url = f"/v1/accounts/{account_id}/history"
+        params = {
+            "page": page,
+            "limit": limit,
+            "type": history_type,
+            "start": start,
+            "end": end,
+            "symbol": symbol,
+        }
+        data = await self.get(url, params)
+        return self._parse(
+            AccountsAPIResponse,
+            data,
+            "history",
+            "event",
+        )
+
+    async def get_gain_loss(
+        self,
+        page: int = None,
+        limit: int = None,
+        sort_by: str = None,
+        sort: str = None,
+        start: date = None,
+        end: date = None,
+        symbol: str = None,
+        account_id=None,
+    ) -> List[ClosedPosition]:
+        if account_id is None:
+            account_id = self.default_account_id
+        url = f"/v1/accounts/{account_id}/gainloss"
+        params = {
+            "page": page,
+            "limit": limit,
+            "sortBy": sort_by,
+            "sort": sort,
+            "start": start,
+            "end": end,
+            "symbol": symbol,
+        }
+        data = await self.get(url, params)
+        return self._parse(
+            AccountsAPIResponse,
+            data,
+            "gainloss",
+            "closed_position",
+        )
+
+    def iter_history(
+        self,
+        account_id=None,
+        limit: int = 100,
+        history_type: str = None,
+        start: date = None,
+        end: date = None,
+        symbol: str = None,
+    ) -> AsyncIterator[Event]:
+        """
+        Iterate over every page of account history. The next page is requested while the current one is consumed.
+        Iteration stops at the first empty page, or at a page shorter than limit.
+        """
+        return aiter_pages(
+            lambda page: self.get_history(
+                account_id, page, limit, history_type, start, end, symbol
+            ),
+            limit,
+        )
+
+    def iter_gain_loss(
+        self,
+        limit: int = 100,
+        sort_by: str = None,
+        sort: str = None,
+        start: date = None,
+        end: date = None,
+        symbol: str = None,
+        account_id=None,
+    ) -> AsyncIterator[ClosedPosition]:
+        """
+        Iterate over every page of closed positions. The next page is requested while the current one is consumed.
+        Iteration stops at the first empty page, or at a page shorter than limit.
+        """
+        return aiter_pages(
+            lambda page: self.get_gain_loss(
+                page, limit, sort_by, sort, start, end, symbol, account_id
+            ),
+            limit,
+        )
+
+    async def get_orders(
+        self,
+        include_tags: bool = True,
+        account_id=None,
+    ) -> List[Order]:
+        if account_id is None:
+            account_id = self.default_account_id
+        url = f"/v1/accounts/{account_id}/orders"
+        params = {"includeTags": include_tags}
+        data = await self.get(url, params)
+        return self._parse(AccountsAPIResponse, data, "orders", "order")
+
+    async def get_order(
+        self,
+        order_id: str,
+        include_tags: bool = False,
+        account_id=None,
+    ):
+        if account_id is None:
+            account_id = self.default_account_id
+        url = f"/v1/accounts/{account_id}/orders/{order_id}"
+        params = {"includeTags": include_tags}
+        data = await self.get(url, params)
+        return self._parse(AccountsAPIResponse, data, "order")
+
+    async def order(
+        self,
+        order_class: str,
+        symbol: str,
+        order_type: str,
+        duration: str,
+        quantity: Optional[int],
+        side: Optional[str],
+        limit_price: float = None,
+        stop_price: float = None,
+        tag: str = None,
+        account_id: str = None,
+        option_symbol: str = None,
+        option_symbol_0: str = None,
+        side_0: str = None,
+        quantity_0: int = None,
+        option_symbol_1: str = None,
+        side_1: str = None,
+        quantity_1: int = None,
+        option_symbol_2: str = None,
+        side_2: str = None,
+        quantity_2: int = None,
+        option_symbol_3: str = None,
+        side_3: str = None,
+        quantity_3: int = None,
+    ) -> OrderDetails:
+        """
+        Place an order to trade a security.
+        """
+        if account_id is None:
+            account_id = self.default_account_id
+        url = f"/v1/accounts/{account_id}/orders"
+        params = {
+            "class": order_class,
+            "symbol": symbol,
+            "option_symbol": option_symbol,
+            "side": side,
+            "quantity": quantity,
+            "type": order_type,
+            "duration": duration,
+            "price": limit_price,
+            "stop": stop_price,
+            "tag": tag,
+            "option_symbol[0]": option_symbol_0,
+            "side[0]": side_0,
+            "quantity[0]": quantity_0,
+            "option_symbol[1]": option_symbol_1,
+            "side[1]": side_1,
+            "quantity[1]": quantity_1,
+            "option_symbol[2]": option_symbol_2,
+            "side[2]": side_2,
+            "quantity[2]": quantity_2,
+            "option_symbol[3]": option_symbol_3,
+            "side[3]": side_3,
+            "quantity[3]": quantity_3,
+        }
+        params = {k: v for k, v in params.items() if v is not None}
+        data = await self.post(url, params)
+        check_order_errors(data)
+        return self._parse(OrderAPIResponse, data, "order")
+
+    async def submit_orders(
+        self, specs: Iterable[dict], max_workers: int = 8, retries: int = 1
+    ) -> List[Union[OrderDetails, Exception]]:
+        """
+        Place many orders with up to max_workers requests in flight (paced by the trading quota when the client
+        has a RateLimiter). Each spec holds the keyword arguments of order(). Returns, in input order, the
+        OrderDetails of each order or the exception it failed with, TradierOrderError when Tradier rejected it.
+
+        Orders are identified by their tag, so submitting is safe to retry: a spec whose tag is already on one of the
+        account's orders is not sent again and the existing order is returned instead. Specs without a tag get a
+        generated one, and an order whose request failed without a definite answer (a connection error or a 5xx) is
+        looked up by tag before being sent again, up to retries times. This only holds when every order has its own
+        tag, so a batch in which two specs of an account share a tag raises ValueError before anything is sent.
+        """
+        specs = [dict(spec) for spec in specs]
+        for spec in specs:
+            spec["account_id"] = spec.get("account_id") or self.default_account_id
+        check_unique_tags(specs)
+        accounts = sorted({spec["account_id"] for spec in specs if spec.get("tag")})
+        found = await asyncio.gather(*(self._orders_by_tag(a) for a in accounts))
+        existing = dict(zip(accounts, found))
+        for spec in specs:
+            spec["tag"] = spec.get("tag") or new_order_tag()
+        semaphore = asyncio.Semaphore(max_workers)
+
+        async def submit(spec):
+            orders = existing.get(spec["account_id"], {})
+            async with semaphore:
+                for attempt in range(retries + 1):
+                    if spec["tag"] in orders:
+                        # not a response, so it is parsed without taking the pending metrics of the order lookup
+                        return parse_response(
+                            self.validate,
+                            OrderAPIResponse,
+                            {"order": orders[spec["tag"]]},
+                            "order",
+                        )
+                    try:
+                        return await self.order(**spec)
+                    except Exception as e:
+                        if attempt == retries or not is_uncertain_failure(e):
+                            return e
+                        orders = await self._orders_by_tag(spec["account_id"])
+
+        return list(await asyncio.gather(*(submit(spec) for spec in specs)))
+
+    async def cancel_orders(
+        self, order_ids: Iterable, max_workers: int = 8, account_id=None
+    ) -> List[Union[OrderDetails, Exception]]:
+        """
+        Cancel many orders with up to max_workers requests in flight. Returns, in input order, the OrderDetails
+        of each cancellation or the exception it failed with.
+        """
+        semaphore = asyncio.Semaphore(max_workers)
+
+        async def cancel(order_id):
+            # only failures of the request are returned; cancelling the caller still cancels the batch
+            async with semaphore:
+                try:
+                    return await self.cancel_order(order_id, account_id)
+                except Exception as e:
+                    return e
+
+        return list(await asyncio.gather(*(cancel(order_id) for order_id in order_ids)))
+
+    async def _orders_by_tag(self, account_id: str) -> Dict[str, dict]:
+        """the account's live or filled orders by tag, as order details dicts"""
+        url = f"/v1/accounts/{account_id}/orders"
+        data = await self.get(url, {"includeTags": True})
+        orders = raw_value(AccountsAPIResponse, data, "orders", "order") or []
+        self.flush_metrics()
+        return {
+            order["tag"]: {
+                "id": order["id"],
+                "status": order["status"],
+                "partner_id": None,
+            }
+            for order in orders
+            if order.get("tag") and order.get("status") not in RESUBMITTABLE_STATUSES
+        }
+
+    async def order_equity(
+        self,
+        symbol: str,
+        side: str,
+        quantity: int,
+        order_type: str,
+        duration: str,
+        limit_price: float = None,
+        stop_price: float = None,
+        tag: str = None,
+        account_id: str = None,
+    ) -> OrderDetails:
+        """
+        Place an order to trade an equity security.
+        """
+        return await self.order(
+            order_class="equity",
+            symbol=symbol,
+            side=side,
+            quantity=quantity,
+            order_type=order_type,
+            duration=duration,
+            limit_price=limit_price,
+            stop_price=stop_price,
+            tag=tag,
+            account_id=account_id,
+        )
+
+    async def order_option(
+        self,
+        symbol: str,
+        option_symbol: str,
+        side: str,
+        quantity: int,
+        order_type: str,
+        duration: str,
+        limit_price: float = None,
+        stop_price: float = None,
+        tag: str = None,
+        account_id: str = None,
+    ) -> OrderDetails:
+        """
+        Place an order to trade a single option.
+        """
+        return await self.order(
+            order_class="option",
+            symbol=symbol,
+            option_symbol=option_symbol,
+            side=side,
+            quantity=quantity,
+            order_type=order_type,
+            duration=duration,
+            limit_price=limit_price,
+            stop_price=stop_price,
+            tag=tag,
+            account_id=account_id,
+        )
+
+    async def order_multi_leg_option(
+        self,
+        symbol: str,
+        order_type: str,
+        duration: str,
+        limit_price: float = None,
+        tag: str = None,
+        option_symbol_0: str = None,
+        side_0: str = None,
+        quantity_0: int = None,
+        option_symbol_1: str = None,
+        side_1: str = None,
+        quantity_1: int = None,
+        option_symbol_2: str = None,
+        side_2: str = None,
+        quantity_2: int = None,
+        option_symbol_3: str = None,
+        side_3: str = None,
+        quantity_3: int = None,
+        account_id: str = None,
+    ) -> OrderDetails:
+        """
+        Place a multi-leg option order.
+        """
+        return await self.order(
+            order_class="multileg",
+            symbol=symbol,
+            side=None,
+            quantity=None,
+            order_type=order_type,
+            duration=duration,
+            limit_price=limit_price,
+            stop_price=None,
+            tag=tag,
+            account_id=account_id,
+            option_symbol_0=option_symbol_0,
+            side_0=side_0,
+            quantity_0=quantity_0,
+            option_symbol_1=option_symbol_1,
+            side_1=side_1,
+            quantity_1=quantity_1,
+            option_symbol_2=option_symbol_2,
+            side_2=side_2,
+            quantity_2=quantity_2,
+            option_symbol_3=option_symbol_3,
+            side_3=side_3,
+            quantity_3=quantity_3,
+        )
+
+    async def cancel_order(self, order_id, account_id=None) -> OrderDetails:
+        """
+        Cancel and order
+        """
+        if account_id is None:
+            account_id = self.default_account_id
+        url = f"/v1/accounts/{account_id}/orders/{order_id}"
+        data = await self.delete(url, {})
+        return self._parse(OrderAPIResponse, data, "order")
+
+    async def modify_order(
+        self,
+        order_id,
+        order_type: str = None,
+        duration: str = None,
+        limit_price: float = None,
+        stop_price: float = None,
+        account_id=None,
+    ) -> OrderDetails:
+        """
+        Modify an order. Send only the parameters you would like to adjust.
+        """
+        if account_id is None:
+            account_id = self.default_account_id
+        url = f"/v1/accounts/{account_id}/orders/{order_id}"
+        params = {
+            "type": order_type,
+            "duration": duration,
+            "price": limit_price,
+            "stop": stop_price,
+        }
+        params = {k: v for k, v in params.items() if v is not None}
+        data = await self.put(url, params)
+        return self._parse(OrderAPIResponse, data, "order")
+
+    async def get_quotes(
+        self,
+        symbols: Union[str, Iterable[str]],
+        greeks: bool = False,
+        batch_size: int = QUOTES_BATCH_SIZE,
+        max_workers: int = 8,
+    ) -> List[Quote]:
+        """
+        Get quotes for one or more symbols. Large symbol lists are split into batches that are fetched concurrently
+        and merged back into one list in input order.
+        """
+        res = await self.get_quotes_batched(symbols, greeks, batch_size, max_workers)
+        return res["quote"] if self.validate == "raw" else res.quotes
+
+    async def get_quotes_batched(
+        self,
+        symbols: Union[str, Iterable[str]],
+        greeks: bool = False,
+        batch_size: int = QUOTES_BATCH_SIZE,
+        max_workers: int = 8,
+    ) -> Quotes:
+        """
+        Get quotes for any number of symbols, merged into a single Quotes object with quotes in input order and the
+        unmatched symbols of every batch.
+        """
+        symbols = split_symbols(symbols)
+        batches = chunked(symbols, batch_size)
+        if len(batches) <= 1 and len(",".join(symbols)) <= MAX_QUERY_SYMBOLS_LENGTH:
+            res = await self._get_quotes_batch(symbols, greeks, False)
+            return merge_quotes(symbols, [res])
+
+        semaphore = asyncio.Semaphore(max_workers)
+
+        async def fetch(batch):
+            async with semaphore:
+                return await self._get_quotes_batch(batch, greeks, True)
+
+        results = await asyncio.gather(*(fetch(b) for b in batches))
+        return merge_quotes(symbols, results)
+
+    async def _get_quotes_batch(
+        self, symbols: List[str], greeks: bool, use_post: bool
+    ) -> Quotes:
+        url = "/v1/markets/quotes"
+        params = {"symbols": ",".join(symbols), "greeks": greeks}
+
+        if use_post:
+            data = await self.post(url, {}, params)
+        else:
+            data = await self.get(url, params)
+        return self._parse(MarketsAPIResponse, data, "quotes")
+
+    async def get_option_chains(
+        self, symbol: str, expiration: date, greeks: bool = False
+    ) -> List[Quote]:
+        """
+        Get all quotes in an option chain. Greeks/IV data is updated once per hour and supplied by ORATS.
+        """
+        url = "/v1/markets/options/chains"
+        params = {
+            "symbol": symbol,
+            "expiration": expiration,
+            "greeks": greeks,
+        }
+
+        data = await self.get(url, params)
+        return self._parse(MarketsAPIResponse, data, "options", "option")
+
+    async def get_option_chain_frame(
+        self, symbol: str, expiration: date, greeks: bool = False
+    ) -> "OptionChainFrame":
+        """
+        Get an option chain as an OptionChainFrame of NumPy columns. The response is not validated into Quote
+        objects, which makes this much cheaper than get_option_chains for large chains; individual contracts can
+        still be converted with OptionChainFrame.quote or to_quotes.
+        """
+        url = "/v1/markets/options/chains"
+        params = {
+            "symbol": symbol,
+            "expiration": expiration,
+            "greeks": greeks,
+        }
+
+        data = await self.get(url, params)
+        options = raw_value(MarketsAPIResponse, data, "options", "option") or []
+        from tradier_python.option_frame import OptionChainFrame
+
+        return OptionChainFrame.from_records(options)
+
+    async def get_option_chain_index(
+        self, symbol: str, expiration: date, greeks: bool = False
+    ) -> "OptionChainIndex":
+        """
+        Get an option chain as an OptionChainIndex, for looking up contracts by expiration, strike and option type.
+        """
+        chain = await self.get_option_chains(symbol, expiration, greeks)
+        from tradier_python.option_chain import OptionChainIndex
+
+        return OptionChainIndex(chain or [])
+
+    async def get_option_surface(
+        self,
+        symbol: str,
+        expirations: Iterable[date] = None,
+        greeks: bool = False,
+        include_all_roots: bool = None,
+        max_workers: int = 8,
+    ) -> Dict[date, List[Quote]]:
+        """
+        Get the option chains of every expiration of an underlying, keyed by expiration date in ascending order.
+        """
+        surface = {}
+        async for expiration, chain in self.iter_option_surface(
+            symbol, expirations, greeks, include_all_roots, max_workers
+        ):
+            surface[expiration] = chain
+        return dict(sorted(surface.items()))
+
+    async def iter_option_surface(
+        self,
+        symbol: str,
+        expirations: Iterable[date] = None,
+        greeks: bool = False,
+        include_all_roots: bool = None,
+        max_workers: int = 8,
+    ) -> AsyncIterator[Tuple[date, List[Quote]]]:
+        """
+        Fetch the option chains of several expirations with up to max_workers requests in flight, yielding
+        (expiration, chain) pairs as each chain arrives.
+        """
+        if expirations is None:
+            expirations = await self.get_option_expirations(symbol, include_all_roots)
+        expirations = sorted(set(expirations or ()))
+        semaphore = asyncio.Semaphore(max_workers)
+
+        async def fetch(expiration):
+            async with semaphore:
+                return expiration, await self.get_option_chains(
+                    symbol, expiration, greeks
+                )
+
+        tasks = [asyncio.ensure_future(fetch(e)) for e in expirations]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def get_option_strikes(self, symbol: str, expiration: date) -> List[float]:
+        """
+        Get an options strike prices for a specified expiration date.
+        """
+        url = "/v1/markets/options/strikes"
+        params = {"symbol": symbol, "expiration": expiration}
+
+        data = await self.get(url, params)
+        return self._parse(MarketsAPIResponse, data, "strikes", "strike")
+
+    async def get_option_expirations(
+        self, symbol: str, include_all_roots: bool = None, strikes: str = None
+    ) -> List[date]:
+        """
+        Get expiration dates for a particular underlying. Send include_all_roots to also see weekly roots (SPXW, RUTW).
+        """
+        url = "/v1/markets/options/expirations"
+        params = {
+            "symbol": symbol,
+            "includeAllRoots": include_all_roots,
+            "strikes": strikes,
+        }
+
+        data = await self.get(url, params)
+        return self._parse(MarketsAPIResponse, data, "expirations", "date")
+
+    async def lookup_option_symbols(self, underlying: str) -> List[Symbol]:
+        """
+        Get all options symbols for the given underlying.
+        """
+        url = "/v1/markets/options/lookup"
+        params = {"underlying": underlying}
+
+        data = await self.get(url, params)
+        return self._parse(MarketsAPIResponse, data, "symbols")
+
+    async def get_historical_quotes(
+        self, symbol: str, interval: str = None, start: date = None, end: date = None
+    ) -> List[HistoricQuote]:
+        """
+        Get historical pricing for a security.
+        """
+        url = "/v1/markets/history"
+        params = {"symbol": symbol, "interval": interval, "start": start, "end": end}
+
+        data = await self.get(url, params)
+        return self._parse(MarketsAPIResponse, data, "history", "day")
+
+    async def get_time_and_sales(
+        self,
+        symbol: str,
+        interval: str = None,
+        start: date = None,
+        end: date = None,
+        session_filter: str = None,
+    ) -> List[TimesalesData]:
+        """
+        Time and Sales (timesales) pricing across a time slice at predefined intervals, or tick data.
+        """
+        url = "/v1/markets/timesales"
+        params = {
+            "symbol": symbol,
+            "interval": interval,
+            "start": start,
+            "end": end,
+            "session_filter": session_filter,
+        }
+
+        data = await self.get(url, params)
+        return self._parse(MarketsAPIResponse, data, "series", "data")
+
+    async def iter_time_and_sales(
+        self,
+        symbol: str,
+        start: datetime,
+        end: datetime,
+        interval: str = "tick",
+        session_filter: str = None,
+        window: timedelta = None,
+        chunk_size: int = None,
+        prefetch: int = 16,
+    ) -> AsyncIterator[Union[TimesalesData, dict]]:
+        """
+        Iterate over the time and sales of a long range without holding it in memory. The range is split into windows
+        of TIMESALES_WINDOWS[interval] (or window) and each response is parsed incrementally as it arrives, while a
+        background task downloads ahead by up to prefetch reads, into the next window.
+
+        Yields a TimesalesData per record (a dict in raw parse mode) or, with chunk_size, dicts of NumPy columns of up
+        to chunk_size records each (see tradier_python.timesales.timesales_columns).
+        """
+        rows = []
+        async for item in self._iter_timesales_items(
+            symbol, start, end, interval, session_filter, window, prefetch
+        ):
+            if chunk_size is None:
+                yield self._parse(TimesalesData, item)
+                continue
+            rows.append(item)
+            if len(rows) == chunk_size:
+                yield timesales_columns(rows)
+                rows = []
+        if rows:
+            yield timesales_columns(rows)
+
+    async def _iter_timesales_items(
+        self, symbol, start, end, interval, session_filter, window, prefetch
+    ) -> AsyncIterator[dict]:
+        step = window or TIMESALES_WINDOWS.get(interval, timedelta(days=1))
+        windows = time_windows(to_datetime(start), to_datetime(end, end=True), step)
+        reads = asyncio.Queue(maxsize=prefetch)
+
+        async def download():
+            try:
+                for lo, hi in windows:
+                    params = window_params(symbol, interval, lo, hi, session_filter)
+                    async with self.stream("GET", TIMESALES_PATH, params) as response:
+                        async for chunk in response.aiter_bytes():
+                            await reads.put(chunk)
+                    await reads.put(None)
+            except Exception as e:
+                await reads.put(e)
+
+        task = asyncio.ensure_future(download())
+        try:
+            for n, (lo, hi) in enumerate(windows):
+                keep = window_filter(lo, hi, last=n == len(windows) - 1)
+                parser = JSONArrayParser("data")
+                while True:
+                    chunk = await reads.get()
+                    if chunk is None:
+                        break
+                    if isinstance(chunk, Exception):
+                        raise chunk
+                    for item in parser.feed(chunk):
+                        if keep(item):
+                            yield item
+                parser.close()
+        finally:
+            task.cancel()
+
+    async def get_etb_list(self) -> List[Security]:
+        """
+        The ETB list contains securities that are able to be sold short with a Tradier Brokerage account.
+        """
+        url = "/v1/markets/etb"
+        data = await self.get(url, {})
+        return self._parse(MarketsAPIResponse, data, "securities", "security")
+
+    async def get_clock(self) -> Clock:
+        """
+        Get the intraday market status.
+        """
+        url = "/v1/markets/clock"
+        data = await self.get(url, {})
+        return self._parse(MarketsAPIResponse, data, "clock")
+
+    async def get_calendar(self, month: int = None, year: int = None) -> List[Hours]:
+        """
+        Get the market calendar for the current or given month.
+        """
+        url = "/v1/markets/calendar"
+        params = {"month": month, "year": year}
+        data = await self.get(url, params)
+        return self._parse(MarketsAPIResponse, data, "calendar", "days", "day")
+
+    async def search_companies(
+        self, query: str, indexes: bool = True
+    ) -> List[Security]:
+        """
+        Get a list of symbols using a keyword lookup on the symbols description.
+        """
+        url = "/v1/markets/search"
+        params = {"q": query, "indexes": indexes}
+        data = await self.get(url, params)
+        res = self._parse(MarketsAPIResponse, data, "securities", "security")
+        return res if res is not None else []
+
+    async def lookup_symbol(
+        self, query: str, exchanges: str = None, types: str = None
+    ) -> List[Security]:
+        """
+        Search for a symbol using the ticker symbol or partial symbol.
+        """
+        url = "/v1/markets/lookup"
+        params = {"q": query, "exchanges": exchanges, "types": types}
+        data = await self.get(url, params)
+        res = self._parse(
+            MarketsAPIResponse,
+            data,
+            "securities",
+            "security",
+        )
+        return res if res is not None else []
@@ -0,0 +1,211 @@
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+from tradier_python.models import MarketsAPIResponse
+from tradier_python.parsing import raw_value
+
+HISTORY_PATH = "/v1/markets/history"
+BAR_COLUMNS = {
+    "date": "datetime64[D]",
+    "open": "float64",
+    "high": "float64",
+    "low": "float64",
+    "close": "float64",
+    "volume": "int64",
+}
+
+Range = Tuple[date, date]
+
+
+def merge_ranges(ranges: Iterable[Range]) -> List[Range]:
+    """sorts inclusive date ranges and merges those that overlap or touch"""
+    merged = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1] + timedelta(days=1):
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def subtract_ranges(start: date, end: date, covered: Iterable[Range]) -> List[Range]:
+    """the parts of the inclusive range start..end that are not covered"""
+    gaps = []
+    for lo, hi in merge_ranges(covered):
+        if hi < start or lo > end:
+            continue
+        if lo > start:
+            gaps.append((start, lo - timedelta(days=1)))
+        start = hi + timedelta(days=1)
+        if start > end:
+            return gaps
+    if start <= end:
+        gaps.append((start, end))
+    return gaps
+
+
+class BarStore:
+    """
+    Local store of historical bars that only asks the API for what it does not hold yet. Bars are kept per interval
+    and symbol as one .npy file per column (date, open, high, low, close, volume) under root, next to a coverage.json
+    listing the date ranges already fetched. Ranges count as covered even where the market was closed, so holidays and
+    weekends are never refetched. The current day is never marked as covered, since its bar is not final.
+
+        store = BarStore(t, "bars")
+        store.update_many(symbols, date(2010, 1, 1), date.today())
+        bars = store.load("AAPL", start=date(2020, 1, 1))
+        bars["close"]
+
+    load() memory-maps the column files, so reading bars copies nothing until the arrays are used.
+    """
+
+    def __init__(self, api, root: str, max_workers: int = 8):
+        if np is None:
+            raise ImportError(
+                "BarStore requires numpy. Install it with `pip install tradier-python[numpy]`."
+            )
+        self.api = api
+        self.root = root
+        self.max_workers = max_workers
+        self._locks: Dict[Tuple[str, str], threading.Lock] = {}
+        self._locks_lock = threading.Lock()
+
+    def _dir(self, symbol: str, interval: str) -> str:
+        return os.path.join(self.root, interval, symbol)
+
+    def _lock(self, symbol: str, interval: str) -> threading.Lock:
+        with self._locks_lock:
+            return self._locks.setdefault((symbol, interval), threading.Lock())
+
+    def coverage(self, symbol: str, interval: str = "daily") -> List[Range]:
+        """the date ranges already fetched for a symbol"""
+        try:
+            with open(os.path.join(self._dir(symbol, interval), "coverage.json")) as f:
+                ranges = json.load(f)
+        except FileNotFoundError:
+            return []
+        return [(date.fromisoformat(lo), date.fromisoformat(hi)) for lo, hi in ranges]
+
+    def gaps(
+        self, symbol: str, start: date, end: date = None, interval: str = "daily"
+    ) -> List[Range]:
+        """the parts of start..end (inclusive, end defaults to today) that still have to be fetched"""
+        end = end or date.today()
+        return subtract_ranges(start, end, self.coverage(symbol, interval))
+
+    def fetch(self, symbol: str, start: date, end: date, interval: str = "daily"):
+        """fetches the bars of a date range, as columns"""
+        params = {"symbol": symbol, "interval": interval, "start": start, "end": end}
+        data = self.api.get(HISTORY_PATH, params)
+        bars = raw_value(MarketsAPIResponse, data, "history", "day") or []
+        return {
+            name: np.array([bar[name] for bar in bars], dtype=dtype)
+            for name, dtype in BAR_COLUMNS.items()
+        }
+
+    def update(
+        self, symbol: str, start: date, end: date = None, interval: str = "daily"
+    ) -> int:
+        """Fetches the gaps of start..end for a symbol and stores them. Returns the number of bars fetched."""
+        end = end or date.today()
+        with self._lock(symbol, interval):
+            covered = self.coverage(symbol, interval)
+            gaps = subtract_ranges(start, end, covered)
+            if not gaps:
+                return 0
+            fetched = [self.fetch(symbol, lo, hi, interval) for lo, hi in gaps]
+            count = sum(len(columns["date"]) for columns in fetched)
+            if count:
+                self._write_bars(symbol, interval, fetched)
+            final = date.today() - timedelta(days=1)
+            covered += [(lo, min(hi, final)) for lo, hi in gaps if lo <= final]
+            self._write_coverage(symbol, interval, merge_ranges(covered))
+            return count
+
+    def update_many(
+        self,
+        symbols: Iterable[str],
+        start: date,
+        end: date = None,
+        interval: str = "daily",
+    ) -> Dict[str, int]:
+        """Updates many symbols concurrently. Returns the number of bars fetched per symbol."""
+        symbols = list(dict.fromkeys(symbols))
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            counts = executor.map(
+                lambda symbol: self.update(symbol, start, end, interval), symbols
+            )
+            return dict(zip(symbols, counts))
+
+    def load(
+        self,
+        symbol: str,
+        start: date = None,
+        end: date = None,
+        interval: str = "daily",
+        mmap: bool = True,
+    ) -> Optional[Dict[str, "np.ndarray"]]:
+        """
+        The stored bars of a symbol between start and end (inclusive), as columns sorted by date, or None if nothing
+        is stored. With mmap the columns are read-only views of the files on disk.
+        """
+        directory = self._dir(symbol, interval)
+        mmap_mode = "r" if mmap else None
+        try:
+            columns = {
+                name: np.load(
+                    os.path.join(directory, f"{name}.npy"), mmap_mode=mmap_mode
+                )
+                for name in BAR_COLUMNS
+            }
+        except FileNotFoundError:
+            return None
+        dates = columns["date"]
+        lo = 0 if start is None else np.searchsorted(dates, np.datetime64(start, "D"))
+        hi = (
+            len(dates)
+            if end is None
+            else np.searchsorted(dates, np.datetime64(end, "D"), side="right")
+        )
+        return {name: column[lo:hi] for name, column in columns.items()}
+
+    def _write_bars(self, symbol: str, interval: str, fetched: List[dict]):
+        stored = self.load(symbol, interval=interval, mmap=False)
+        parts = ([stored] if stored is not None else []) + fetched
+        columns = {
+            name: np.concatenate([part[name] for part in parts]) for name in BAR_COLUMNS
+        }
+        # keep the last copy of every date, so refetched bars replace stored ones
+        dates = columns["date"][::-1]
+        _, last = np.unique(dates, return_index=True)
+        order = len(dates) - 1 - last
+        directory = self._dir(symbol, interval)
+        os.makedirs(directory, exist_ok=True)
+        for name, column in columns.items():
+            self._replace(directory, f"{name}.npy", lambda f: np.save(f, column[order]))
+
+    def _write_coverage(self, symbol: str, interval: str, ranges: List[Range]):
+        directory = self._dir(symbol, interval)
+        os.makedirs(directory, exist_ok=True)
+        data = [[lo.isoformat(), hi.isoformat()] for lo, hi in ranges]
+        self._replace(
+            directory, "coverage.json", lambda f: f.write(json.dumps(data).encode())
+        )
+
+    @staticmethod
+    def _replace(directory: str, name: str, write):
+        """writes a file through a temporary file, so readers never see it half written"""
+        tmp = os.path.join(directory, f".{name}.tmp")
+        with open(tmp, "wb") as f:
+            write(f)
+        os.replace(tmp, os.path.join(directory, name))
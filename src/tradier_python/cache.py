@@ -0,0 +1,170 @@
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+# Reference endpoints whose responses change at most daily, with how long (in seconds) a cached response is served.
+DEFAULT_TTLS = {
+    "/v1/markets/options/expirations": 60 * 60,
+    "/v1/markets/options/strikes": 60 * 60,
+    "/v1/markets/options/lookup": 60 * 60,
+    "/v1/markets/calendar": 12 * 60 * 60,
+    "/v1/markets/etb": 6 * 60 * 60,
+}
+
+
+class MemoryCacheBackend:
+    """In-process LRU store holding at most maxsize responses."""
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Tuple[float, str]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            return entry[1], entry[2]
+
+    def set(self, key: str, path: str, expires: float, value: str):
+        with self._lock:
+            self._entries[key] = (path, expires, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self, path: str = None):
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+            else:
+                for key in [k for k, e in self._entries.items() if e[0] == path]:
+                    del self._entries[key]
+
+
+class SqliteCacheBackend:
+    """
+    On-disk LRU store in a SQLite database, so cached responses survive restarts. Reads do not write: the time of
+    every hit is kept in memory and written with the next set (where it decides what is evicted) or on close.
+    """
+
+    def __init__(self, filename: str, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._used: Dict[str, float] = {}
+        self._db = sqlite3.connect(filename, check_same_thread=False)
+        with self._db:
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS responses "
+                "(key TEXT PRIMARY KEY, path TEXT, expires REAL, used REAL, value TEXT)"
+            )
+
+    def get(self, key: str) -> Optional[Tuple[float, str]]:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT expires, value FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None:
+                self._used[key] = time.time()
+            return row
+
+    def _flush_used(self):
+        if self._used:
+            self._db.executemany(
+                "UPDATE responses SET used = ? WHERE key = ?",
+                [(used, key) for key, used in self._used.items()],
+            )
+            self._used.clear()
+
+    def set(self, key: str, path: str, expires: float, value: str):
+        with self._lock, self._db:
+            self._used.pop(key, None)
+            self._flush_used()
+            self._db.execute(
+                "REPLACE INTO responses VALUES (?, ?, ?, ?, ?)",
+                (key, path, expires, time.time(), value),
+            )
+            self._db.execute(
+                "DELETE FROM responses WHERE key NOT IN "
+                "(SELECT key FROM responses ORDER BY used DESC, rowid DESC LIMIT ?)",
+                (self.maxsize,),
+            )
+
+    def delete(self, key: str):
+        with self._lock, self._db:
+            self._used.pop(key, None)
+            self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+
+    def clear(self, path: str = None):
+        with self._lock, self._db:
+            self._flush_used()
+            if path is None:
+                self._db.execute("DELETE FROM responses")
+            else:
+                self._db.execute("DELETE FROM responses WHERE path = ?", (path,))
+
+    def close(self):
+        with self._lock:
+            with self._db:
+                self._flush_used()
+            self._db.close()
+
+
+class ResponseCache:
+    """
+    Caches the JSON responses of slow-changing GET endpoints. Only paths with a TTL are cached; by default those are
+    the reference endpoints in DEFAULT_TTLS. Entries are keyed by path and query parameters, so a cached response is
+    exactly what the live call returned. Keys do not include the endpoint, so use separate on-disk caches for the
+    sandbox and brokerage endpoints.
+    """
+
+    def __init__(self, backend=None, ttls: Dict[str, float] = None):
+        self.backend = backend if backend is not None else MemoryCacheBackend()
+        self.ttls = dict(DEFAULT_TTLS if ttls is None else ttls)
+
+    @staticmethod
+    def key(path: str, params: dict) -> str:
+        """cache key for a request, with parameters encoded the way requests sends them"""
+        params = sorted((k, str(v)) for k, v in (params or {}).items() if v is not None)
+        return json.dumps([path, params])
+
+    def get(self, path: str, params: dict) -> Optional[dict]:
+        """the cached response for a request, or None if it is not cached or has expired"""
+        if path not in self.ttls:
+            return None
+        key = self.key(path, params)
+        entry = self.backend.get(key)
+        if entry is None:
+            return None
+        expires, value = entry
+        if expires < time.time():
+            self.backend.delete(key)
+            return None
+        return json.loads(value)
+
+    def set(self, path: str, params: dict, data: dict):
+        """stores a response if its path is cacheable"""
+        ttl = self.ttls.get(path)
+        if ttl:
+            self.backend.set(
+                self.key(path, params), path, time.time() + ttl, json.dumps(data)
+            )
+
+    def invalidate(self, path: str = None, params: dict = None):
+        """
+        Drops cached responses: a single request when params are given, every response of an endpoint when only path
+        is given, and everything otherwise.
+        """
+        if path is not None and params is not None:
+            self.backend.delete(self.key(path, params))
+        else:
+            self.backend.clear(path)
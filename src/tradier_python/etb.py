@@ -0,0 +1,116 @@
+import json
+import os
+import threading
+import time
+from typing import FrozenSet, Iterable, Optional
+
+from tradier_python.models import MarketsAPIResponse
+from tradier_python.parsing import raw_value
+
+ETB_PATH = "/v1/markets/etb"
+
+
+class EtbIndex:
+    """
+    Easy-to-borrow lookup for short order pre-checks. The ETB list is kept as a frozenset of symbols, so checking a
+    symbol is a hash lookup and never touches the network:
+
+        etb = EtbIndex(t, path="etb.json").start()
+        if "AAPL" in etb:
+            ...
+
+    The list is fetched as plain JSON, without building a Security model per entry. With path it is saved to disk
+    together with its fetch time and loaded from there on startup, so a restart does not have to wait for the
+    download. start() refreshes the list in a background thread whenever it is older than max_age seconds.
+    """
+
+    def __init__(self, api, path: str = None, max_age: float = 6 * 60 * 60):
+        self.api = api
+        self.path = path
+        self.max_age = max_age
+        self.symbols: FrozenSet[str] = frozenset()
+        self.fetched: Optional[float] = None
+        self.last_error: Optional[Exception] = None
+        self._ready = threading.Event()
+        self._stop = threading.Event()
+        self._refresh_lock = threading.Lock()
+        self._thread = None
+        if path is not None:
+            self.load()
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol.upper() in self.symbols
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    @property
+    def age(self) -> Optional[float]:
+        """seconds since the list was fetched, or None if it never was"""
+        return None if self.fetched is None else time.time() - self.fetched
+
+    @property
+    def stale(self) -> bool:
+        return self.fetched is None or self.age > self.max_age
+
+    def wait(self, timeout: float = None) -> bool:
+        """blocks until a list has been loaded or fetched, returning False on timeout"""
+        return self._ready.wait(timeout)
+
+    def _set(self, symbols: Iterable[str], fetched: float):
+        self.symbols = frozenset(symbols)
+        self.fetched = fetched
+        self._ready.set()
+
+    def refresh(self):
+        """fetches the ETB list now and saves it if the index has a path"""
+        with self._refresh_lock:
+            data = self.api.get(ETB_PATH, {})
+            securities = (
+                raw_value(MarketsAPIResponse, data, "securities", "security") or []
+            )
+            self._set((s["symbol"] for s in securities), time.time())
+            if self.path is not None:
+                self.save()
+
+    def load(self) -> bool:
+        """loads the list saved at path, returning False if there is none"""
+        try:
+            with open(self.path) as f:
+                saved = json.load(f)
+        except FileNotFoundError:
+            return False
+        self._set(saved["symbols"], saved["fetched"])
+        return True
+
+    def save(self):
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w") as f:
+            json.dump({"fetched": self.fetched, "symbols": sorted(self.symbols)}, f)
+        os.replace(tmp, self.path)
+
+    def start(self, check_interval: float = 60.0) -> "EtbIndex":
+        """starts refreshing the list in the background, right away if it is stale"""
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run, args=(check_interval,), name="etb", daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self, check_interval: float):
+        while not self._stop.is_set():
+            if self.stale:
+                try:
+                    self.refresh()
+                    self.last_error = None
+                except Exception as e:
+                    self.last_error = e
+            self._stop.wait(check_interval)
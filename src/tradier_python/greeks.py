@@ -0,0 +1,257 @@
+"""
+Vectorized Black-Scholes greeks and implied volatilities, for computing fresh greeks locally instead of requesting
+the hourly ORATS greeks with every chain. Every function takes NumPy arrays (or scalars, broadcast against them) and
+evaluates a whole chain in a handful of array operations.
+
+Units follow the greeks Tradier returns: theta is per calendar day, vega, rho and phi per percentage point, and
+volatilities are annualized fractions. Black-76 (options on futures) is Black-Scholes with the forward as spot and a
+dividend yield equal to the rate; see black76.
+"""
+
+from datetime import date, datetime, time, timezone
+from typing import Dict, Union
+from zoneinfo import ZoneInfo
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+MARKET_TIMEZONE = ZoneInfo("America/New_York")
+# Options stop trading at 16:00 New York time on their expiration date.
+EXPIRATION_TIME = time(16)
+YEAR_SECONDS = 365 * 24 * 60 * 60
+# Time to expiration never goes below a minute, so contracts in their last minutes still get finite greeks.
+MIN_YEARS = 60 / YEAR_SECONDS
+MIN_VOL = 1e-4
+MAX_VOL = 10.0
+# Numerical Recipes' erfc approximation, highest power first
+_ERFC_COEFFICIENTS = (
+    0.17087277,
+    -0.82215223,
+    1.48851587,
+    -1.13520398,
+    0.27886807,
+    -0.18628806,
+    0.09678418,
+    0.37409196,
+    1.00002368,
+    -1.26551223,
+)
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError(
+            "The greeks engine requires numpy. Install it with `pip install tradier-python[numpy]`."
+        )
+
+
+def is_call(option_type) -> "np.ndarray":
+    """True for the calls among option types ("call"/"put", "C"/"P" or already booleans)"""
+    _require_numpy()
+    option_type = np.asarray(option_type)
+    if option_type.dtype == bool:
+        return option_type
+    return np.char.startswith(np.char.lower(option_type.astype(str)), "c")
+
+
+def norm_cdf(x):
+    """standard normal CDF, from the Chebyshev approximation of erfc (relative error below 1.2e-7)"""
+    z = np.abs(x) / np.sqrt(2.0)
+    t = 1.0 / (1.0 + 0.5 * z)
+    poly = 0.0
+    for c in _ERFC_COEFFICIENTS:
+        poly = poly * t + c
+    tail = 0.5 * t * np.exp(-z * z + poly)
+    return np.where(x >= 0, 1.0 - tail, tail)
+
+
+def norm_pdf(x):
+    return np.exp(-0.5 * x * x) / np.sqrt(2.0 * np.pi)
+
+
+def _d1_d2(spot, strike, years, vol, rate, dividend):
+    root = vol * np.sqrt(years)
+    d1 = (np.log(spot / strike) + (rate - dividend + 0.5 * vol * vol) * years) / root
+    return d1, d1 - root
+
+
+def black_scholes_price(option_type, spot, strike, years, vol, rate=0.0, dividend=0.0):
+    """option prices; years is the time to expiration"""
+    _require_numpy()
+    call, spot, strike, years, vol = np.broadcast_arrays(
+        is_call(option_type),
+        *(np.asarray(a, dtype=np.float64) for a in (spot, strike, years, vol)),
+    )
+    d1, d2 = _d1_d2(spot, strike, years, vol, rate, dividend)
+    sign = np.where(call, 1.0, -1.0)
+    forward = spot * np.exp(-dividend * years)
+    discounted = strike * np.exp(-rate * years)
+    return sign * (forward * norm_cdf(sign * d1) - discounted * norm_cdf(sign * d2))
+
+
+def black_scholes(
+    option_type, spot, strike, years, vol, rate=0.0, dividend=0.0
+) -> Dict[str, "np.ndarray"]:
+    """price, delta, gamma, theta, vega, rho and phi of options with the given volatilities"""
+    _require_numpy()
+    call, spot, strike, years, vol = np.broadcast_arrays(
+        is_call(option_type),
+        *(np.asarray(a, dtype=np.float64) for a in (spot, strike, years, vol)),
+    )
+    d1, d2 = _d1_d2(spot, strike, years, vol, rate, dividend)
+    sign = np.where(call, 1.0, -1.0)
+    carry = np.exp(-dividend * years)
+    discount = np.exp(-rate * years)
+    n_d1 = norm_cdf(sign * d1)
+    n_d2 = norm_cdf(sign * d2)
+    pdf = norm_pdf(d1)
+    sqrt_years = np.sqrt(years)
+    return {
+        "price": sign * (spot * carry * n_d1 - strike * discount * n_d2),
+        "delta": sign * carry * n_d1,
+        "gamma": carry * pdf / (spot * vol * sqrt_years),
+        "theta": (
+            -spot * carry * pdf * vol / (2 * sqrt_years)
+            - sign * rate * strike * discount * n_d2
+            + sign * dividend * spot * carry * n_d1
+        )
+        / 365,
+        "vega": spot * carry * pdf * sqrt_years / 100,
+        "rho": sign * strike * years * discount * n_d2 / 100,
+        "phi": -sign * spot * years * carry * n_d1 / 100,
+    }
+
+
+def black76(
+    option_type, forward, strike, years, vol, rate=0.0
+) -> Dict[str, "np.ndarray"]:
+    """black_scholes for options on futures, priced off the forward"""
+    return black_scholes(option_type, forward, strike, years, vol, rate, dividend=rate)
+
+
+def implied_volatility(
+    option_type,
+    price,
+    spot,
+    strike,
+    years,
+    rate=0.0,
+    dividend=0.0,
+    tol: float = 1e-8,
+    max_iter: int = 64,
+) -> "np.ndarray":
+    """
+    Volatilities at which black_scholes_price matches price, NaN where the price is missing or outside the
+    no-arbitrage bounds. Solved for every contract at once with Newton steps, falling back to bisection whenever a
+    step leaves the bracket known to hold the root.
+    """
+    _require_numpy()
+    call = is_call(option_type)
+    price, spot, strike, years, rate, dividend = np.broadcast_arrays(
+        *(
+            np.asarray(a, dtype=np.float64)
+            for a in (price, spot, strike, years, rate, dividend)
+        )
+    )
+    call = np.broadcast_to(call, price.shape)
+    forward = spot * np.exp(-dividend * years)
+    discounted = strike * np.exp(-rate * years)
+    lower = np.where(
+        call,
+        np.maximum(forward - discounted, 0.0),
+        np.maximum(discounted - forward, 0.0),
+    )
+    upper = np.where(call, forward, discounted)
+    with np.errstate(invalid="ignore"):
+        valid = (price > lower) & (price < upper)
+
+    lo = np.full(price.shape, MIN_VOL)
+    hi = np.full(price.shape, MAX_VOL)
+    # Brenner-Subrahmanyam's at-the-money approximation as the starting point
+    with np.errstate(invalid="ignore", divide="ignore"):
+        vol = np.clip(np.sqrt(2 * np.pi / years) * price / spot, 0.05, 2.0)
+    vol = np.where(valid, vol, np.nan)
+    active = valid.copy()
+    for _ in range(max_iter):
+        if not active.any():
+            break
+        v = vol[active]
+        args = (spot[active], strike[active], years[active])
+        rates = (rate[active], dividend[active])
+        d1, _ = _d1_d2(*args, v, *rates)
+        diff = black_scholes_price(call[active], *args, v, *rates) - price[active]
+        vega = forward[active] * norm_pdf(d1) * np.sqrt(years[active])
+        converged = np.abs(diff) < tol * np.maximum(price[active], 1.0)
+        # the price rises with volatility, so the sign of diff tells which side of the root v is on
+        lo_a = np.where(diff < 0, v, lo[active])
+        hi_a = np.where(diff > 0, v, hi[active])
+        with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+            step = v - diff / vega
+        step = np.where((step > lo_a) & (step < hi_a), step, (lo_a + hi_a) / 2)
+        lo[active] = lo_a
+        hi[active] = hi_a
+        vol[active] = np.where(converged, v, step)
+        active[active] = ~converged
+    vol[active] = np.nan
+    return vol
+
+
+def years_to_expiration(expiration, now: datetime = None) -> "np.ndarray":
+    """
+    Years from now until 16:00 New York time on each expiration date (datetime64[D] or dates), never less than a
+    minute. now defaults to the current time; a naive now is taken as New York time.
+    """
+    _require_numpy()
+    now = now or datetime.now(timezone.utc)
+    if now.tzinfo is None:
+        now = now.replace(tzinfo=MARKET_TIMEZONE)
+    days, inverse = np.unique(
+        np.asarray(expiration, dtype="datetime64[D]"), return_inverse=True
+    )
+    closes = np.array(
+        [
+            datetime.combine(day, EXPIRATION_TIME, MARKET_TIMEZONE).timestamp()
+            for day in days.astype(date)
+        ],
+        dtype=np.float64,
+    )
+    seconds = closes[inverse].reshape(np.shape(expiration))
+    return np.maximum((seconds - now.timestamp()) / YEAR_SECONDS, MIN_YEARS)
+
+
+def chain_greeks(
+    frame,
+    underlying_price: Union[float, "np.ndarray"],
+    rate: float = 0.0,
+    dividend: float = 0.0,
+    now: datetime = None,
+) -> Dict[str, "np.ndarray"]:
+    """
+    Greeks of every contract of an OptionChainFrame from its bid, ask and the underlying price, as columns named like
+    the fields of the Greeks model. bid_iv, mid_iv and ask_iv are the implied volatilities of the bid, mid and ask;
+    the greeks and smv_vol are computed at the mid IV, and are NaN where it has none.
+    """
+    _require_numpy()
+    years = years_to_expiration(frame.columns["expiration"], now)
+    option_type = frame.columns["option_type"]
+    strike = frame.columns["strike"]
+
+    def iv(prices):
+        return implied_volatility(
+            option_type, prices, underlying_price, strike, years, rate, dividend
+        )
+
+    mid_iv = iv(frame.mid)
+    columns = black_scholes(
+        option_type, underlying_price, strike, years, mid_iv, rate, dividend
+    )
+    del columns["price"]
+    columns.update(
+        bid_iv=iv(frame.columns["bid"]),
+        mid_iv=mid_iv,
+        ask_iv=iv(frame.columns["ask"]),
+        smv_vol=mid_iv,
+    )
+    return columns
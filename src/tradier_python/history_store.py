@@ -0,0 +1,135 @@
+import json
+import os
+from bisect import bisect_left
+from collections import Counter, defaultdict
+from datetime import date, timedelta
+from typing import Dict, Iterator, List
+
+from tradier_python.models import AccountsAPIResponse, Event
+from tradier_python.parsing import parse_response, raw_value
+from tradier_python.tradier_api import iter_pages
+
+
+def event_symbol(event: dict):
+    """the symbol of an event, from its trade, option, adjustment or journal details"""
+    details = event.get(event.get("type")) or {}
+    return details.get("symbol") if isinstance(details, dict) else None
+
+
+def event_key(event: dict) -> str:
+    """Events have no id, so an event is identified by its whole content."""
+    return json.dumps(event, sort_keys=True, separators=(",", ":"))
+
+
+class HistoryStore:
+    """
+    Local, append-only copy of an account's history. The events are kept as JSON lines in path, sorted by date, and
+    sync() only asks Tradier for events from the date of the last stored event onwards. Events of that boundary date
+    that are already stored are skipped, so a sync downloads the new events plus one day of overlap instead of the
+    whole history.
+
+        store = HistoryStore(t, "history.jsonl")
+        store.sync()
+        store.query(event_type="trade", symbol="SPY", start=date(2021, 1, 1))
+
+    Events are indexed by type and symbol in memory, and query() returns them parsed according to the client's
+    validate mode.
+    """
+
+    def __init__(self, api, path: str, account_id: str = None, page_size: int = 100):
+        self.api = api
+        self.path = path
+        self.account_id = account_id or api.default_account_id
+        self.page_size = page_size
+        self.events: List[dict] = []
+        self._dates: List[str] = []
+        self._by_type: Dict[str, List[int]] = defaultdict(list)
+        self._by_symbol: Dict[str, List[int]] = defaultdict(list)
+        if os.path.exists(path):
+            with open(path) as f:
+                self._index([json.loads(line) for line in f if line.strip()])
+
+    def __len__(self) -> int:
+        return len(self.events)
+
+    @property
+    def last_date(self) -> str:
+        """the date (and time) of the newest stored event, or None"""
+        return self._dates[-1] if self._dates else None
+
+    def _index(self, events: List[dict]):
+        for event in events:
+            position = len(self.events)
+            self.events.append(event)
+            self._dates.append(event["date"])
+            self._by_type[event.get("type")].append(position)
+            symbol = event_symbol(event)
+            if symbol is not None:
+                self._by_symbol[symbol].append(position)
+
+    def fetch(self, start: date = None) -> Iterator[dict]:
+        """the account's events since start, as JSON dicts"""
+        url = f"/v1/accounts/{self.account_id}/history"
+
+        def fetch_page(page: int) -> List[dict]:
+            params = {"page": page, "limit": self.page_size, "start": start}
+            data = self.api.get(url, params)
+            return raw_value(AccountsAPIResponse, data, "history", "event") or []
+
+        return iter_pages(fetch_page, self.page_size)
+
+    def sync(self) -> int:
+        """Fetches the events newer than the store and appends them. Returns the number of events added."""
+        boundary = self.last_date
+        start = None if boundary is None else date.fromisoformat(boundary[:10])
+        fetched = list(self.fetch(start))
+
+        # stored events of the boundary day, counted so that identical events on the same day are kept apart
+        seen = Counter()
+        if start is not None:
+            first = bisect_left(self._dates, start.isoformat())
+            seen.update(event_key(e) for e in self.events[first:])
+        new = []
+        for event in fetched:
+            key = event_key(event)
+            if seen[key]:
+                seen[key] -= 1
+            else:
+                new.append(event)
+        new.sort(key=lambda event: event["date"])
+        if boundary is not None and new and new[0]["date"] < boundary:
+            raise ValueError(
+                f"history returned an event dated {new[0]['date']}, before the stored {boundary}"
+            )
+
+        if new:
+            with open(self.path, "a") as f:
+                f.writelines(json.dumps(event) + "\n" for event in new)
+            self._index(new)
+        return len(new)
+
+    def query(
+        self,
+        event_type: str = None,
+        symbol: str = None,
+        start: date = None,
+        end: date = None,
+    ) -> List[Event]:
+        """stored events matching every given filter, oldest first; start and end are inclusive"""
+        lo = 0 if start is None else bisect_left(self._dates, start.isoformat())
+        hi = len(self._dates)
+        if end is not None:
+            hi = bisect_left(self._dates, (end + timedelta(days=1)).isoformat())
+        positions = None
+        for index, value in ((self._by_type, event_type), (self._by_symbol, symbol)):
+            if value is not None:
+                matches = index.get(value, [])
+                matches = matches[bisect_left(matches, lo) : bisect_left(matches, hi)]
+                if positions is not None:
+                    matches = sorted(set(positions).intersection(matches))
+                positions = matches
+        if positions is None:
+            positions = range(lo, hi)
+        return [
+            parse_response(self.api.validate, Event, self.events[p]) for p in positions
+        ]
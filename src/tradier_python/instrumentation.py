@@ -0,0 +1,254 @@
+"""
+Per-request metrics for the Tradier clients.
+
+Clients call each of their hooks with a RequestMetrics for every request. Request timings are split into:
+
+* ``queued``: waiting for the client's RateLimiter before sending.
+* ``wait``: sending the request until the response headers arrived. This includes opening the connection when no
+  pooled connection was free; the HTTP libraries do not report connect time separately for pooled connections.
+* ``transfer``: reading the response body.
+* ``decode``: decoding the JSON body.
+* ``validate``: parsing the decoded JSON in the client's parse mode.
+
+Responses of endpoint methods are reported once they have been parsed. Responses requested directly with get(),
+post(), put() or delete() are never parsed by the client; they are reported when the next request starts, or by
+flush_metrics().
+
+MetricsCollector is a ready-made hook that keeps latency histograms per endpoint:
+
+    collector = MetricsCollector()
+    t = TradierAPI(token, hooks=[collector])
+    ...
+    collector.summary()
+"""
+
+import re
+import threading
+import warnings
+from collections import Counter
+from contextvars import ContextVar
+from dataclasses import dataclass
+from time import perf_counter
+from typing import Callable, Dict, Mapping, Optional, Sequence
+
+from tradier_python.ratelimit import RateLimiter
+from tradier_python.stats import LatencyStats
+
+STAGES = ("queued", "wait", "transfer", "decode", "validate", "total")
+# Upper bounds (in seconds) of the latency histogram buckets; the last bucket holds everything slower.
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+_ID_SEGMENTS = (
+    (re.compile(r"/accounts/[^/]+"), "/accounts/{account_id}"),
+    (re.compile(r"/orders/[^/]+"), "/orders/{order_id}"),
+    (re.compile(r"/watchlists/[^/]+"), "/watchlists/{watchlist_id}"),
+    (re.compile(r"/symbols/[^/]+"), "/symbols/{symbol}"),
+)
+
+
+def lane(method: str, path: str) -> str:
+    """the client lane of a request: "trading" for order changes, "data" for everything else"""
+    return "trading" if RateLimiter.category(method, path) == "trading" else "data"
+
+
+def endpoint_name(path: str) -> str:
+    """the path with account, order and watchlist ids replaced by placeholders"""
+    for pattern, placeholder in _ID_SEGMENTS:
+        path = pattern.sub(placeholder, path)
+    return path
+
+
+@dataclass
+class RequestMetrics:
+    method: str
+    path: str
+    lane: str
+    status: Optional[int] = None
+    bytes: int = 0
+    queued: float = 0.0
+    wait: float = 0.0
+    transfer: float = 0.0
+    decode: float = 0.0
+    validate: float = 0.0
+    cached: bool = False
+    ratelimit_allowed: Optional[int] = None
+    ratelimit_available: Optional[int] = None
+    ratelimit_expiry: Optional[float] = None
+
+    @property
+    def endpoint(self) -> str:
+        return f"{self.method} {endpoint_name(self.path)}"
+
+    @property
+    def total(self) -> float:
+        return self.queued + self.wait + self.transfer + self.decode + self.validate
+
+    def set_ratelimit(self, headers: Mapping):
+        """reads the quota state from the X-Ratelimit-* headers of the response"""
+        try:
+            self.ratelimit_allowed = int(headers["X-Ratelimit-Allowed"])
+            self.ratelimit_available = int(headers["X-Ratelimit-Available"])
+            self.ratelimit_expiry = int(headers["X-Ratelimit-Expiry"]) / 1000
+        except (KeyError, ValueError):
+            pass
+
+
+# [client, metrics] of the last response of the current thread or task that is waiting to be parsed. The list is
+# emptied when the metrics are reported, so tasks that inherited it from their parent do not report them again.
+_pending: ContextVar = ContextVar("tradier_pending_metrics", default=None)
+
+
+class Instrumented:
+    """Hook plumbing shared by the clients. hooks is a list of callables taking a RequestMetrics."""
+
+    hooks: list
+
+    def _emit(self, metrics: RequestMetrics):
+        for hook in self.hooks:
+            try:
+                hook(metrics)
+            except Exception as e:
+                warnings.warn(f"request hook {hook!r} failed: {e!r}", RuntimeWarning)
+
+    def _defer(self, metrics: RequestMetrics):
+        """holds back the metrics of a response until it has been parsed"""
+        _pending.set([self, metrics])
+
+    def flush_metrics(self):
+        """reports the metrics of the last response of this thread or task if it has not been parsed"""
+        pending = _pending.get()
+        if pending:
+            client, metrics = pending
+            pending.clear()
+            client._emit(metrics)
+
+    def _take_pending(self) -> Optional[RequestMetrics]:
+        pending = _pending.get()
+        if not pending or pending[0] is not self:
+            return None
+        metrics = pending[1]
+        pending.clear()
+        return metrics
+
+    def _response_metrics(
+        self, method: str, path: str, lane: str, response, queued: float, wait: float
+    ) -> Optional[RequestMetrics]:
+        """metrics of a response whose headers have arrived, or None when there are no hooks"""
+        if not self.hooks:
+            return None
+        metrics = RequestMetrics(
+            method.upper(), path, lane, response.status_code, queued=queued, wait=wait
+        )
+        metrics.bytes = int(response.headers.get("Content-Length", 0))
+        metrics.set_ratelimit(response.headers)
+        return metrics
+
+    def _cached_metrics(self, method: str, path: str):
+        if self.hooks:
+            self._emit(
+                RequestMetrics(method.upper(), path, lane(method, path), cached=True)
+            )
+
+    def _parse_measured(self, parse: Callable):
+        """runs parse and reports the pending metrics of this client with the time it took"""
+        metrics = self._take_pending()
+        if metrics is None:
+            return parse()
+        start = perf_counter()
+        try:
+            return parse()
+        finally:
+            metrics.validate = perf_counter() - start
+            self._emit(metrics)
+
+
+class EndpointMetrics:
+    """aggregated metrics of one endpoint"""
+
+    def __init__(self, maxlen: int):
+        self.stages = {stage: LatencyStats(maxlen) for stage in STAGES}
+        self.statuses = Counter()
+        self.cached = 0
+        self.bytes = 0
+        self.ratelimit = None
+
+    def add(self, metrics: RequestMetrics):
+        if metrics.cached:
+            self.cached += 1
+            return
+        self.statuses[metrics.status] += 1
+        self.bytes += metrics.bytes
+        for stage in STAGES:
+            self.stages[stage].add(getattr(metrics, stage))
+        if metrics.ratelimit_available is not None:
+            self.ratelimit = (
+                metrics.ratelimit_allowed,
+                metrics.ratelimit_available,
+                metrics.ratelimit_expiry,
+            )
+
+
+class MetricsCollector:
+    """
+    Hook that aggregates RequestMetrics per endpoint ("GET /v1/markets/quotes", with ids in paths replaced by
+    placeholders): latency percentiles and histograms per stage over the last maxlen requests, status counts, cache
+    hits, bytes received and the last reported rate limit state.
+    """
+
+    def __init__(self, maxlen: int = 10000):
+        self.maxlen = maxlen
+        self.endpoints: Dict[str, EndpointMetrics] = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, metrics: RequestMetrics):
+        with self._lock:
+            endpoint = self.endpoints.get(metrics.endpoint)
+            if endpoint is None:
+                endpoint = self.endpoints[metrics.endpoint] = EndpointMetrics(
+                    self.maxlen
+                )
+            endpoint.add(metrics)
+
+    def summary(self) -> Dict[str, dict]:
+        """per endpoint: request count, status counts of the requests sent, cache hits, bytes, rate limit state and a
+        latency summary per stage, slowest endpoints (by total time spent) first"""
+        with self._lock:
+            endpoints = list(self.endpoints.items())
+        summary = {
+            name: {
+                "count": sum(e.statuses.values()) + e.cached,
+                "statuses": dict(e.statuses),
+                "cached": e.cached,
+                "bytes": e.bytes,
+                "ratelimit": e.ratelimit,
+                **{stage: e.stages[stage].summary() for stage in STAGES},
+            }
+            for name, e in endpoints
+        }
+        return dict(
+            sorted(
+                summary.items(),
+                key=lambda item: -item[1]["total"]["mean"] * item[1]["total"]["count"],
+            )
+        )
+
+    def histogram(
+        self,
+        endpoint: str,
+        stage: str = "total",
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Dict[str, int]:
+        """request counts of an endpoint by latency bucket, over its recent requests"""
+        with self._lock:
+            stats = self.endpoints[endpoint].stages[stage]
+        samples = stats.samples()
+        labels = [f"<={bound}" for bound in buckets] + [f">{buckets[-1]}"]
+        counts = dict.fromkeys(labels, 0)
+        for sample in samples:
+            for label, bound in zip(labels, buckets):
+                if sample <= bound:
+                    counts[label] += 1
+                    break
+            else:
+                counts[labels[-1]] += 1
+        return counts
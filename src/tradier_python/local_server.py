@@ -0,0 +1,365 @@
+import itertools
+import json
+import random
+import threading
+import time
+import uuid
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Iterator, List, Mapping, Optional, Tuple, Union
+from urllib.parse import parse_qs, urlsplit
+
+from tradier_python.ratelimit import RateLimiter
+from tradier_python.transport import Cassette, request_params
+
+
+def synthetic_events(
+    symbols: List[str], event_filter: List[str], seed: int = 0
+) -> Iterator[dict]:
+    """An endless random walk of quote and trade events (or whichever types are in the filter) for the symbols."""
+    rng = random.Random(seed)
+    prices = {symbol: 100.0 + rng.random() * 100 for symbol in symbols}
+    kinds = [k for k in ("quote", "trade", "summary", "timesale") if k in event_filter]
+    for n in itertools.count():
+        symbol = symbols[n % len(symbols)]
+        kind = kinds[(n // len(symbols)) % len(kinds)]
+        prices[symbol] = round(prices[symbol] + rng.choice((-0.01, 0.0, 0.01)), 2)
+        price = prices[symbol]
+        now = str(int(time.time() * 1000))
+        if kind == "quote":
+            yield {
+                "type": "quote",
+                "symbol": symbol,
+                "bid": round(price - 0.01, 2),
+                "bidsz": rng.randint(1, 50),
+                "bidexch": "Q",
+                "biddate": now,
+                "ask": round(price + 0.01, 2),
+                "asksz": rng.randint(1, 50),
+                "askexch": "Z",
+                "askdate": now,
+            }
+        elif kind == "trade":
+            yield {
+                "type": "trade",
+                "symbol": symbol,
+                "exch": "Q",
+                "price": str(price),
+                "size": str(rng.randint(1, 500)),
+                "cvol": str(n),
+                "date": now,
+                "last": str(price),
+            }
+        elif kind == "summary":
+            yield {
+                "type": "summary",
+                "symbol": symbol,
+                "open": str(price),
+                "high": str(price),
+                "low": str(price),
+                "prevClose": str(price),
+            }
+        else:
+            yield {
+                "type": "timesale",
+                "symbol": symbol,
+                "exch": "Q",
+                "bid": str(round(price - 0.01, 2)),
+                "ask": str(round(price + 0.01, 2)),
+                "last": str(price),
+                "size": "100",
+                "date": now,
+                "seq": n,
+                "flag": "",
+                "cancel": False,
+                "correction": False,
+                "session": "normal",
+            }
+
+
+class _StreamHandler(BaseHTTPRequestHandler):
+    server_version = "LocalTradier/1.0"
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _form(self) -> dict:
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length).decode("utf-8")
+        query = urlsplit(self.path).query
+        return {k: v[-1] for k, v in parse_qs(f"{query}&{body}").items()}
+
+    def _send_json(self, status: int, body):
+        payload = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_POST(self):
+        standin = self.server.standin
+        path = urlsplit(self.path).path
+        form = self._form()
+        if path == "/v1/markets/events/session":
+            self._send_json(200, {"stream": standin.create_session()})
+        elif path == "/v1/markets/events":
+            if form.get("sessionid") not in standin.sessions:
+                self._send_json(400, {"error": "invalid session"})
+                return
+            self._stream(form)
+        else:
+            self._send_json(404, {"error": f"unknown path {path}"})
+
+    def _stream(self, form: dict):
+        standin = self.server.standin
+        symbols = [s for s in form.get("symbols", "").split(",") if s]
+        event_filter = (form.get("filter") or "quote,trade").split(",")
+        separator = b"\n" if form.get("linebreak", "false") == "true" else b""
+        standin.connections.append(symbols)
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+        events = standin.events(symbols, event_filter)
+        try:
+            for n, event in enumerate(events):
+                if standin.stopping.is_set() or n == standin.max_events:
+                    break
+                data = json.dumps(event).encode("utf-8") + separator
+                self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+                self.wfile.flush()
+                if standin.interval:
+                    time.sleep(standin.interval)
+            self.wfile.write(b"0\r\n\r\n")
+        except (BrokenPipeError, ConnectionResetError):
+            return
+
+
+class _LocalServer:
+    handler = BaseHTTPRequestHandler
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        self.stopping = threading.Event()
+        self._server = ThreadingHTTPServer((host, port), self.handler)
+        self._server.daemon_threads = True
+        self._server.standin = self
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    def start(self):
+        # a short poll interval lets stop() return quickly
+        self._thread = threading.Thread(
+            target=self._server.serve_forever,
+            args=(0.05,),
+            name="local-tradier",
+            daemon=True,
+        )
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.stopping.set()
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+class _RestHandler(BaseHTTPRequestHandler):
+    server_version = "LocalTradier/1.0"
+    protocol_version = "HTTP/1.1"
+    # headers and body are written separately; without TCP_NODELAY small responses wait for the client's delayed ACK
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def _respond(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        url = urlsplit(self.path)
+        status, headers, body = self.server.standin.respond(
+            self.command, url.path, request_params(url.query, body)
+        )
+        if not isinstance(body, bytes):
+            body = (body if isinstance(body, str) else json.dumps(body)).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        for name, value in headers.items():
+            if name != "Content-Type":
+                self.send_header(name, str(value))
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_GET = do_POST = do_PUT = do_DELETE = _respond
+
+
+class LocalTradierServer(_LocalServer):
+    """
+    Local HTTP stand-in for the Tradier REST API, for exercising a client end to end without the network. Point a
+    client at it with TradierAPI(token, endpoint=server.url).
+
+    Responses come from a cassette of recorded interactions (see tradier_python.transport), matched on method, path
+    and parameters, or else from responses, which maps a path to its body (bytes or a JSON value) for any method.
+    Unknown paths get a 404.
+
+    To simulate production conditions, every request is delayed by latency seconds (or a uniform random delay
+    between the two values of a (min, max) pair), a fraction error_rate of requests fails with error_status, and
+    rate_limits (requests per window for "market", "standard" and "trading", as in RateLimiter) are enforced with
+    X-Ratelimit-* headers and 429 responses. Without rate_limits, recorded rate limit headers are replayed as is.
+    Random choices are drawn from a generator seeded with seed, so runs are repeatable.
+    """
+
+    handler = _RestHandler
+
+    def __init__(
+        self,
+        responses: dict = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        cassette: Cassette = None,
+        latency: Union[float, Tuple[float, float]] = 0.0,
+        error_rate: float = 0.0,
+        error_status: int = 503,
+        rate_limits: Mapping[str, int] = None,
+        window: float = 60.0,
+        seed: int = 0,
+    ):
+        super().__init__(host, port)
+        self.responses = dict(responses or {})
+        self.cassette = cassette
+        self.latency = latency
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.rate_limits = dict(rate_limits or {})
+        self.window = window
+        self.count = 0
+        self.statuses = Counter()
+        self._rng = random.Random(seed)
+        self._windows: Dict[str, Tuple[float, int]] = {}
+        self._lock = threading.Lock()
+
+    def _delay(self) -> float:
+        if isinstance(self.latency, tuple):
+            return self._rng.uniform(*self.latency)
+        return self.latency
+
+    def _rate_limit(self, method: str, path: str) -> Optional[dict]:
+        """counts the request against its quota and returns its X-Ratelimit-* headers, or None without a quota"""
+        category = RateLimiter.category(method, path)
+        limit = self.rate_limits.get(category)
+        if limit is None:
+            return None
+        now = time.time()
+        start, used = self._windows.get(category, (now, 0))
+        if now >= start + self.window:
+            start, used = now, 0
+        used += 1
+        self._windows[category] = (start, used)
+        return {
+            "X-Ratelimit-Allowed": limit,
+            "X-Ratelimit-Used": used,
+            "X-Ratelimit-Available": max(limit - used, 0),
+            "X-Ratelimit-Expiry": int((start + self.window) * 1000),
+        }
+
+    def respond(self, method: str, path: str, params: dict) -> Tuple[int, dict, object]:
+        """(status, headers, body) of a request"""
+        with self._lock:
+            self.count += 1
+            delay = self._delay()
+            failed = self.error_rate and self._rng.random() < self.error_rate
+            limits = self._rate_limit(method, path)
+        if delay:
+            time.sleep(delay)
+
+        if (
+            limits is not None
+            and limits["X-Ratelimit-Used"] > limits["X-Ratelimit-Allowed"]
+        ):
+            status, headers, body = (
+                429,
+                limits,
+                {"fault": {"faultstring": "Rate limit exceeded"}},
+            )
+        elif failed:
+            status, headers, body = (
+                self.error_status,
+                {},
+                {"fault": {"faultstring": "Service unavailable"}},
+            )
+        else:
+            status, headers, body = self._lookup(method, path, params)
+            if limits is not None:
+                headers = {
+                    **{
+                        k: v
+                        for k, v in headers.items()
+                        if not k.startswith("X-Ratelimit")
+                    },
+                    **limits,
+                }
+        with self._lock:
+            self.statuses[status] += 1
+        return status, headers, body
+
+    def _lookup(self, method: str, path: str, params: dict) -> Tuple[int, dict, object]:
+        if self.cassette is not None:
+            interaction = self.cassette.find(method, path, params)
+            if interaction is not None:
+                return (
+                    interaction["status"],
+                    interaction["headers"],
+                    interaction["body"],
+                )
+        body = self.responses.get(path)
+        if body is None:
+            return 404, {}, {"error": f"unknown path {path}"}
+        return 200, {}, body
+
+
+class LocalStreamServer(_LocalServer):
+    """
+    Local stand-in for Tradier's streaming endpoints, for testing stream consumers offline. It serves
+    /v1/markets/events/session and an HTTP event stream at /v1/markets/events, so a client pointed at its url
+    (TradierAPI(token, endpoint=server.url)) can run MarketStream unchanged.
+
+    Events come from events(symbols, event_filter), an endless synthetic random walk by default, written every
+    interval seconds. Set max_events to drop each connection after that many events to exercise reconnects.
+    """
+
+    handler = _StreamHandler
+
+    def __init__(
+        self,
+        events: Callable[[List[str], List[str]], Iterator[dict]] = synthetic_events,
+        interval: float = 0.001,
+        max_events: int = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ):
+        super().__init__(host, port)
+        self.events = events
+        self.interval = interval
+        self.max_events = max_events
+        self.sessions = set()
+        self.connections = []
+
+    def create_session(self) -> dict:
+        sessionid = uuid.uuid4().hex
+        self.sessions.add(sessionid)
+        return {"url": f"{self.url}v1/markets/events", "sessionid": sessionid}
@@ -2,11 +2,73 @@ from datetime import date, datetime, time
 from enum import Enum
 from typing import Any, List, Optional
 
-from pydantic import BaseModel, Field, field_validator
+import pydantic
+from pydantic import ConfigDict, Field, field_validator, model_validator
+
+import tradier_python.parsing as parsing
 
 BROKERAGE_ENDPOINT = "https://api.tradier.com/"
 SANDBOX_ENDPOINT = "https://sandbox.tradier.com/"
 
+# The API models, which `from tradier_python import *` exports. BaseModel below is not among them: it would replace
+# pydantic's BaseModel (and its validation at definition time) in code that star-imports the package.
+__all__ = [
+    "BROKERAGE_ENDPOINT",
+    "SANDBOX_ENDPOINT",
+    "OptionType",
+    "Account",
+    "Profile",
+    "Margin",
+    "Cash",
+    "Pdt",
+    "Balances",
+    "Position",
+    "Positions",
+    "TradeEvent",
+    "AdjustmentEvent",
+    "OptionEvent",
+    "JournalEvent",
+    "Event",
+    "AccountHistory",
+    "ClosedPosition",
+    "Gainloss",
+    "Leg",
+    "Order",
+    "Orders",
+    "AccountsAPIResponse",
+    "Greeks",
+    "Quote",
+    "UnmatchedSymbols",
+    "Quotes",
+    "Options",
+    "Strikes",
+    "Expirations",
+    "Symbol",
+    "HistoricQuote",
+    "History",
+    "TimesalesData",
+    "Series",
+    "Security",
+    "Securities",
+    "Clock",
+    "Premarket",
+    "Open",
+    "Postmarket",
+    "Hours",
+    "Days",
+    "Calendar",
+    "MarketsAPIResponse",
+    "OrderDetails",
+    "APIErrors",
+    "OrderAPIResponse",
+]
+
+
+class BaseModel(pydantic.BaseModel):
+    # Validators are built when a model is first used rather than when this module is imported, so importing the
+    # package stays cheap and programs only pay for the models they use.
+    model_config = ConfigDict(defer_build=True)
+
 
 class OptionType(Enum):
     CALL = "call"
@@ -25,6 +87,18 @@ class OptionType(Enum):
         return self.value == other
 
 
+class ListResponse(BaseModel):
+    """
+    An object holding a list of results. When there are no results the API sends "null" or an empty list instead of
+    the object, and a single result is sent without a list around it. Both are normalized before validation.
+    """
+
+    @model_validator(mode="before")
+    @classmethod
+    def normalize(cls, data):
+        return parsing.normalize_lists(cls, data)
+
+
 class Account(BaseModel):
     account_number: str
     classification: str
@@ -105,7 +179,7 @@ class Position(BaseModel):
     symbol: str
 
 
-class Positions(BaseModel):
+class Positions(ListResponse):
     position: List[Position] = []
 
 
@@ -144,7 +218,7 @@ class Event(BaseModel):
     journal: Optional[JournalEvent] = None
 
 
-class AccountHistory(BaseModel):
+class AccountHistory(ListResponse):
     event: List[Event] = []
 
 
@@ -160,7 +234,7 @@ class ClosedPosition(BaseModel):
     term: int
 
 
-class Gainloss(BaseModel):
+class Gainloss(ListResponse):
     closed_position: List[ClosedPosition] = []
 
 
@@ -208,8 +282,14 @@ class Order(BaseModel):
     tag: Optional[str] = None
     leg: Optional[List[Leg]] = None
 
+    @field_validator("leg", mode="before")
+    @classmethod
+    def to_list(cls, v):
+        """An order with a single leg has it as an object rather than a list."""
+        return parsing.normalize_list(v, empty=False)
+
 
-class Orders(BaseModel):
+class Orders(ListResponse):
     order: List[Order] = []
 
 
@@ -277,23 +357,29 @@ class Quote(BaseModel):
 
 
 class UnmatchedSymbols(BaseModel):
-    symbol: str
+    symbol: List[str]
+
+    @field_validator("symbol", mode="before")
+    @classmethod
+    def to_list(cls, v):
+        """A single unmatched symbol is returned as a string rather than a list."""
+        return v if isinstance(v, list) else [v]
 
 
-class Quotes(BaseModel):
-    quotes: List[Quote] = Field(alias="quote")
+class Quotes(ListResponse):
+    quotes: List[Quote] = Field([], alias="quote")
     unmatched_symbols: Optional[UnmatchedSymbols] = None
 
 
-class Options(BaseModel):
-    option: List[Quote]
+class Options(ListResponse):
+    option: List[Quote] = []
 
 
-class Strikes(BaseModel):
-    strike: List[float]
+class Strikes(ListResponse):
+    strike: List[float] = []
 
 
-class Expirations(BaseModel):
+class Expirations(ListResponse):
     date: List[date]
 
 
@@ -311,24 +397,24 @@ class HistoricQuote(BaseModel):
     volume: int
 
 
-class History(BaseModel):
-    day: List[HistoricQuote]
+class History(ListResponse):
+    day: List[HistoricQuote] = []
 
 
 class TimesalesData(BaseModel):
     time: datetime
     timestamp: int
     price: float
-    open: float
-    high: float
-    low: float
-    close: float
+    open: Optional[float] = None
+    high: Optional[float] = None
+    low: Optional[float] = None
+    close: Optional[float] = None
     volume: int
-    vwap: float
+    vwap: Optional[float] = None
 
 
-class Series(BaseModel):
-    data: List[TimesalesData]
+class Series(ListResponse):
+    data: List[TimesalesData] = []
 
 
 class Security(BaseModel):
@@ -338,8 +424,8 @@ class Security(BaseModel):
     description: Optional[str]
 
 
-class Securities(BaseModel):
-    security: List[Security]
+class Securities(ListResponse):
+    security: List[Security] = []
 
 
 class Clock(BaseModel):
@@ -375,8 +461,8 @@ class Hours(BaseModel):
     postmarket: Optional[Postmarket]
 
 
-class Days(BaseModel):
-    day: List[Hours]
+class Days(ListResponse):
+    day: List[Hours] = []
 
 
 class Calendar(BaseModel):
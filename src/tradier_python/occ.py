@@ -0,0 +1,106 @@
+"""
+Encoding and decoding of OCC option symbols, the format Tradier uses for option contracts: the root symbol, the
+expiration as YYMMDD, C or P, and the strike times 1000 as eight digits. AAPL220617C00270000 is the AAPL 270 call
+expiring 2022-06-17.
+
+The fields sit at fixed offsets from the end of the symbol, so decoding slices the string instead of scanning it. The
+batch functions also reuse parsed expirations, which a chain shares between all of its contracts.
+"""
+
+from datetime import date
+from typing import Dict, Iterable, List, NamedTuple, Tuple, Union
+
+_TYPES = {"C": "call", "P": "put"}
+_CODES = {"call": "C", "put": "P", "c": "C", "p": "P"}
+MAX_STRIKE = 99999.999
+
+
+class OptionSymbol(NamedTuple):
+    root: str
+    expiration: date
+    option_type: str
+    strike: float
+
+    @property
+    def symbol(self) -> str:
+        return encode_option_symbol(*self)
+
+
+def option_type_code(option_type) -> str:
+    """C or P for an option type given as "call"/"put", "C"/"P" or an OptionType"""
+    try:
+        return _CODES[str(option_type).lower()]
+    except KeyError:
+        raise ValueError(f"not an option type: {option_type!r}") from None
+
+
+def normalize_option_type(option_type) -> str:
+    """the option type as "call" or "put", given as "call"/"put", "C"/"P" or an OptionType"""
+    return _TYPES[option_type_code(option_type)]
+
+
+def _expiration_code(expiration: Union[date, str]) -> str:
+    if isinstance(expiration, str):
+        expiration = date.fromisoformat(expiration)
+    return expiration.strftime("%y%m%d")
+
+
+def _strike_code(strike: float) -> str:
+    if not 0 <= strike <= MAX_STRIKE:
+        raise ValueError(f"strike out of range for an OCC symbol: {strike}")
+    return f"{round(strike * 1000):08d}"
+
+
+def encode_option_symbol(
+    root: str, expiration: Union[date, str], option_type, strike: float
+) -> str:
+    """the OCC symbol of a contract, e.g. encode_option_symbol("AAPL", date(2022, 6, 17), "call", 270)"""
+    return (
+        f"{root}{_expiration_code(expiration)}"
+        f"{option_type_code(option_type)}{_strike_code(strike)}"
+    )
+
+
+def encode_option_symbols(
+    contracts: Iterable[Tuple[str, Union[date, str], str, float]],
+) -> List[str]:
+    """the OCC symbols of (root, expiration, option_type, strike) tuples"""
+    expirations: Dict[Union[date, str], str] = {}
+    symbols = []
+    for root, expiration, option_type, strike in contracts:
+        code = expirations.get(expiration)
+        if code is None:
+            code = expirations[expiration] = _expiration_code(expiration)
+        symbols.append(
+            f"{root}{code}{option_type_code(option_type)}{_strike_code(strike)}"
+        )
+    return symbols
+
+
+def _decode(symbol: str, expirations: Dict[str, date]) -> OptionSymbol:
+    try:
+        code = symbol[-15:-9]
+        expiration = expirations.get(code)
+        if expiration is None:
+            expiration = expirations[code] = date(
+                2000 + int(code[:2]), int(code[2:4]), int(code[4:])
+            )
+        root = symbol[:-15].rstrip()
+        if not root:
+            raise ValueError
+        return OptionSymbol(
+            root, expiration, _TYPES[symbol[-9]], int(symbol[-8:]) / 1000
+        )
+    except (ValueError, KeyError, IndexError):
+        raise ValueError(f"not an OCC option symbol: {symbol!r}") from None
+
+
+def decode_option_symbol(symbol: str) -> OptionSymbol:
+    """the root, expiration, option type ("call" or "put") and strike of an OCC symbol"""
+    return _decode(symbol, {})
+
+
+def decode_option_symbols(symbols: Iterable[str]) -> List[OptionSymbol]:
+    """decode_option_symbol for many symbols"""
+    expirations: Dict[str, date] = {}
+    return [_decode(symbol, expirations) for symbol in symbols]
@@ -0,0 +1,172 @@
+from bisect import bisect_left, bisect_right
+from datetime import date
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
+
+from tradier_python.models import Quote
+from tradier_python.occ import (
+    OptionSymbol,
+    decode_option_symbols,
+    normalize_option_type,
+)
+
+Contract = Union[Quote, dict]
+
+
+def _symbol(contract: Contract) -> str:
+    return contract["symbol"] if isinstance(contract, dict) else contract.symbol
+
+
+def _expiration(expiration: Union[date, str]) -> date:
+    return date.fromisoformat(expiration) if isinstance(expiration, str) else expiration
+
+
+class OptionChainIndex:
+    """
+    Option contracts indexed by (root, expiration, strike, option_type), for spread builders and other code that
+    looks up many contracts in the same chains:
+
+        chain = t.get_option_chain_index("SPY", date(2022, 6, 17))
+        put = chain.get(date(2022, 6, 17), 450, "put")
+        atm = chain.nearest(date(2022, 6, 17), 451.3, "call")
+
+    Exact lookups are a dict lookup; the strikes of every root, expiration and option type are kept sorted, so nearest
+    and range queries are a binary search. Contracts are Quotes, or the option dicts when the client uses
+    validate="raw", and are keyed by their decoded OCC symbols. Chains of several expirations (the values of
+    get_option_surface) can be indexed together.
+
+    The root may be left out of a query when only one root lists contracts for the expiration and option type. When
+    several do (e.g. SPX and SPXW), queries without a root raise ValueError rather than pick one.
+    """
+
+    def __init__(self, contracts: Iterable[Contract] = ()):
+        self._contracts: Dict[Tuple[str, date, float, str], Contract] = {}
+        self._by_symbol: Dict[str, Contract] = {}
+        self._keys: Dict[str, OptionSymbol] = {}
+        self._roots: Dict[Tuple[date, str], Set[str]] = {}
+        self._sides: Dict[Tuple[str, date, str], Dict[float, Contract]] = {}
+        self._strikes: Dict[Tuple[str, date, str], List[float]] = {}
+        self._sorted: Dict[Tuple[str, date, str], List[Contract]] = {}
+        self.add(contracts)
+
+    def add(self, contracts: Iterable[Contract]):
+        """indexes more contracts, replacing any already indexed under the same symbol"""
+        contracts = list(contracts)
+        symbols = [_symbol(c) for c in contracts]
+        changed = set()
+        for contract, symbol, key in zip(
+            contracts, symbols, decode_option_symbols(symbols)
+        ):
+            root, expiration, option_type, strike = key
+            side = (root, expiration, option_type)
+            self._contracts[root, expiration, strike, option_type] = contract
+            self._roots.setdefault((expiration, option_type), set()).add(root)
+            self._sides.setdefault(side, {})[strike] = contract
+            self._by_symbol[symbol] = contract
+            self._keys[symbol] = key
+            changed.add(side)
+        for side in changed:
+            by_strike = self._sides[side]
+            strikes = sorted(by_strike)
+            self._strikes[side] = strikes
+            self._sorted[side] = [by_strike[strike] for strike in strikes]
+
+    def __len__(self) -> int:
+        return len(self._by_symbol)
+
+    def __iter__(self) -> Iterator[Contract]:
+        return iter(self._by_symbol.values())
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self._by_symbol
+
+    def __getitem__(self, key: Tuple[Union[date, str], float, str]) -> Contract:
+        expiration, strike, option_type = key
+        contract = self.get(expiration, strike, option_type)
+        if contract is None:
+            raise KeyError(key)
+        return contract
+
+    def __repr__(self):
+        return f"<OptionChainIndex contracts={len(self)} expirations={len(self.expirations)}>"
+
+    def _side(
+        self, expiration: Union[date, str], option_type, root: Optional[str]
+    ) -> Tuple[str, date, str]:
+        expiration = _expiration(expiration)
+        option_type = normalize_option_type(option_type)
+        if root is None:
+            roots = self._roots.get((expiration, option_type), ())
+            if len(roots) > 1:
+                raise ValueError(
+                    f"contracts of several roots ({', '.join(sorted(roots))}) expire on {expiration}; pass root"
+                )
+            root = next(iter(roots), "")
+        return root.upper(), expiration, option_type
+
+    def get(
+        self,
+        expiration: Union[date, str],
+        strike: float,
+        option_type,
+        root: str = None,
+    ) -> Optional[Contract]:
+        """the contract with this expiration, strike and option type ("call"/"put", "C"/"P"), or None"""
+        root, expiration, option_type = self._side(expiration, option_type, root)
+        return self._contracts.get((root, expiration, strike, option_type))
+
+    def by_symbol(self, symbol: str) -> Optional[Contract]:
+        return self._by_symbol.get(symbol)
+
+    def key(self, symbol: str) -> OptionSymbol:
+        """the decoded OCC symbol of an indexed contract"""
+        return self._keys[symbol]
+
+    @property
+    def roots(self) -> List[str]:
+        return sorted({root for root, _, _ in self._sides})
+
+    @property
+    def expirations(self) -> List[date]:
+        return sorted({expiration for _, expiration, _ in self._sides})
+
+    def strikes(
+        self, expiration: Union[date, str], option_type="call", root: str = None
+    ) -> List[float]:
+        """the strikes listed for an expiration and option type, ascending"""
+        return list(self._strikes.get(self._side(expiration, option_type, root), ()))
+
+    def _sorted_side(
+        self, expiration, option_type, root
+    ) -> Tuple[List[float], List[Contract]]:
+        side = self._side(expiration, option_type, root)
+        return self._strikes.get(side, []), self._sorted.get(side, [])
+
+    def nearest(
+        self,
+        expiration: Union[date, str],
+        strike: float,
+        option_type,
+        root: str = None,
+    ) -> Optional[Contract]:
+        """the contract whose strike is closest to strike (the lower one on a tie), or None if there are none"""
+        strikes, contracts = self._sorted_side(expiration, option_type, root)
+        if not strikes:
+            return None
+        i = bisect_left(strikes, strike)
+        if i == len(strikes) or (
+            i > 0 and strike - strikes[i - 1] <= strikes[i] - strike
+        ):
+            i -= 1
+        return contracts[i]
+
+    def between(
+        self,
+        expiration: Union[date, str],
+        low: float,
+        high: float,
+        option_type,
+        root: str = None,
+    ) -> List[Contract]:
+        """the contracts with low <= strike <= high, by ascending strike"""
+        strikes, contracts = self._sorted_side(expiration, option_type, root)
+        return contracts[bisect_left(strikes, low) : bisect_right(strikes, high)]
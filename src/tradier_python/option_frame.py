@@ -0,0 +1,182 @@
+from datetime import date, datetime
+from typing import Any, Dict, List
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+from tradier_python.models import Quote
+
+FLOAT_COLUMNS = ("strike", "bid", "ask", "last")
+INT_COLUMNS = ("volume", "open_interest")
+GREEK_COLUMNS = (
+    "delta",
+    "gamma",
+    "theta",
+    "vega",
+    "rho",
+    "phi",
+    "bid_iv",
+    "mid_iv",
+    "ask_iv",
+    "smv_vol",
+)
+
+
+class OptionChainFrame:
+    """
+    Columnar view of an option chain. Every field is a NumPy array filled straight from the JSON response, so a chain
+    of thousands of contracts costs a handful of arrays instead of one pydantic Quote (and Greeks) per contract.
+
+    Columns: symbol, strike, bid, ask, last, volume, open_interest, expiration (datetime64[D]), option_type ("call" or
+    "put") and the greeks (NaN when the chain was fetched without greeks). Indexing with a boolean mask, an index
+    array or a slice returns a new frame; indexing with a column name returns the column.
+
+    with_greeks computes the greeks locally from the bid, ask and underlying price, so chains can be fetched without
+    greeks and still have current ones.
+    """
+
+    def __init__(self, columns: Dict[str, Any], records, greeks_updated: str = None):
+        self.columns = columns
+        self._records = records
+        # set when the greek columns were computed by with_greeks rather than read from the response
+        self.greeks_updated = greeks_updated
+
+    @classmethod
+    def from_records(cls, options: List[dict]) -> "OptionChainFrame":
+        """Builds a frame from the option dicts of a /v1/markets/options/chains response."""
+        if np is None:
+            raise ImportError(
+                "OptionChainFrame requires numpy. Install it with `pip install tradier-python[numpy]`."
+            )
+        columns = {
+            "symbol": np.array([o["symbol"] for o in options], dtype=str),
+            "expiration": np.array(
+                [o.get("expiration_date") for o in options], dtype="datetime64[D]"
+            ),
+            "option_type": np.array(
+                [o.get("option_type") or "" for o in options], dtype="U4"
+            ),
+        }
+        for name in FLOAT_COLUMNS:
+            columns[name] = np.array([o.get(name) for o in options], dtype=np.float64)
+        for name in INT_COLUMNS:
+            columns[name] = np.array(
+                [o.get(name) or 0 for o in options], dtype=np.int64
+            )
+        greeks = [o.get("greeks") or {} for o in options]
+        for name in GREEK_COLUMNS:
+            columns[name] = np.array([g.get(name) for g in greeks], dtype=np.float64)
+
+        records = np.empty(len(options), dtype=object)
+        records[:] = options
+        return cls(columns, records)
+
+    def __len__(self):
+        return len(self._records)
+
+    def __getattr__(self, name):
+        try:
+            return self.__dict__["columns"][name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            return self.columns[key]
+        if isinstance(key, (int, np.integer)):
+            key = slice(key, key + 1 or None)
+        return OptionChainFrame(
+            {name: column[key] for name, column in self.columns.items()},
+            self._records[key],
+            self.greeks_updated,
+        )
+
+    def __repr__(self):
+        return f"<OptionChainFrame contracts={len(self)}>"
+
+    @property
+    def mid(self):
+        return (self.columns["bid"] + self.columns["ask"]) / 2
+
+    def calls(self) -> "OptionChainFrame":
+        return self[self.columns["option_type"] == "call"]
+
+    def puts(self) -> "OptionChainFrame":
+        return self[self.columns["option_type"] == "put"]
+
+    def dte(self, today: date = None):
+        """days to expiration of every contract, counted from today unless another date is given"""
+        today = np.datetime64(today or date.today(), "D")
+        return (self.columns["expiration"] - today).astype(np.int64)
+
+    def moneyness(self, underlying_price: float):
+        """strike divided by the underlying price"""
+        return self.columns["strike"] / underlying_price
+
+    def filter_moneyness(
+        self, underlying_price: float, low: float, high: float
+    ) -> "OptionChainFrame":
+        """contracts with low <= strike / underlying_price <= high"""
+        m = self.moneyness(underlying_price)
+        return self[(m >= low) & (m <= high)]
+
+    def filter_delta(
+        self, low: float, high: float, absolute: bool = True
+    ) -> "OptionChainFrame":
+        """contracts whose delta (its absolute value unless absolute is False) lies between low and high. Contracts
+        without greeks never match."""
+        delta = self.columns["delta"]
+        if absolute:
+            delta = np.abs(delta)
+        return self[(delta >= low) & (delta <= high)]
+
+    def filter_dte(
+        self, min_dte: int = 0, max_dte: int = None, today: date = None
+    ) -> "OptionChainFrame":
+        """contracts expiring between min_dte and max_dte days from today, inclusive"""
+        dte = self.dte(today)
+        mask = dte >= min_dte
+        if max_dte is not None:
+            mask &= dte <= max_dte
+        return self[mask]
+
+    def with_greeks(
+        self,
+        underlying_price: float,
+        rate: float = 0.0,
+        dividend: float = 0.0,
+        now: datetime = None,
+    ) -> "OptionChainFrame":
+        """
+        A frame with the greek columns computed by the vectorized Black-Scholes engine in tradier_python.greeks, for
+        the given underlying price, risk-free rate and dividend yield (annualized fractions) at now (default: the
+        current time). Contracts without a usable bid/ask mid get NaN greeks.
+        """
+        from tradier_python.greeks import MARKET_TIMEZONE, chain_greeks
+
+        now = now or datetime.now(MARKET_TIMEZONE)
+        if now.tzinfo is not None:
+            now = now.astimezone(MARKET_TIMEZONE)
+        columns = dict(self.columns)
+        columns.update(chain_greeks(self, underlying_price, rate, dividend, now))
+        return OptionChainFrame(
+            columns, self._records, now.strftime("%Y-%m-%d %H:%M:%S")
+        )
+
+    def _record(self, i: int) -> dict:
+        record = self._records[i]
+        if self.greeks_updated is None:
+            return record
+        greeks = {name: float(self.columns[name][i]) for name in GREEK_COLUMNS}
+        greeks["updated_at"] = self.greeks_updated
+        return {**record, "greeks": greeks}
+
+    def quote(self, i: int) -> Quote:
+        """validates a single contract into a Quote"""
+        return Quote(**self._record(i))
+
+    def to_quotes(self) -> List[Quote]:
+        """validates every contract into a Quote, the same list get_option_chains returns"""
+        return [Quote(**self._record(i)) for i in range(len(self))]
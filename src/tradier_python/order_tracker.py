@@ -0,0 +1,137 @@
+from typing import Dict, List, NamedTuple, Optional
+
+from tradier_python.models import AccountsAPIResponse, Order
+from tradier_python.parsing import parse_response, raw_value
+
+# Statuses of orders that can still fill.
+OPEN_STATUSES = ("pending", "open", "partially_filled")
+
+
+class OrderChange(NamedTuple):
+    """
+    A change seen by OrderTracker. kind is "new", "partial_fill", "filled", "canceled" or, for any other change
+    (e.g. pending -> open, rejected, expired), "updated". previous is None for new orders.
+    """
+
+    kind: str
+    order: Order
+    previous: Optional[Order]
+
+
+def change_kind(raw: dict, previous: Optional[dict]) -> str:
+    if previous is None:
+        return "new"
+    status = raw.get("status")
+    if status != previous.get("status") and status in ("filled", "canceled"):
+        return status
+    if (raw.get("exec_quantity") or 0) > (previous.get("exec_quantity") or 0):
+        return "partial_fill"
+    return "updated"
+
+
+class OrderTracker:
+    """
+    In-memory order book of an account, kept current by polling get_orders. Each refresh compares the raw JSON of
+    every order with what it was last time and only parses the orders that changed, so a poll of an unchanged day of
+    orders costs a dict comparison per order instead of validating every Order and Leg again.
+
+        tracker = OrderTracker(t)
+        for change in tracker.refresh():
+            if change.kind == "filled":
+                ...
+        tracker.open_orders("SPY")
+
+    Orders are parsed according to the client's validate mode. Open orders are indexed by symbol and by option symbol.
+    """
+
+    def __init__(self, api, account_id: str = None):
+        self.api = api
+        self.account_id = account_id or api.default_account_id
+        self.orders: Dict[int, Order] = {}
+        self._raw: Dict[int, dict] = {}
+        self._open: Dict[str, Dict[int, Order]] = {}
+
+    def __len__(self) -> int:
+        return len(self.orders)
+
+    def get(self, order_id: int) -> Optional[Order]:
+        return self.orders.get(order_id)
+
+    def open_orders(self, symbol: str) -> List[Order]:
+        """the open orders of a symbol or option symbol"""
+        return list(self._open.get(symbol, {}).values())
+
+    def by_status(self, status: str) -> List[Order]:
+        return [
+            self.orders[order_id]
+            for order_id, raw in self._raw.items()
+            if raw.get("status") == status
+        ]
+
+    def _url(self) -> str:
+        return f"/v1/accounts/{self.account_id}/orders"
+
+    def refresh(self) -> List[OrderChange]:
+        """polls the account's orders and returns what changed since the last refresh"""
+        data = self.api.get(self._url(), {"includeTags": True})
+        return self.update(
+            raw_value(AccountsAPIResponse, data, "orders", "order") or []
+        )
+
+    def update(self, raw_orders: List[dict]) -> List[OrderChange]:
+        """Applies a full list of raw orders, as returned by the orders endpoint, and returns the changes."""
+        changes = []
+        seen = set()
+        for raw in raw_orders:
+            order_id = raw["id"]
+            seen.add(order_id)
+            previous_raw = self._raw.get(order_id)
+            if previous_raw == raw:
+                continue
+            order = parse_response(self.api.validate, Order, raw)
+            previous = self.orders.get(order_id)
+            changes.append(OrderChange(change_kind(raw, previous_raw), order, previous))
+            self._unindex(order_id)
+            self._raw[order_id] = raw
+            self.orders[order_id] = order
+            self._index(order_id)
+        for order_id in [i for i in self._raw if i not in seen]:
+            self._unindex(order_id)
+            del self._raw[order_id]
+            del self.orders[order_id]
+        return changes
+
+    def _symbols(self, order_id: int) -> List[str]:
+        raw = self._raw[order_id]
+        symbols = [raw.get("symbol"), raw.get("option_symbol")]
+        legs = raw.get("leg") or []
+        if isinstance(legs, dict):
+            legs = [legs]
+        symbols += [leg.get("option_symbol") for leg in legs]
+        return [s for s in dict.fromkeys(symbols) if s]
+
+    def _index(self, order_id: int):
+        if self._raw[order_id].get("status") in OPEN_STATUSES:
+            for symbol in self._symbols(order_id):
+                self._open.setdefault(symbol, {})[order_id] = self.orders[order_id]
+
+    def _unindex(self, order_id: int):
+        if order_id not in self._raw:
+            return
+        for symbol in self._symbols(order_id):
+            orders = self._open.get(symbol)
+            if orders is not None:
+                orders.pop(order_id, None)
+                if not orders:
+                    del self._open[symbol]
+
+
+class AsyncOrderTracker(OrderTracker):
+    """OrderTracker for use with AsyncTradierAPI, whose refresh is a coroutine."""
+
+    async def refresh(self) -> List[OrderChange]:
+        """polls the account's orders and returns what changed since the last refresh"""
+        data = await self.api.get(self._url(), {"includeTags": True})
+        return self.update(
+            raw_value(AccountsAPIResponse, data, "orders", "order") or []
+        )
@@ -0,0 +1,304 @@
+"""
+Response parsing for the Tradier clients.
+
+Clients parse every response in one of three modes:
+
+* ``"full"`` validates the response with the pydantic models. Datetimes, dates and enums are parsed and every field
+  is type checked. This is the default.
+* ``"construct"`` builds the same models without validation. Nested models and lists are still built, and a single
+  object where the model expects a list is wrapped in one, but values are kept exactly as the API sent them: for
+  example ``Quote.bid_date`` stays an epoch timestamp in milliseconds and ``Quote.option_type`` stays a string.
+* ``"raw"`` skips the models entirely and returns the JSON dicts. Only the values along the requested path are
+  normalized: an empty list is returned as ``[]`` and a single object as a list of one.
+
+Every mode normalizes the API's empty and singleton lists in the same pass that parses the response: Tradier sends
+``"null"`` (or ``[]``) instead of an empty object, ``null`` instead of an empty list and a lone object instead of a list
+of one. List fields that default to an empty list are read as empty when the API sends nothing for them.
+
+Responses are decoded with orjson when it is installed and with the standard library json module otherwise; see
+get_decoder.
+"""
+
+import codecs
+import json
+import typing
+from functools import lru_cache
+from typing import Any, Callable, NamedTuple, Tuple, Union
+
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+PARSE_MODES = ("full", "construct", "raw")
+DECODERS = ("json", "orjson")
+
+
+def check_parse_mode(mode: str) -> str:
+    if mode not in PARSE_MODES:
+        raise ValueError(f"validate must be one of {PARSE_MODES}, got {mode!r}")
+    return mode
+
+
+def get_decoder(decoder: Union[str, Callable, None] = None) -> Callable[[bytes], Any]:
+    """
+    The function that decodes response bodies: "json" (the standard library), "orjson" or any callable taking the
+    body as bytes. None picks orjson when it is installed.
+    """
+    if callable(decoder):
+        return decoder
+    if decoder is None:
+        decoder = "json" if orjson is None else "orjson"
+    if decoder not in DECODERS:
+        raise ValueError(
+            f"decoder must be one of {DECODERS} or a callable, got {decoder!r}"
+        )
+    if decoder == "json":
+        return json.loads
+    if orjson is None:
+        raise ImportError(
+            "The orjson decoder requires orjson. Install it with `pip install tradier-python[fast]`."
+        )
+    return orjson.loads
+
+
+def parse_response(mode: str, model, data: dict, *path: str) -> Any:
+    """
+    Parses data with model according to mode and returns the value found by following path, a sequence of JSON keys.
+    Returns None if any value along the path is missing.
+    """
+    if mode == "raw":
+        return raw_value(model, data, *path)
+
+    res = construct(model, data) if mode == "construct" else model(**data)
+    for key in path:
+        if res is None:
+            return None
+        res = getattr(res, attribute_name(type(res), key))
+    return res
+
+
+def raw_value(model, data: dict, *path: str) -> Any:
+    """
+    Follows path through the JSON dicts of a response shaped like model, normalizing empty and singleton lists along
+    the way and in the object it ends at, but leaving everything else as it is.
+    """
+    res = data
+    for key in path:
+        if res is None:
+            return None
+        field = model_plan(model).fields.get(key)
+        res = res.get(key)
+        if field is None:
+            model = None
+            continue
+        kind, model, empty = field
+        res = normalize_model(res) if kind == "model" else normalize_list(res, empty)
+    if model is not None and isinstance(res, dict):
+        res = normalize_lists(model, res)
+    return res
+
+
+def normalize_lists(model, data):
+    """data, an object shaped like model, with the lists of its list fields normalized; data is not modified"""
+    data = normalize_model(data)
+    if not isinstance(data, dict):
+        return data
+    for key, (kind, _, empty) in model_plan(model).fields.items():
+        if kind == "list" and key in data and not isinstance(data[key], list):
+            data = {**data, key: normalize_list(data[key], empty)}
+    return data
+
+
+def normalize_model(value):
+    """the "null" string or empty list the API sends for an empty object, as an empty dict"""
+    if value == "null" or value == []:
+        return {}
+    return value
+
+
+def normalize_list(value, empty: bool = True):
+    """a lone object as a list of one, and "null" (or null, where empty) as an empty list"""
+    if isinstance(value, list):
+        return value
+    if value == "null" or (value is None and empty):
+        return []
+    return value if value is None else [value]
+
+
+@lru_cache(maxsize=None)
+def attribute_name(model, key: str) -> str:
+    """maps a JSON key to the name of the model field it populates"""
+    for name, field in model.model_fields.items():
+        if field.alias == key:
+            return name
+    return key
+
+
+def construct(model, data):
+    """
+    Recursively builds model from data without validation. This fills the model instance directly, the same way
+    BaseModel.model_construct does, but only visits the fields that need renaming or nesting.
+    """
+    if not isinstance(data, dict):
+        return data
+    plan = model_plan(model)
+    values = plan.defaults.copy()
+    values.update(data)
+    for name in plan.mutable_defaults:
+        if name not in data:
+            values[name] = model.model_fields[name].get_default(
+                call_default_factory=True
+            )
+    for alias, name in plan.aliases:
+        if alias in values:
+            values[name] = values.pop(alias)
+    for name, kind, submodel, empty in plan.nested:
+        raw = values.get(name)
+        if kind == "model":
+            if raw is not None:
+                values[name] = construct(submodel, normalize_model(raw))
+            continue
+        raw = normalize_list(raw, empty)
+        if raw and submodel is not None:
+            raw = [construct(submodel, item) for item in raw]
+        values[name] = raw
+
+    obj = _new(model)
+    _set_dict(obj, values)
+    _set_fields_set(obj, set(data))
+    _set_extra(obj, None)
+    _set_private(obj, None)
+    return obj
+
+
+_new = object.__new__
+_set_dict = BaseModel.__dict__["__dict__"].__set__
+_set_fields_set = BaseModel.__pydantic_fields_set__.__set__
+_set_extra = BaseModel.__pydantic_extra__.__set__
+_set_private = BaseModel.__pydantic_private__.__set__
+
+
+class ModelPlan(NamedTuple):
+    defaults: dict
+    mutable_defaults: Tuple[str, ...]
+    aliases: Tuple[Tuple[str, str], ...]
+    nested: Tuple[Tuple[str, str, Any, bool], ...]
+    fields: dict
+
+
+@lru_cache(maxsize=None)
+def model_plan(model) -> ModelPlan:
+    """
+    Precomputes what construct needs to know about a model: immutable defaults, fields whose defaults must be copied,
+    (alias, name) pairs, and (name, kind, nested model, empty) for fields holding a model ("model") or a list
+    ("list"), where empty tells whether a missing list is read as []. fields maps the JSON keys of the nested fields
+    to their (kind, nested model, empty).
+    """
+    defaults, mutable_defaults, aliases, nested, fields = {}, [], [], [], {}
+    for name, field in model.model_fields.items():
+        if not field.is_required():
+            if field.default_factory is None and not isinstance(
+                field.default, (list, dict, set)
+            ):
+                defaults[name] = field.default
+            else:
+                mutable_defaults.append(name)
+        if field.alias and field.alias != name:
+            aliases.append((field.alias, name))
+
+        annotation = unwrap_optional(field.annotation)
+        if typing.get_origin(annotation) in (list, typing.List):
+            args = typing.get_args(annotation)
+            item = unwrap_optional(args[0]) if args else None
+            if not (isinstance(item, type) and issubclass(item, BaseModel)):
+                item = None
+            nested.append((name, "list", item, field.default == []))
+        elif isinstance(annotation, type) and issubclass(annotation, BaseModel):
+            nested.append((name, "model", annotation, False))
+        else:
+            continue
+        fields[field.alias or name] = nested[-1][1:]
+    return ModelPlan(
+        defaults, tuple(mutable_defaults), tuple(aliases), tuple(nested), fields
+    )
+
+
+def unwrap_optional(annotation):
+    """Optional[X] -> X"""
+    if typing.get_origin(annotation) is typing.Union:
+        args = [a for a in typing.get_args(annotation) if a is not type(None)]
+        if len(args) == 1:
+            return args[0]
+    return annotation
+
+
+class JSONArrayParser:
+    """
+    Incremental parser for the array under key in a JSON document, such as the data array of a timesales response.
+    Bytes can be fed in chunks of any size; each call returns the array elements completed by that chunk, so the
+    document is never held in memory whole. A lone object under key counts as an array of one, and null as empty.
+    """
+
+    def __init__(self, key: str):
+        self.key = json.dumps(key)
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._json = json.JSONDecoder()
+        self._buffer = ""
+        self._state = "key"
+
+    def feed(self, chunk: bytes) -> list:
+        buffer = self._buffer + self._decoder.decode(chunk)
+        items, pos, end = [], 0, len(buffer)
+        if self._state == "key":
+            start = buffer.find(self.key)
+            if start < 0:
+                self._buffer = buffer[-len(self.key) :]
+                return items
+            pos = _skip(buffer, start + len(self.key), " \t\r\n:")
+            if pos >= end:
+                self._buffer = buffer[start:]
+                return items
+            if buffer[pos] == "[":
+                self._state = "array"
+                pos += 1
+            elif buffer[pos] == "{":
+                self._state = "object"
+            else:
+                self._state = "done"
+        if self._state == "object":
+            try:
+                obj, pos = self._json.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                pass
+            else:
+                items.append(obj)
+                self._state = "done"
+        while self._state == "array":
+            pos = _skip(buffer, pos, " \t\r\n,")
+            if pos >= end:
+                break
+            if buffer[pos] == "]":
+                self._state = "done"
+                break
+            try:
+                obj, pos = self._json.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                break
+            items.append(obj)
+        self._buffer = "" if self._state == "done" else buffer[pos:]
+        return items
+
+    def close(self):
+        """raises ValueError if the document ended inside the array"""
+        if self._state in ("array", "object"):
+            raise ValueError(f"JSON document ended inside the value of {self.key}")
+
+
+def _skip(buffer: str, pos: int, chars: str) -> int:
+    end = len(buffer)
+    while pos < end and buffer[pos] in chars:
+        pos += 1
+    return pos
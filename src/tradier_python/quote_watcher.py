@@ -0,0 +1,304 @@
+import asyncio
+import itertools
+import math
+import threading
+import time
+import warnings
+from array import array
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import (
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from tradier_python.models import MarketsAPIResponse
+from tradier_python.parsing import raw_value
+from tradier_python.tradier_api import QUOTES_BATCH_SIZE, chunked, split_symbols
+
+QUOTES_PATH = "/v1/markets/quotes"
+WATCHED_FIELDS = ("bid", "ask", "last", "bidsize", "asksize", "volume")
+
+
+class QuoteChange(NamedTuple):
+    """The fields of a symbol's quote that changed, with their new values (None when the field is gone)."""
+
+    symbol: str
+    changed: Dict[str, Optional[float]]
+
+
+class QuoteTable:
+    """
+    The last value of each watched field of every symbol, stored as one array of doubles per field with a row per
+    symbol, NaN where a quote had no value.
+    """
+
+    def __init__(self, fields: Iterable[str] = WATCHED_FIELDS):
+        self.fields: Tuple[str, ...] = tuple(fields)
+        self.symbols: List[str] = []
+        self.rows: Dict[str, int] = {}
+        self.columns = [array("d") for _ in self.fields]
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self.rows
+
+    def add(self, symbol: str):
+        if symbol not in self.rows:
+            self.rows[symbol] = len(self.symbols)
+            self.symbols.append(symbol)
+            for column in self.columns:
+                column.append(math.nan)
+
+    def remove(self, symbol: str):
+        """drops a symbol's row, moving the last row into its place"""
+        row = self.rows.pop(symbol)
+        last = self.symbols.pop()
+        for column in self.columns:
+            value = column.pop()
+            if last != symbol:
+                column[row] = value
+        if last != symbol:
+            self.symbols[row] = last
+            self.rows[last] = row
+
+    def get(self, symbol: str) -> Dict[str, Optional[float]]:
+        row = self.rows[symbol]
+        values = {}
+        for field, column in zip(self.fields, self.columns):
+            value = column[row]
+            values[field] = None if math.isnan(value) else value
+        return values
+
+    def update(self, quote: dict) -> Optional[Dict[str, Optional[float]]]:
+        """stores a raw quote and returns the fields that changed, or None if its symbol is not in the table"""
+        row = self.rows.get(quote.get("symbol"))
+        if row is None:
+            return None
+        changed = {}
+        for field, column in zip(self.fields, self.columns):
+            value = quote.get(field)
+            new = math.nan if value is None else float(value)
+            old = column[row]
+            # NaN never equals itself, so two missing values must not count as a change
+            if new != old and (new == new or old == old):
+                column[row] = new
+                changed[field] = None if value is None else new
+        return changed
+
+
+Subscriber = Callable[[List[QuoteChange]], None]
+
+
+class QuoteWatcher:
+    """
+    One polling loop for everything that needs to know when quotes change. Subscribers register the symbols they
+    care about; every interval the watcher fetches all watched symbols in batches of batch_size (concurrently, with up
+    to max_workers requests), compares the raw quotes with a QuoteTable of the last values and calls each subscriber
+    once with the changes to its symbols:
+
+        def on_change(changes):
+            for change in changes:
+                print(change.symbol, change.changed)
+
+        watcher = QuoteWatcher(t, interval=1.0)
+        watcher.subscribe(on_change, ["SPY", "QQQ"])
+        watcher.start()
+
+    Quotes are not validated into models, and a symbol watched by several subscribers is fetched once. A subscriber
+    is sent the last known values of the symbols that were already polled when it subscribes, and the first poll
+    after subscribing reports every field of the others. A failing subscriber raises a RuntimeWarning.
+    """
+
+    def __init__(
+        self,
+        api,
+        interval: float = 1.0,
+        fields: Iterable[str] = WATCHED_FIELDS,
+        batch_size: int = QUOTES_BATCH_SIZE,
+        max_workers: int = 8,
+    ):
+        self.api = api
+        self.interval = interval
+        self.batch_size = batch_size
+        self.max_workers = max_workers
+        self.table = QuoteTable(fields)
+        self.polls = 0
+        self.last_error: Optional[Exception] = None
+        self._subscribers: Dict[int, Tuple[Subscriber, FrozenSet[str]]] = {}
+        self._watched: Counter = Counter()
+        self._ids = itertools.count()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol.upper() in self.table
+
+    @property
+    def symbols(self) -> List[str]:
+        with self._lock:
+            return list(self.table.symbols)
+
+    def snapshot(self, symbol: str) -> Dict[str, Optional[float]]:
+        """the last values of a watched symbol's fields"""
+        with self._lock:
+            return self.table.get(symbol.upper())
+
+    def subscribe(
+        self, callback: Subscriber, symbols: Union[str, Iterable[str]]
+    ) -> int:
+        """
+        Calls callback with the list of changes to symbols after every poll that changed any of them, and returns an
+        id for unsubscribe. Symbols that other subscribers already watch are sent to callback right away, with the
+        fields they have values for.
+        """
+        symbols = frozenset(s.upper() for s in split_symbols(symbols))
+        known = []
+        with self._lock:
+            subscription = next(self._ids)
+            self._subscribers[subscription] = (callback, symbols)
+            for symbol in symbols:
+                if symbol in self.table:
+                    values = self.table.get(symbol)
+                    last = {k: v for k, v in values.items() if v is not None}
+                    if last:
+                        known.append(QuoteChange(symbol, last))
+                self._watched[symbol] += 1
+                self.table.add(symbol)
+        if known:
+            self._publish(known, [(callback, symbols)])
+        return subscription
+
+    def unsubscribe(self, subscription: int):
+        """stops calling a subscriber, and stops watching the symbols nobody else subscribed to"""
+        with self._lock:
+            _, symbols = self._subscribers.pop(subscription)
+            for symbol in symbols:
+                self._watched[symbol] -= 1
+                if not self._watched[symbol]:
+                    del self._watched[symbol]
+                    self.table.remove(symbol)
+
+    def _batches(self) -> List[List[str]]:
+        with self._lock:
+            return chunked(list(self.table.symbols), self.batch_size)
+
+    def _fetch(self, batch: List[str]) -> List[dict]:
+        data = self.api.post(QUOTES_PATH, {}, {"symbols": ",".join(batch)})
+        return raw_value(MarketsAPIResponse, data, "quotes", "quote") or []
+
+    def refresh(self) -> List[QuoteChange]:
+        """polls every watched symbol once, notifies the subscribers and returns all changes"""
+        batches = self._batches()
+        if len(batches) <= 1:
+            results = [self._fetch(batch) for batch in batches]
+        else:
+            workers = min(self.max_workers, len(batches))
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(self._fetch, batches))
+        return self.update(itertools.chain.from_iterable(results))
+
+    def update(self, quotes: Iterable[dict]) -> List[QuoteChange]:
+        """Applies raw quotes, as returned by the quotes endpoint, and notifies the subscribers of the changes."""
+        changes = []
+        with self._lock:
+            for quote in quotes:
+                changed = self.table.update(quote)
+                if changed:
+                    changes.append(QuoteChange(quote["symbol"], changed))
+            subscribers = list(self._subscribers.values())
+            self.polls += 1
+        if changes:
+            self._publish(changes, subscribers)
+        return changes
+
+    def _publish(self, changes: List[QuoteChange], subscribers):
+        for callback, symbols in subscribers:
+            relevant = [c for c in changes if c.symbol in symbols]
+            if not relevant:
+                continue
+            try:
+                callback(relevant)
+            except Exception as e:
+                warnings.warn(
+                    f"quote subscriber {callback!r} failed: {e!r}", RuntimeWarning
+                )
+
+    def start(self) -> "QuoteWatcher":
+        """starts polling in a background thread, every interval seconds"""
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="quote-watcher", daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        # polls keep a fixed cadence; when a poll overruns, the missed ones are skipped rather than sent back to back
+        next_poll = time.monotonic()
+        while not self._stop.is_set():
+            try:
+                self.refresh()
+                self.last_error = None
+            except Exception as e:
+                self.last_error = e
+            now = time.monotonic()
+            next_poll = max(next_poll + self.interval, now)
+            self._stop.wait(next_poll - now)
+
+
+class AsyncQuoteWatcher(QuoteWatcher):
+    """
+    QuoteWatcher for use with AsyncTradierAPI. refresh is a coroutine, and run() is the polling loop, to be run as a
+    task and cancelled to stop:
+
+        task = asyncio.create_task(watcher.run())
+    """
+
+    async def _fetch(self, batch: List[str]) -> List[dict]:
+        data = await self.api.post(QUOTES_PATH, {}, {"symbols": ",".join(batch)})
+        return raw_value(MarketsAPIResponse, data, "quotes", "quote") or []
+
+    async def refresh(self) -> List[QuoteChange]:
+        """polls every watched symbol once, notifies the subscribers and returns all changes"""
+        semaphore = asyncio.Semaphore(self.max_workers)
+
+        async def fetch(batch):
+            async with semaphore:
+                return await self._fetch(batch)
+
+        results = await asyncio.gather(*(fetch(b) for b in self._batches()))
+        return self.update(itertools.chain.from_iterable(results))
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        next_poll = loop.time()
+        while True:
+            try:
+                await self.refresh()
+                self.last_error = None
+            except Exception as e:
+                self.last_error = e
+            now = loop.time()
+            next_poll = max(next_poll + self.interval, now)
+            await asyncio.sleep(next_poll - now)
+
+    def start(self):
+        raise TypeError("AsyncQuoteWatcher polls in run(); start it as an asyncio task")
@@ -0,0 +1,102 @@
+import threading
+import time
+from typing import Dict, Mapping
+
+# Requests per minute Tradier allows for each quota on the brokerage endpoint. Quotas are refreshed from the
+# X-Ratelimit-* headers after each response, so these only matter until the first response of a category arrives.
+DEFAULT_LIMITS = {"market": 120, "standard": 120, "trading": 60}
+
+
+class TokenBucket:
+    """
+    Token bucket that hands out reservations instead of blocking: reserve() takes a token and returns how long the
+    caller has to wait before using it. Tokens may go negative, which queues later callers behind earlier ones.
+    """
+
+    def __init__(self, limit: int, window: float = 60.0):
+        self.capacity = float(limit)
+        self.rate = limit / window
+        self.window = window
+        self.tokens = float(limit)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self) -> float:
+        """takes a token and returns the number of seconds to wait before sending the request"""
+        with self._lock:
+            self._refill(time.monotonic())
+            self.tokens -= 1
+            return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+    def update(self, allowed: int, available: int, expiry: float):
+        """
+        Syncs the bucket with the quota reported by Tradier: allowed requests per window, requests still available,
+        and the epoch time in seconds when the window resets. The remaining requests are spread over the rest of the
+        window so a burst does not run the quota dry before it resets.
+        """
+        remaining = expiry - time.time()
+        if remaining <= 0:
+            return
+        with self._lock:
+            self._refill(time.monotonic())
+            self.capacity = float(allowed)
+            self.tokens = min(self.tokens, float(available))
+            self.rate = max(available, 1) / remaining
+
+    def exhaust(self, expiry: float):
+        """empties the bucket until expiry, for when Tradier has rejected a request for exceeding the quota"""
+        remaining = max(expiry - time.time(), 1.0)
+        with self._lock:
+            self._refill(time.monotonic())
+            self.tokens = min(self.tokens, 0.0)
+            self.rate = 1 / remaining
+
+
+class RateLimiter:
+    """
+    Client-side rate limiter for Tradier's separate market data, standard (account) and trading quotas. Each quota
+    has its own bucket, so a burst of market data requests never delays order placement.
+    """
+
+    def __init__(self, limits: Mapping[str, int] = None, window: float = 60.0):
+        limits = dict(DEFAULT_LIMITS, **(limits or {}))
+        self.buckets: Dict[str, TokenBucket] = {
+            category: TokenBucket(limit, window) for category, limit in limits.items()
+        }
+
+    @staticmethod
+    def category(method: str, path: str) -> str:
+        """the quota a request counts against: "market", "trading" or "standard" """
+        if path.startswith("/v1/markets"):
+            return "market"
+        if method.upper() != "GET" and "/orders" in path:
+            return "trading"
+        return "standard"
+
+    def reserve(self, method: str, path: str) -> float:
+        """reserves a request and returns how many seconds to wait before sending it"""
+        return self.buckets[self.category(method, path)].reserve()
+
+    def acquire(self, method: str, path: str):
+        """blocks until the request may be sent"""
+        delay = self.reserve(method, path)
+        if delay > 0:
+            time.sleep(delay)
+
+    def update(self, method: str, path: str, status_code: int, headers: Mapping):
+        """updates the bucket of a request from the X-Ratelimit-* headers of its response"""
+        try:
+            allowed = int(headers["X-Ratelimit-Allowed"])
+            available = int(headers["X-Ratelimit-Available"])
+            expiry = int(headers["X-Ratelimit-Expiry"]) / 1000
+        except (KeyError, ValueError):
+            return
+        bucket = self.buckets[self.category(method, path)]
+        if status_code == 429:
+            bucket.exhaust(expiry)
+        else:
+            bucket.update(allowed, available, expiry)
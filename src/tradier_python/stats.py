@@ -0,0 +1,50 @@
+import threading
+from collections import deque
+from typing import Dict
+
+
+class LatencyStats:
+    """Rolling latency statistics over the most recent samples (in seconds)."""
+
+    def __init__(self, maxlen: int = 1000):
+        self.count = 0
+        self.total = 0.0
+        self._samples = deque(maxlen=maxlen)
+        self._lock = threading.Lock()
+
+    def add(self, seconds: float):
+        with self._lock:
+            self.count += 1
+            self.total += seconds
+            self._samples.append(seconds)
+
+    def samples(self) -> list:
+        """the recent samples, oldest first"""
+        with self._lock:
+            return list(self._samples)
+
+    def percentile(self, q: float) -> float:
+        """the q-th percentile (0-100) of the recent samples, or 0.0 when there are none"""
+        with self._lock:
+            samples = sorted(self._samples)
+        return _percentile(samples, q)
+
+    def summary(self) -> Dict[str, float]:
+        """count and mean over all samples; p50, p90, p99 and max over the recent ones"""
+        with self._lock:
+            samples = sorted(self._samples)
+            count, total = self.count, self.total
+        return {
+            "count": count,
+            "mean": total / count if count else 0.0,
+            "p50": _percentile(samples, 50),
+            "p90": _percentile(samples, 90),
+            "p99": _percentile(samples, 99),
+            "max": samples[-1] if samples else 0.0,
+        }
+
+
+def _percentile(samples: list, q: float) -> float:
+    if not samples:
+        return 0.0
+    return samples[min(len(samples) - 1, int(round(q / 100 * (len(samples) - 1))))]
@@ -0,0 +1,707 @@
+import asyncio
+import codecs
+import json
+import threading
+import time
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional
+
+import requests
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover - optional dependency
+    httpx = None
+
+try:
+    import websockets
+    import websockets.asyncio.client
+    import websockets.sync.client
+except ImportError:  # pragma: no cover - optional dependency
+    websockets = None
+
+from tradier_python.models import AccountsAPIResponse
+from tradier_python.parsing import raw_value
+from tradier_python.tradier_api import TradierAPIError
+
+MARKET_SESSION_PATH = "/v1/markets/events/session"
+ACCOUNT_SESSION_PATH = "/v1/accounts/events/session"
+
+# Errors that reconnecting cannot fix, besides 4xx responses.
+_PERMANENT_ERRORS = (
+    ImportError,
+    requests.exceptions.InvalidURL,
+    requests.exceptions.InvalidSchema,
+    requests.exceptions.MissingSchema,
+)
+if httpx is not None:
+    _PERMANENT_ERRORS += (httpx.InvalidURL, httpx.UnsupportedProtocol)
+if websockets is not None:
+    _PERMANENT_ERRORS += (websockets.exceptions.InvalidURI,)
+
+
+def is_permanent_error(e: Exception) -> bool:
+    """
+    Whether a stream failed in a way that retrying cannot fix: a 4xx response other than 429 (e.g. bad credentials,
+    or an endpoint without streaming such as the sandbox), an invalid stream url or a missing dependency.
+    """
+    status = None
+    if isinstance(e, TradierAPIError):
+        status = e.code
+    elif isinstance(e, requests.HTTPError) and e.response is not None:
+        status = e.response.status_code
+    elif httpx is not None and isinstance(e, httpx.HTTPStatusError):
+        status = e.response.status_code
+    elif websockets is not None and isinstance(e, websockets.exceptions.InvalidStatus):
+        status = e.response.status_code
+    if status is not None:
+        return 400 <= status < 500 and status != 429
+    return isinstance(e, _PERMANENT_ERRORS)
+
+
+class StreamQuote(NamedTuple):
+    symbol: str
+    bid: Optional[float]
+    bidsz: Optional[int]
+    bidexch: Optional[str]
+    biddate: Optional[int]
+    ask: Optional[float]
+    asksz: Optional[int]
+    askexch: Optional[str]
+    askdate: Optional[int]
+
+
+class StreamTrade(NamedTuple):
+    """a trade or, with the tradex filter, a trade with extended details"""
+
+    symbol: str
+    exch: Optional[str]
+    price: Optional[float]
+    size: Optional[int]
+    cvol: Optional[int]
+    date: Optional[int]
+    last: Optional[float]
+
+
+class StreamSummary(NamedTuple):
+    symbol: str
+    open: Optional[float]
+    high: Optional[float]
+    low: Optional[float]
+    prev_close: Optional[float]
+
+
+class StreamTimesale(NamedTuple):
+    symbol: str
+    exch: Optional[str]
+    bid: Optional[float]
+    ask: Optional[float]
+    last: Optional[float]
+    size: Optional[int]
+    date: Optional[int]
+    seq: Optional[int]
+    flag: Optional[str]
+    cancel: bool
+    correction: bool
+    session: Optional[str]
+
+
+class OrderEvent(NamedTuple):
+    """an order status change, from the account stream or (source "poll") from reconciling against get_orders"""
+
+    id: int
+    account: Optional[str]
+    status: str
+    type: Optional[str]
+    price: Optional[float]
+    stop_price: Optional[float]
+    avg_fill_price: Optional[float]
+    executed_quantity: Optional[float]
+    last_fill_quantity: Optional[float]
+    remaining_quantity: Optional[float]
+    transaction_date: Optional[str]
+    create_date: Optional[str]
+    tag: Optional[str]
+    source: str
+
+
+def _float(v):
+    return None if v in (None, "") else float(v)
+
+
+def _int(v):
+    return None if v in (None, "") else int(float(v))
+
+
+def _str(v):
+    return None if v in (None, "") else str(v)
+
+
+def to_record(event: dict):
+    """Converts a decoded stream event into its typed record. Unknown event types are returned unchanged."""
+    kind = event.get("type")
+    g = event.get
+    if kind == "quote":
+        return StreamQuote(
+            g("symbol"),
+            _float(g("bid")),
+            _int(g("bidsz")),
+            _str(g("bidexch")),
+            _int(g("biddate")),
+            _float(g("ask")),
+            _int(g("asksz")),
+            _str(g("askexch")),
+            _int(g("askdate")),
+        )
+    if kind in ("trade", "tradex"):
+        return StreamTrade(
+            g("symbol"),
+            _str(g("exch")),
+            _float(g("price")),
+            _int(g("size")),
+            _int(g("cvol")),
+            _int(g("date")),
+            _float(g("last")),
+        )
+    if kind == "summary":
+        return StreamSummary(
+            g("symbol"),
+            _float(g("open")),
+            _float(g("high")),
+            _float(g("low")),
+            _float(g("prevClose")),
+        )
+    if kind == "timesale":
+        return StreamTimesale(
+            g("symbol"),
+            _str(g("exch")),
+            _float(g("bid")),
+            _float(g("ask")),
+            _float(g("last")),
+            _int(g("size")),
+            _int(g("date")),
+            _int(g("seq")),
+            _str(g("flag")),
+            bool(g("cancel")),
+            bool(g("correction")),
+            _str(g("session")),
+        )
+    return event
+
+
+class EventParser:
+    """
+    Incremental parser for a stream of JSON objects, separated by line breaks or simply concatenated. Bytes can be
+    fed in chunks of any size; each call returns the events completed by that chunk.
+    """
+
+    def __init__(self, convert: Callable[[dict], object] = to_record):
+        self.convert = convert
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._json = json.JSONDecoder()
+        self._buffer = ""
+
+    def feed(self, chunk: bytes) -> list:
+        self._buffer += self._decoder.decode(chunk)
+        events = []
+        buffer, pos, end = self._buffer, 0, len(self._buffer)
+        while True:
+            while pos < end and buffer[pos] in " \t\r\n,":
+                pos += 1
+            if pos >= end:
+                break
+            try:
+                obj, pos = self._json.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                break
+            if isinstance(obj, dict):
+                events.append(self.convert(obj))
+        self._buffer = buffer[pos:]
+        return events
+
+
+class _BaseMarketStream:
+    def __init__(
+        self,
+        api,
+        symbols: Iterable[str] = (),
+        event_filter: Iterable[str] = None,
+        valid_only: bool = True,
+        linebreak: bool = True,
+        reconnect_delay: float = 1.0,
+        max_reconnect_delay: float = 30.0,
+    ):
+        self.api = api
+        self.symbols = list(dict.fromkeys(symbols))
+        self.event_filter = list(event_filter) if event_filter else None
+        self.valid_only = valid_only
+        self.linebreak = linebreak
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self.reconnects = 0
+        # the error that ended the last connection, None once events arrive again
+        self.last_error: Optional[Exception] = None
+
+    def stream_params(self, sessionid: str) -> dict:
+        params = {
+            "sessionid": sessionid,
+            "symbols": ",".join(self.symbols),
+            "validOnly": str(self.valid_only).lower(),
+            "linebreak": str(self.linebreak).lower(),
+        }
+        if self.event_filter:
+            params["filter"] = ",".join(self.event_filter)
+        return params
+
+
+class MarketStream(_BaseMarketStream):
+    """
+    Tradier market data stream over HTTP streaming. Iterating the stream yields StreamQuote, StreamTrade,
+    StreamSummary and StreamTimesale records as they arrive. The stream reconnects with a fresh session whenever the
+    connection drops, with exponential backoff up to max_reconnect_delay; the error that ended a connection is kept in
+    last_error. Errors reconnecting cannot fix, such as a 401 or 404 response, are raised (see is_permanent_error).
+    subscribe and unsubscribe may be called from any thread while iterating; the stream reconnects with the new
+    symbol set.
+
+        stream = MarketStream(t, ["SPY", "QQQ"], event_filter=["quote", "trade"])
+        for event in stream:
+            print(event)
+
+    https://documentation.tradier.com/brokerage-api/streaming/get-markets-events
+    """
+
+    def __init__(self, api, symbols: Iterable[str] = (), **kwargs):
+        super().__init__(api, symbols, **kwargs)
+        self._session = requests.Session()
+        self._session.headers.update(api.session.headers)
+        self._lock = threading.Lock()
+        self._changed = threading.Event()
+        self._closed = threading.Event()
+        self._response = None
+
+    def create_session(self) -> Dict[str, str]:
+        """creates a streaming session, returning its stream url and sessionid"""
+        return self.api.post(MARKET_SESSION_PATH, {})["stream"]
+
+    def subscribe(self, *symbols: str):
+        with self._lock:
+            new = [s for s in symbols if s not in self.symbols]
+            self.symbols.extend(new)
+        if new:
+            self._restart()
+
+    def unsubscribe(self, *symbols: str):
+        with self._lock:
+            before = len(self.symbols)
+            self.symbols = [s for s in self.symbols if s not in symbols]
+            changed = len(self.symbols) != before
+        if changed:
+            self._restart()
+
+    def close(self):
+        self._closed.set()
+        self._restart()
+        self._session.close()
+
+    def _restart(self):
+        self._changed.set()
+        response = self._response
+        if response is not None:
+            response.close()
+
+    def __iter__(self) -> Iterator:
+        delay = self.reconnect_delay
+        while not self._closed.is_set():
+            self._changed.clear()
+            if not self.symbols:
+                self._changed.wait()
+                continue
+            try:
+                for event in self._connect():
+                    delay = self.reconnect_delay
+                    self.last_error = None
+                    yield event
+            except Exception as e:
+                if self._closed.is_set():
+                    return
+                self.last_error = e
+                if is_permanent_error(e):
+                    raise
+            if not self._changed.is_set() and not self._closed.is_set():
+                self.reconnects += 1
+                self._closed.wait(delay)
+                delay = min(delay * 2, self.max_reconnect_delay)
+
+    def _connect(self) -> Iterator:
+        stream = self.create_session()
+        response = self._session.post(
+            stream["url"],
+            data=self.stream_params(stream["sessionid"]),
+            stream=True,
+            timeout=(10, 90),
+        )
+        self._response = response
+        try:
+            response.raise_for_status()
+            parser = EventParser()
+            for chunk in response.iter_content(chunk_size=None):
+                if self._changed.is_set():
+                    return
+                yield from parser.feed(chunk)
+        finally:
+            self._response = None
+            response.close()
+
+
+class AsyncMarketStream(_BaseMarketStream):
+    """
+    Asyncio counterpart of MarketStream for use with AsyncTradierAPI. Iterate it with async for; subscribe and
+    unsubscribe reconnect with the new symbol set. Errors are kept and raised as by MarketStream.
+    """
+
+    def __init__(self, api, symbols: Iterable[str] = (), **kwargs):
+        super().__init__(api, symbols, **kwargs)
+        self._changed = asyncio.Event()
+        self._closed = False
+
+    async def create_session(self) -> Dict[str, str]:
+        """creates a streaming session, returning its stream url and sessionid"""
+        data = await self.api.post(MARKET_SESSION_PATH, {})
+        return data["stream"]
+
+    def subscribe(self, *symbols: str):
+        new = [s for s in symbols if s not in self.symbols]
+        if new:
+            self.symbols.extend(new)
+            self._changed.set()
+
+    def unsubscribe(self, *symbols: str):
+        before = len(self.symbols)
+        self.symbols = [s for s in self.symbols if s not in symbols]
+        if len(self.symbols) != before:
+            self._changed.set()
+
+    def close(self):
+        self._closed = True
+        self._changed.set()
+
+    async def __aiter__(self):
+        delay = self.reconnect_delay
+        while not self._closed:
+            self._changed.clear()
+            if not self.symbols:
+                await self._changed.wait()
+                continue
+            try:
+                async for event in self._connect():
+                    delay = self.reconnect_delay
+                    self.last_error = None
+                    yield event
+            except Exception as e:
+                if self._closed:
+                    return
+                self.last_error = e
+                if is_permanent_error(e):
+                    raise
+            if not self._changed.is_set() and not self._closed:
+                self.reconnects += 1
+                try:
+                    await asyncio.wait_for(self._changed.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+                delay = min(delay * 2, self.max_reconnect_delay)
+
+    async def _connect(self):
+        stream = await self.create_session()
+        async with self.api.session.stream(
+            "POST",
+            stream["url"],
+            data=self.stream_params(stream["sessionid"]),
+            timeout=None,
+        ) as response:
+            response.raise_for_status()
+            parser = EventParser()
+            chunks = response.aiter_bytes().__aiter__()
+            changed = asyncio.ensure_future(self._changed.wait())
+            try:
+                while True:
+                    chunk = asyncio.ensure_future(chunks.__anext__())
+                    await asyncio.wait(
+                        [chunk, changed], return_when=asyncio.FIRST_COMPLETED
+                    )
+                    if changed.done():
+                        chunk.cancel()
+                        return
+                    try:
+                        data = chunk.result()
+                    except StopAsyncIteration:
+                        return
+                    for event in parser.feed(data):
+                        yield event
+            finally:
+                changed.cancel()
+
+
+def order_event(data: dict, account: str = None, source: str = "stream") -> OrderEvent:
+    """Converts an account stream event, or an order from a get_orders response, into an OrderEvent."""
+    g = data.get
+    executed = g("executed_quantity")
+    if executed is None:
+        executed = g("exec_quantity")
+    return OrderEvent(
+        _int(g("id")),
+        _str(g("account")) or account,
+        g("status"),
+        _str(g("type")),
+        _float(g("price")),
+        _float(g("stop_price")),
+        _float(g("avg_fill_price")),
+        _float(executed),
+        _float(g("last_fill_quantity")),
+        _float(g("remaining_quantity")),
+        _str(g("transaction_date")),
+        _str(g("create_date")),
+        _str(g("tag")),
+        source,
+    )
+
+
+class _BaseAccountStream:
+    def __init__(
+        self,
+        api,
+        account_ids: Iterable[str] = None,
+        poll_interval: float = 30.0,
+        reconnect_delay: float = 1.0,
+        max_reconnect_delay: float = 30.0,
+    ):
+        self.api = api
+        self.account_ids = list(account_ids or [api.default_account_id])
+        self.poll_interval = poll_interval
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self.reconnects = 0
+        self.polls = 0
+        self.orders: Dict[int, OrderEvent] = {}
+        # the error that ended the last connection or poll, None once the stream connects again
+        self.last_error: Optional[Exception] = None
+        self._connected = False
+
+    def _delta(self, event: OrderEvent) -> bool:
+        """records an event and returns whether it changes what is known about the order"""
+        known = self.orders.get(event.id)
+        if known is not None and (
+            known.status,
+            known.executed_quantity,
+            known.remaining_quantity,
+        ) == (event.status, event.executed_quantity, event.remaining_quantity):
+            return False
+        self.orders[event.id] = event
+        return True
+
+    def _stream_events(self, message) -> List[OrderEvent]:
+        data = json.loads(message)
+        if data.get("event") != "order":
+            return []
+        event = order_event(data)
+        if event.account is not None and event.account not in self.account_ids:
+            return []
+        return [event] if self._delta(event) else []
+
+    def _poll_events(self, responses: List[dict]) -> List[OrderEvent]:
+        events = []
+        for account_id, data in zip(self.account_ids, responses):
+            for order in raw_value(AccountsAPIResponse, data, "orders", "order") or []:
+                event = order_event(order, account_id, source="poll")
+                if self._delta(event):
+                    events.append(event)
+        return events
+
+    @staticmethod
+    def subscription(sessionid: str) -> str:
+        return json.dumps({"events": ["order"], "sessionid": sessionid})
+
+
+class AccountStream(_BaseAccountStream):
+    """
+    Order status changes for the client's accounts, delivered as OrderEvent deltas instead of polling get_orders.
+    Events come from Tradier's account WebSocket stream (requires the `stream` extra). While the stream is
+    disconnected, orders are reconciled with a get_orders poll every poll_interval seconds and on every reconnect, so
+    no fill is missed; only orders whose status or filled quantity changed are yielded. Polled orders are read as
+    plain JSON without building Order models. Connection errors are kept in last_error, and errors that reconnecting
+    cannot fix (see is_permanent_error), such as a 401 response, are raised.
+
+        for event in AccountStream(t):
+            if event.status == "filled":
+                ...
+
+    The current state of every seen order is kept in orders. Orders that exist when iteration starts are loaded
+    there without being yielded.
+
+    https://documentation.tradier.com/brokerage-api/streaming/wss-account-websocket
+    """
+
+    def __init__(self, api, account_ids: Iterable[str] = None, **kwargs):
+        super().__init__(api, account_ids, **kwargs)
+        self._closed = threading.Event()
+        self._websocket = None
+
+    def create_session(self) -> Dict[str, str]:
+        """creates an account streaming session, returning its stream url and sessionid"""
+        return self.api.post(ACCOUNT_SESSION_PATH, {})["stream"]
+
+    def reconcile(self) -> List[OrderEvent]:
+        """polls the orders of every account and returns the changes since they were last seen"""
+        self.polls += 1
+        responses = [
+            self.api.get(f"/v1/accounts/{account_id}/orders", {"includeTags": True})
+            for account_id in self.account_ids
+        ]
+        return self._poll_events(responses)
+
+    def close(self):
+        self._closed.set()
+        websocket = self._websocket
+        if websocket is not None:
+            websocket.close()
+
+    def _listen(self) -> Iterator[OrderEvent]:
+        stream = self.create_session()
+        with websockets.sync.client.connect(
+            stream["url"], open_timeout=10
+        ) as websocket:
+            self._websocket = websocket
+            self._connected = True
+            websocket.send(self.subscription(stream["sessionid"]))
+            self.last_error = None
+            if self.reconnects:
+                yield from self.reconcile()
+            for message in websocket:
+                yield from self._stream_events(message)
+
+    def __iter__(self) -> Iterator[OrderEvent]:
+        if websockets is None:
+            raise ImportError(
+                "AccountStream requires websockets. Install it with `pip install tradier-python[stream]`."
+            )
+        self.reconcile()
+        last_poll = time.monotonic()
+        delay = self.reconnect_delay
+        while not self._closed.is_set():
+            try:
+                yield from self._listen()
+            except Exception as e:
+                if self._closed.is_set():
+                    return
+                self.last_error = e
+                if is_permanent_error(e):
+                    raise
+            finally:
+                self._websocket = None
+            if self._closed.is_set():
+                return
+            if self._connected:
+                self._connected = False
+                self.reconnects += 1
+                delay = self.reconnect_delay
+                last_poll = time.monotonic()
+            if time.monotonic() - last_poll >= self.poll_interval:
+                try:
+                    yield from self.reconcile()
+                except (requests.RequestException, TradierAPIError) as e:
+                    self.last_error = e
+                    if is_permanent_error(e):
+                        raise
+                last_poll = time.monotonic()
+            self._closed.wait(delay)
+            delay = min(delay * 2, self.max_reconnect_delay)
+
+
+class AsyncAccountStream(_BaseAccountStream):
+    """Asyncio counterpart of AccountStream for use with AsyncTradierAPI. Iterate it with async for."""
+
+    def __init__(self, api, account_ids: Iterable[str] = None, **kwargs):
+        super().__init__(api, account_ids, **kwargs)
+        self._closed = asyncio.Event()
+        self._websocket = None
+
+    async def create_session(self) -> Dict[str, str]:
+        """creates an account streaming session, returning its stream url and sessionid"""
+        data = await self.api.post(ACCOUNT_SESSION_PATH, {})
+        return data["stream"]
+
+    async def reconcile(self) -> List[OrderEvent]:
+        """polls the orders of every account and returns the changes since they were last seen"""
+        self.polls += 1
+        responses = await asyncio.gather(
+            *(
+                self.api.get(f"/v1/accounts/{account_id}/orders", {"includeTags": True})
+                for account_id in self.account_ids
+            )
+        )
+        return self._poll_events(responses)
+
+    async def close(self):
+        self._closed.set()
+        websocket = self._websocket
+        if websocket is not None:
+            await websocket.close()
+
+    async def _listen(self):
+        stream = await self.create_session()
+        async with websockets.asyncio.client.connect(
+            stream["url"], open_timeout=10
+        ) as websocket:
+            self._websocket = websocket
+            self._connected = True
+            await websocket.send(self.subscription(stream["sessionid"]))
+            self.last_error = None
+            if self.reconnects:
+                for event in await self.reconcile():
+                    yield event
+            async for message in websocket:
+                for event in self._stream_events(message):
+                    yield event
+
+    async def __aiter__(self):
+        if websockets is None:
+            raise ImportError(
+                "AsyncAccountStream requires websockets. Install it with `pip install tradier-python[stream]`."
+            )
+        await self.reconcile()
+        last_poll = time.monotonic()
+        delay = self.reconnect_delay
+        while not self._closed.is_set():
+            try:
+                async for event in self._listen():
+                    yield event
+            except Exception as e:
+                if self._closed.is_set():
+                    return
+                self.last_error = e
+                if is_permanent_error(e):
+                    raise
+            finally:
+                self._websocket = None
+            if self._closed.is_set():
+                return
+            if self._connected:
+                self._connected = False
+                self.reconnects += 1
+                delay = self.reconnect_delay
+                last_poll = time.monotonic()
+            if time.monotonic() - last_poll >= self.poll_interval:
+                try:
+                    events = await self.reconcile()
+                except (httpx.HTTPError, TradierAPIError) as e:
+                    self.last_error = e
+                    if is_permanent_error(e):
+                        raise
+                    events = []
+                for event in events:
+                    yield event
+                last_poll = time.monotonic()
+            try:
+                await asyncio.wait_for(self._closed.wait(), delay)
+            except asyncio.TimeoutError:
+                pass
+            delay = min(delay * 2, self.max_reconnect_delay)
@@ -0,0 +1,99 @@
+from datetime import date, datetime, timedelta
+from itertools import islice
+from typing import Iterable, Iterator, List, Tuple
+
+TIMESALES_PATH = "/v1/markets/timesales"
+# Span of a single /v1/markets/timesales request per interval when iterating over a long range. Tick data is only
+# kept for a few days and is very dense, so it is fetched an hour at a time.
+TIMESALES_WINDOWS = {
+    "tick": timedelta(hours=1),
+    "1min": timedelta(days=1),
+    "5min": timedelta(days=5),
+    "15min": timedelta(days=10),
+}
+# Bytes read from the network at a time while streaming a window.
+TIMESALES_READ_SIZE = 64 * 1024
+TIMESALES_FLOAT_COLUMNS = ("price", "open", "high", "low", "close", "vwap")
+
+
+def to_datetime(value, end: bool = False) -> datetime:
+    """datetimes pass through; a date becomes the start of that day, or its last minute when end is set"""
+    if isinstance(value, datetime):
+        return value
+    if isinstance(value, date):
+        return datetime(
+            value.year, value.month, value.day, 23 if end else 0, 59 if end else 0
+        )
+    return datetime.fromisoformat(value)
+
+
+def time_windows(
+    start: datetime, end: datetime, step: timedelta
+) -> List[Tuple[datetime, datetime]]:
+    """splits start..end into consecutive (start, end) windows of at most step"""
+    windows = []
+    while start < end:
+        windows.append((start, min(start + step, end)))
+        start += step
+    return windows
+
+
+def window_minute(value: datetime) -> datetime:
+    """a window bound as the API sees it: the naive wall-clock time, truncated to the minute"""
+    return value.replace(second=0, microsecond=0, tzinfo=None)
+
+
+def window_params(
+    symbol: str, interval: str, start: datetime, end: datetime, session_filter: str
+) -> dict:
+    return {
+        "symbol": symbol,
+        "interval": interval,
+        "start": window_minute(start).strftime("%Y-%m-%d %H:%M"),
+        "end": window_minute(end).strftime("%Y-%m-%d %H:%M"),
+        "session_filter": session_filter,
+    }
+
+
+def window_filter(start: datetime, end: datetime, last: bool):
+    """
+    Window requests overlap by their boundary minute, so each window keeps only the records from its start up to (but
+    excluding) its end. The last window keeps its end. The bounds are compared as the API's naive ISO times, so they
+    are normalized the way window_params sends them.
+    """
+    lo, hi = window_minute(start).isoformat(), window_minute(end).isoformat()
+    if last:
+        return lambda item: lo <= item["time"] <= hi
+    return lambda item: lo <= item["time"] < hi
+
+
+def iter_chunks(items: Iterable, size: int) -> Iterator[list]:
+    """consecutive lists of at most size items"""
+    items = iter(items)
+    while True:
+        chunk = list(islice(items, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def timesales_columns(rows: List[dict]) -> dict:
+    """
+    Columns of a list of timesales records: time (datetime64[s], exchange local time), timestamp, volume and the
+    price columns (NaN where a record has no such field, e.g. open/high/low/close for ticks).
+    """
+    # numpy is imported here rather than at the top so that the clients, which import this module, do not load it
+    try:
+        import numpy as np
+    except ImportError:
+        raise ImportError(
+            "Timesales columns require numpy. Install it with `pip install tradier-python[numpy]`."
+        ) from None
+    columns = {
+        "time": np.array([r["time"] for r in rows], dtype="datetime64[s]"),
+        "timestamp": np.array([r.get("timestamp", 0) for r in rows], dtype=np.int64),
+    }
+    for name in TIMESALES_FLOAT_COLUMNS:
+        columns[name] = np.array([r.get(name) for r in rows], dtype=np.float64)
+    columns["volume"] = np.array([r.get("volume") or 0 for r in rows], dtype=np.int64)
+    return columns
@@ -1,50 +1,250 @@
+import queue
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
 from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from time import perf_counter
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Iterator,
+    Optional,
+    Tuple,
+    Union,
+)
 from urllib.parse import urljoin
 
 import requests
 
+from tradier_python.cache import ResponseCache
+from tradier_python.instrumentation import Instrumented, RequestMetrics, lane
 from tradier_python.models import *
+from tradier_python.parsing import (
+    JSONArrayParser,
+    check_parse_mode,
+    get_decoder,
+    parse_response,
+    raw_value,
+)
+from tradier_python.ratelimit import RateLimiter
+from tradier_python.stats import LatencyStats
+from tradier_python.timesales import (
+    TIMESALES_PATH,
+    TIMESALES_READ_SIZE,
+    TIMESALES_WINDOWS,
+    iter_chunks,
+    time_windows,
+    timesales_columns,
+    to_datetime,
+    window_filter,
+    window_params,
+)
 
+if TYPE_CHECKING:  # pragma: no cover
+    from tradier_python.option_frame import OptionChainFrame
+    from tradier_python.option_chain import OptionChainIndex
 
-class TradierAPI:
+# Symbols per /v1/markets/quotes request when a symbol list is split into batches. Batches are sent as a POST body so
+# they are not bound by the URL length limit, but smaller batches can be fetched in parallel.
+QUOTES_BATCH_SIZE = 500
+# Longest comma separated symbol list that is still sent as a GET query string.
+MAX_QUERY_SYMBOLS_LENGTH = 2000
+
+
+class TradierAPI(Instrumented):
     """
     Tradier-python is a python client for interacting with the Tradier API.
+
+    Responses are validated into the pydantic models by default. Pass validate="construct" to build the models
+    without validation, or validate="raw" to get the normalized JSON dicts. See tradier_python.parsing.
+
+    Pass a ResponseCache to serve slow-changing reference endpoints (expirations, strikes, calendar, ETB list...)
+    from a cache instead of the network, and a RateLimiter to pace requests within Tradier's rate limits.
+
+    Order placement, modification and cancellation use a separate trading session, so orders never queue for a pool
+    connection behind market data downloads. Pass trading_keepalive (seconds) to open the trading connection up
+    front and keep it alive with periodic pings. latency_stats() reports round-trip times per lane.
+
+    hooks are called with a RequestMetrics for every request, e.g. a MetricsCollector to find the endpoints that
+    dominate latency. See tradier_python.instrumentation.
+
+    Responses are decoded with orjson when it is installed. Pass decoder="json" to use the standard library instead,
+    or any function decoding bytes.
+
+    transport replaces the requests transport adapter of both sessions, e.g. with a RecordingAdapter to capture
+    responses for replaying them offline. See tradier_python.transport.
     """
 
-    def __init__(self, token, default_account_id=None, endpoint=None):
+    def __init__(
+        self,
+        token,
+        default_account_id=None,
+        endpoint=None,
+        validate="full",
+        cache: ResponseCache = None,
+        rate_limiter: RateLimiter = None,
+        trading_keepalive: float = None,
+        hooks: Iterable[Callable] = None,
+        decoder: Union[str, Callable] = None,
+        transport: requests.adapters.BaseAdapter = None,
+    ):
 
         self.default_account_id = default_account_id
         self.endpoint = endpoint if endpoint else SANDBOX_ENDPOINT
+        self.validate = check_parse_mode(validate)
+        self.decode = get_decoder(decoder)
+        self.cache = cache
+        self.rate_limiter = rate_limiter
+        self.hooks = list(hooks or [])
+        headers = {
+            "Authorization": f"Bearer {token}",
+            "Accept": "application/json",
+        }
         self.session = requests.Session()
-        self.session.headers.update(
-            {
-                "Authorization": f"Bearer {token}",
-                "Accept": "application/json",
-            }
-        )
+        self.session.headers.update(headers)
+        self.trading_session = requests.Session()
+        self.trading_session.headers.update(headers)
+        if transport is not None:
+            for session in (self.session, self.trading_session):
+                session.mount("https://", transport)
+                session.mount("http://", transport)
+        self.lane_stats = {"data": LatencyStats(), "trading": LatencyStats()}
+        self._keepalive_stop = None
+        if trading_keepalive:
+            self.start_trading_keepalive(trading_keepalive)
+
+    def warm_up_trading(self):
+        """Opens (or refreshes) the trading connection so the next order does not pay for the TLS handshake."""
+        try:
+            self.trading_session.head(self.endpoint, timeout=10)
+        except requests.RequestException:
+            pass
+
+    def start_trading_keepalive(self, interval: float = 30.0):
+        """Warms up the trading connection and pings it every interval seconds from a background thread."""
+        self.stop_trading_keepalive()
+        self.warm_up_trading()
+        stop = self._keepalive_stop = threading.Event()
+
+        def ping():
+            while not stop.wait(interval):
+                self.warm_up_trading()
+
+        threading.Thread(target=ping, name="tradier-keepalive", daemon=True).start()
+
+    def stop_trading_keepalive(self):
+        if self._keepalive_stop is not None:
+            self._keepalive_stop.set()
+            self._keepalive_stop = None
+
+    def close(self):
+        """stops the keepalive thread and closes both sessions"""
+        self.flush_metrics()
+        self.stop_trading_keepalive()
+        self.session.close()
+        self.trading_session.close()
+
+    def latency_stats(self) -> Dict[str, Dict[str, float]]:
+        """round-trip latency summary (seconds) of the "data" and "trading" lanes"""
+        return {lane: stats.summary() for lane, stats in self.lane_stats.items()}
+
+    def request(self, method: str, path: str, params: dict, data: dict = None) -> dict:
+        if method.upper() == "GET" and self.cache is not None:
+            cached = self.cache.get(path, params)
+            if cached is not None:
+                # an earlier response still waiting to be parsed must not be reported with this one's parse
+                self.flush_metrics()
+                self._cached_metrics(method, path)
+                return cached
+
+        response, metrics = self._send(method, path, params, data)
+        start = perf_counter()
+        res_json = self.decode(response.content)
+        if metrics is not None:
+            metrics.decode = perf_counter() - start
+            self._defer(metrics)
+        if method.upper() == "GET" and self.cache is not None:
+            self.cache.set(path, params, res_json)
+        return res_json
+
+    def _send(
+        self,
+        method: str,
+        path: str,
+        params: dict,
+        data: dict = None,
+        stream: bool = False,
+    ) -> Tuple[requests.Response, Optional[RequestMetrics]]:
+        """sends a request, reading its body unless stream, and returns the response with its metrics if there are
+        hooks"""
+        self.flush_metrics()
+        start = perf_counter()
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire(method, path)
 
-    def request(self, method: str, path: str, params: dict) -> dict:
         url = urljoin(self.endpoint, path)
 
-        response = self.session.request(method.upper(), url, params=params)
+        request_lane = lane(method, path)
+        session = self.trading_session if request_lane == "trading" else self.session
+        sent = perf_counter()
+        response = session.request(
+            method.upper(), url, params=params, data=data, stream=True
+        )
+        headers_received = perf_counter()
+        read = not stream or response.status_code != 200
+        if read:
+            response.content
+        received = perf_counter()
+        self.lane_stats[request_lane].add(received - sent)
+        if self.rate_limiter is not None:
+            self.rate_limiter.update(
+                method, path, response.status_code, response.headers
+            )
+        metrics = self._response_metrics(
+            method, path, request_lane, response, sent - start, headers_received - sent
+        )
+        if metrics is not None and read:
+            metrics.transfer = received - headers_received
+            metrics.bytes = len(response.content)
 
         if response.status_code != 200:
+            if metrics is not None:
+                self._emit(metrics)
             raise TradierAPIError(
                 response.status_code, response.content.decode("utf-8"), params
             )
-        res_json = response.json()
-        key = url.rsplit("/", 1)[-1]
-        if res_json.get(key) == "null":
-            res_json[key] = []
-        return res_json
+        return response, metrics
+
+    @contextmanager
+    def stream(
+        self, method: str, path: str, params: dict, data: dict = None
+    ) -> Iterator[requests.Response]:
+        """makes a request and yields the response before its body has been read, for reading it incrementally"""
+        response, metrics = self._send(method, path, params, data, stream=True)
+        if metrics is not None:
+            self._emit(metrics)
+        try:
+            yield response
+        finally:
+            response.close()
+
+    def _parse(self, model, data: dict, *path: str):
+        return self._parse_measured(
+            lambda: parse_response(self.validate, model, data, *path)
+        )
 
     def get(self, path: str, params: dict) -> dict:
         """makes a GET request to an endpoint"""
         return self.request("GET", path, params)
 
-    def post(self, path: str, params: dict) -> dict:
+    def post(self, path: str, params: dict, data: dict = None) -> dict:
         """makes a POST request to an endpoint"""
-        return self.request("POST", path, params)
+        return self.request("POST", path, params, data)
 
     def delete(self, path: str, params: dict):
         """makes a DELETE request to an endpoint"""
@@ -63,8 +263,7 @@ class TradierAPI:
         """
         url = "/v1/user/profile"
         data = self.get(url, {})
-        res = AccountsAPIResponse(**data)
-        return res.profile
+        return self._parse(AccountsAPIResponse, data, "profile")
 
     def get_balances(self, account_id=None) -> Balances:
         """
@@ -77,8 +276,7 @@ class TradierAPI:
             account_id = self.default_account_id
         url = f"/v1/accounts/{account_id}/balances"
         data = self.get(url, {})
-        res = AccountsAPIResponse(**data)
-        return res.balances
+        return self._parse(AccountsAPIResponse, data, "balances")
 
     def get_positions(self, account_id=None) -> List[Position]:
         """Get the current positions being held in an account. These positions are updated intraday via trading.
@@ -88,8 +286,7 @@ class TradierAPI:
             account_id = self.default_account_id
         url = f"/v1/accounts/{account_id}/positions"
         data = self.get(url, {})
-        res = AccountsAPIResponse(**ensure_list(data, "positions"))
-        return res.positions.position
+        return self._parse(AccountsAPIResponse, data, "positions", "position")
 
     def get_history(
         self,
@@ -114,8 +311,12 @@ class TradierAPI:
             "symbol": symbol,
         }
         data = self.get(url, params)
-        res = AccountsAPIResponse(**data)
-        return res.history.event
+        return self._parse(
+            AccountsAPIResponse,
+            data,
+            "history",
+            "event",
+        )
 
     def get_gain_loss(
         self,
@@ -141,8 +342,53 @@ class TradierAPI:
             "symbol": symbol,
         }
         data = self.get(url, params)
-        res = AccountsAPIResponse(**data)
-        return res.gainloss.closed_position
+        return self._parse(
+            AccountsAPIResponse,
+            data,
+            "gainloss",
+            "closed_position",
+        )
+
+    def iter_history(
+        self,
+        account_id=None,
+        limit: int = 100,
+        history_type: str = None,
+        start: date = None,
+        end: date = None,
+        symbol: str = None,
+    ) -> Iterator[Event]:
+        """
+        Iterate over every page of account history. The next page is fetched in the background while the current one
+        is consumed. Iteration stops at the first empty page, or at a page shorter than limit.
+        """
+        return iter_pages(
+            lambda page: self.get_history(
+                account_id, page, limit, history_type, start, end, symbol
+            ),
+            limit,
+        )
+
+    def iter_gain_loss(
+        self,
+        limit: int = 100,
+        sort_by: str = None,
+        sort: str = None,
+        start: date = None,
+        end: date = None,
+        symbol: str = None,
+        account_id=None,
+    ) -> Iterator[ClosedPosition]:
+        """
+        Iterate over every page of closed positions. The next page is fetched in the background while the current
+        one is consumed. Iteration stops at the first empty page, or at a page shorter than limit.
+        """
+        return iter_pages(
+            lambda page: self.get_gain_loss(
+                page, limit, sort_by, sort, start, end, symbol, account_id
+            ),
+            limit,
+        )
 
     def get_orders(
         self,
@@ -154,8 +400,7 @@ class TradierAPI:
         url = f"/v1/accounts/{account_id}/orders"
         params = {"includeTags": include_tags}
         data = self.get(url, params)
-        res = AccountsAPIResponse(**ensure_list(data, "orders"))
-        return res.orders.order
+        return self._parse(AccountsAPIResponse, data, "orders", "order")
 
     def get_order(
         self,
@@ -168,8 +413,7 @@ class TradierAPI:
         url = f"/v1/accounts/{account_id}/orders/{order_id}"
         params = {"includeTags": include_tags}
         data = self.get(url, params)
-        res = AccountsAPIResponse(**data)
-        return res.order
+        return self._parse(AccountsAPIResponse, data, "order")
 
     def order(
         self,
@@ -229,10 +473,92 @@ class TradierAPI:
         }
         params = {k: v for k, v in params.items() if v is not None}
         data = self.post(url, params)
-        res = OrderAPIResponse(**data)
-        if res.errors:
-            raise TradierOrderError(res.errors.error_list)
-        return res.order
+        check_order_errors(data)
+        return self._parse(OrderAPIResponse, data, "order")
+
+    def submit_orders(
+        self, specs: Iterable[dict], max_workers: int = 8, retries: int = 1
+    ) -> List[Union[OrderDetails, Exception]]:
+        """
+        Place many orders with up to max_workers requests in flight (paced by the trading quota when the client has a
+        RateLimiter). Each spec holds the keyword arguments of order(). Returns, in input order, the OrderDetails of
+        each order or the exception it failed with, TradierOrderError when Tradier rejected it.
+
+        Orders are identified by their tag, so submitting is safe to retry: a spec whose tag is already on one of the
+        account's orders is not sent again and the existing order is returned instead. Specs without a tag get a
+        generated one, and an order whose request failed without a definite answer (a connection error or a 5xx) is
+        looked up by tag before being sent again, up to retries times. This only holds when every order has its own
+        tag, so a batch in which two specs of an account share a tag raises ValueError before anything is sent.
+        """
+        specs = [dict(spec) for spec in specs]
+        for spec in specs:
+            spec["account_id"] = spec.get("account_id") or self.default_account_id
+        check_unique_tags(specs)
+        accounts = {spec["account_id"] for spec in specs if spec.get("tag")}
+        existing = {
+            account_id: self._orders_by_tag(account_id) for account_id in accounts
+        }
+        for spec in specs:
+            spec["tag"] = spec.get("tag") or new_order_tag()
+
+        def submit(spec):
+            orders = existing.get(spec["account_id"], {})
+            for attempt in range(retries + 1):
+                if spec["tag"] in orders:
+                    # not a response, so it is parsed without taking the pending metrics of the order lookup
+                    return parse_response(
+                        self.validate,
+                        OrderAPIResponse,
+                        {"order": orders[spec["tag"]]},
+                        "order",
+                    )
+                try:
+                    return self.order(**spec)
+                except Exception as e:
+                    if attempt == retries or not is_uncertain_failure(e):
+                        return e
+                    orders = self._orders_by_tag(spec["account_id"])
+
+        if not specs:
+            return []
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(specs))) as pool:
+            return list(pool.map(submit, specs))
+
+    def cancel_orders(
+        self, order_ids: Iterable, max_workers: int = 8, account_id=None
+    ) -> List[Union[OrderDetails, Exception]]:
+        """
+        Cancel many orders with up to max_workers requests in flight. Returns, in input order, the OrderDetails of
+        each cancellation or the exception it failed with.
+        """
+        order_ids = list(order_ids)
+
+        def cancel(order_id):
+            try:
+                return self.cancel_order(order_id, account_id)
+            except Exception as e:
+                return e
+
+        if not order_ids:
+            return []
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(order_ids))) as pool:
+            return list(pool.map(cancel, order_ids))
+
+    def _orders_by_tag(self, account_id: str) -> Dict[str, dict]:
+        """the account's live or filled orders by tag, as order details dicts"""
+        url = f"/v1/accounts/{account_id}/orders"
+        data = self.get(url, {"includeTags": True})
+        orders = raw_value(AccountsAPIResponse, data, "orders", "order") or []
+        self.flush_metrics()
+        return {
+            order["tag"]: {
+                "id": order["id"],
+                "status": order["status"],
+                "partner_id": None,
+            }
+            for order in orders
+            if order.get("tag") and order.get("status") not in RESUBMITTABLE_STATUSES
+        }
 
     def order_equity(
         self,
@@ -349,8 +675,7 @@ class TradierAPI:
             account_id = self.default_account_id
         url = f"/v1/accounts/{account_id}/orders/{order_id}"
         data = self.delete(url, {})
-        res = OrderAPIResponse(**data)
-        return res.order
+        return self._parse(OrderAPIResponse, data, "order")
 
     def modify_order(
         self,
@@ -376,20 +701,60 @@ class TradierAPI:
         }
         params = {k: v for k, v in params.items() if v is not None}
         data = self.put(url, params)
-        res = OrderAPIResponse(**data)
-        return res.order
+        return self._parse(OrderAPIResponse, data, "order")
 
-    def get_quotes(self, symbols: str, greeks: bool = False) -> List[Quote]:
+    def get_quotes(
+        self,
+        symbols: Union[str, Iterable[str]],
+        greeks: bool = False,
+        batch_size: int = QUOTES_BATCH_SIZE,
+        max_workers: int = 8,
+    ) -> List[Quote]:
         """
-        Get a list of symbols using a keyword lookup on the symbols description. Results are in descending order by
-        average volume of the security. This can be used for simple search functions.
+        Get quotes for one or more symbols, given either as a comma separated string or an iterable of symbols.
+
+        Large symbol lists are split into batches that are fetched concurrently and merged back into one list in
+        input order. Use get_quotes_batched to also see the symbols Tradier could not match.
         """
+        res = self.get_quotes_batched(symbols, greeks, batch_size, max_workers)
+        return res["quote"] if self.validate == "raw" else res.quotes
+
+    def get_quotes_batched(
+        self,
+        symbols: Union[str, Iterable[str]],
+        greeks: bool = False,
+        batch_size: int = QUOTES_BATCH_SIZE,
+        max_workers: int = 8,
+    ) -> Quotes:
+        """
+        Get quotes for any number of symbols. The symbols are split into batches of at most batch_size, fetched with
+        up to max_workers requests in flight, and merged into a single Quotes object with quotes in input order and
+        the unmatched symbols of every batch.
+        """
+        symbols = split_symbols(symbols)
+        batches = chunked(symbols, batch_size)
+        if len(batches) <= 1 and len(",".join(symbols)) <= MAX_QUERY_SYMBOLS_LENGTH:
+            return merge_quotes(
+                symbols, [self._get_quotes_batch(symbols, greeks, False)]
+            )
+
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(batches))) as pool:
+            results = list(
+                pool.map(lambda b: self._get_quotes_batch(b, greeks, True), batches)
+            )
+        return merge_quotes(symbols, results)
+
+    def _get_quotes_batch(
+        self, symbols: List[str], greeks: bool, use_post: bool
+    ) -> Quotes:
         url = "/v1/markets/quotes"
-        params = {"symbols": symbols, "greeks": greeks}
+        params = {"symbols": ",".join(symbols), "greeks": greeks}
 
-        data = self.get(url, params)
-        res = MarketsAPIResponse(**ensure_list(data, "quotes"))
-        return res.quotes.quotes
+        if use_post:
+            data = self.post(url, {}, params)
+        else:
+            data = self.get(url, params)
+        return self._parse(MarketsAPIResponse, data, "quotes")
 
     def get_option_chains(
         self, symbol: str, expiration: date, greeks: bool = False
@@ -409,8 +774,88 @@ class TradierAPI:
         }
 
         data = self.get(url, params)
-        res = MarketsAPIResponse(**data)
-        return res.options.option
+        return self._parse(MarketsAPIResponse, data, "options", "option")
+
+    def get_option_chain_frame(
+        self, symbol: str, expiration: date, greeks: bool = False
+    ) -> "OptionChainFrame":
+        """
+        Get an option chain as an OptionChainFrame of NumPy columns. The response is not validated into Quote
+        objects, which makes this much cheaper than get_option_chains for large chains; individual contracts can
+        still be converted with OptionChainFrame.quote or to_quotes.
+        """
+        url = "/v1/markets/options/chains"
+        params = {
+            "symbol": symbol,
+            "expiration": expiration,
+            "greeks": greeks,
+        }
+
+        data = self.get(url, params)
+        options = raw_value(MarketsAPIResponse, data, "options", "option") or []
+        from tradier_python.option_frame import OptionChainFrame
+
+        return OptionChainFrame.from_records(options)
+
+    def get_option_chain_index(
+        self, symbol: str, expiration: date, greeks: bool = False
+    ) -> "OptionChainIndex":
+        """
+        Get an option chain as an OptionChainIndex, for looking up contracts by expiration, strike and option type.
+        """
+        chain = self.get_option_chains(symbol, expiration, greeks)
+        from tradier_python.option_chain import OptionChainIndex
+
+        return OptionChainIndex(chain or [])
+
+    def get_option_surface(
+        self,
+        symbol: str,
+        expirations: Iterable[date] = None,
+        greeks: bool = False,
+        include_all_roots: bool = None,
+        max_workers: int = 8,
+    ) -> Dict[date, List[Quote]]:
+        """
+        Get the option chains of every expiration of an underlying, keyed by expiration date in ascending order. All
+        expirations are fetched when none are given. See iter_option_surface for how the chains are fetched.
+        """
+        surface = dict(
+            self.iter_option_surface(
+                symbol, expirations, greeks, include_all_roots, max_workers
+            )
+        )
+        return dict(sorted(surface.items()))
+
+    def iter_option_surface(
+        self,
+        symbol: str,
+        expirations: Iterable[date] = None,
+        greeks: bool = False,
+        include_all_roots: bool = None,
+        max_workers: int = 8,
+    ) -> Iterator[Tuple[date, List[Quote]]]:
+        """
+        Fetch the option chains of several expirations with up to max_workers requests in flight, yielding
+        (expiration, chain) pairs as each chain arrives. Requests are submitted front month first, so near
+        expirations are usually available before the back months land.
+        """
+        if expirations is None:
+            expirations = self.get_option_expirations(symbol, include_all_roots)
+        expirations = sorted(set(expirations or ()))
+        if not expirations:
+            return
+
+        pool = ThreadPoolExecutor(max_workers=min(max_workers, len(expirations)))
+        try:
+            futures = {
+                pool.submit(self.get_option_chains, symbol, e, greeks): e
+                for e in expirations
+            }
+            for future in as_completed(futures):
+                yield futures[future], future.result()
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
 
     def get_option_strikes(self, symbol: str, expiration: date) -> List[float]:
         """
@@ -420,8 +865,7 @@ class TradierAPI:
         params = {"symbol": symbol, "expiration": expiration}
 
         data = self.get(url, params)
-        res = MarketsAPIResponse(**data)
-        return res.strikes.strike
+        return self._parse(MarketsAPIResponse, data, "strikes", "strike")
 
     def get_option_expirations(
         self, symbol: str, include_all_roots: bool = None, strikes: str = None
@@ -441,8 +885,7 @@ class TradierAPI:
         }
 
         data = self.get(url, params)
-        res = MarketsAPIResponse(**data)
-        return res.expirations.date
+        return self._parse(MarketsAPIResponse, data, "expirations", "date")
 
     def lookup_option_symbols(self, underlying: str) -> List[Symbol]:
         """
@@ -453,8 +896,7 @@ class TradierAPI:
         params = {"underlying": underlying}
 
         data = self.get(url, params)
-        res = MarketsAPIResponse(**data)
-        return res.symbols
+        return self._parse(MarketsAPIResponse, data, "symbols")
 
     def get_historical_quotes(
         self, symbol: str, interval: str = None, start: date = None, end: date = None
@@ -471,8 +913,7 @@ class TradierAPI:
         params = {"symbol": symbol, "interval": interval, "start": start, "end": end}
 
         data = self.get(url, params)
-        res = MarketsAPIResponse(**data)
-        return res.history.day
+        return self._parse(MarketsAPIResponse, data, "history", "day")
 
     def get_time_and_sales(
         self,
@@ -499,8 +940,84 @@ class TradierAPI:
         }
 
         data = self.get(url, params)
-        res = MarketsAPIResponse(**data)
-        return res.series.data
+        return self._parse(MarketsAPIResponse, data, "series", "data")
+
+    def iter_time_and_sales(
+        self,
+        symbol: str,
+        start: datetime,
+        end: datetime,
+        interval: str = "tick",
+        session_filter: str = None,
+        window: timedelta = None,
+        chunk_size: int = None,
+        prefetch: int = 16,
+    ) -> Iterator[Union[TimesalesData, dict]]:
+        """
+        Iterate over the time and sales of a long range without holding it in memory. The range is split into windows
+        of TIMESALES_WINDOWS[interval] (or window) and each response is parsed incrementally as it arrives, while a
+        background thread downloads ahead by up to prefetch reads, into the next window.
+
+        Yields a TimesalesData per record (a dict in raw parse mode) or, with chunk_size, dicts of NumPy columns of up
+        to chunk_size records each (see tradier_python.timesales.timesales_columns).
+        """
+        items = self._iter_timesales_items(
+            symbol, start, end, interval, session_filter, window, prefetch
+        )
+        if chunk_size is not None:
+            for rows in iter_chunks(items, chunk_size):
+                yield timesales_columns(rows)
+            return
+        for item in items:
+            yield self._parse(TimesalesData, item)
+
+    def _iter_timesales_items(
+        self, symbol, start, end, interval, session_filter, window, prefetch
+    ) -> Iterator[dict]:
+        step = window or TIMESALES_WINDOWS.get(interval, timedelta(days=1))
+        windows = time_windows(to_datetime(start), to_datetime(end, end=True), step)
+        reads = queue.Queue(maxsize=prefetch)
+        stop = threading.Event()
+
+        def put(item):
+            while not stop.is_set():
+                try:
+                    reads.put(item, timeout=0.1)
+                    return
+                except queue.Full:
+                    pass
+
+        def download():
+            try:
+                for lo, hi in windows:
+                    params = window_params(symbol, interval, lo, hi, session_filter)
+                    with self.stream("GET", TIMESALES_PATH, params) as response:
+                        for chunk in response.iter_content(TIMESALES_READ_SIZE):
+                            if stop.is_set():
+                                return
+                            put(chunk)
+                    put(None)
+            except Exception as e:
+                put(e)
+
+        thread = threading.Thread(target=download, name="timesales", daemon=True)
+        thread.start()
+        try:
+            for n, (lo, hi) in enumerate(windows):
+                keep = window_filter(lo, hi, last=n == len(windows) - 1)
+                parser = JSONArrayParser("data")
+                while True:
+                    chunk = reads.get()
+                    if chunk is None:
+                        break
+                    if isinstance(chunk, Exception):
+                        raise chunk
+                    for item in parser.feed(chunk):
+                        if keep(item):
+                            yield item
+                parser.close()
+        finally:
+            stop.set()
 
     def get_etb_list(self) -> List[Security]:
         """
@@ -509,8 +1026,7 @@ class TradierAPI:
         """
         url = "/v1/markets/etb"
         data = self.get(url, {})
-        res = MarketsAPIResponse(**data)
-        return res.securities.security
+        return self._parse(MarketsAPIResponse, data, "securities", "security")
 
     def get_clock(self) -> Clock:
         """
@@ -520,8 +1036,7 @@ class TradierAPI:
         """
         url = "/v1/markets/clock"
         data = self.get(url, {})
-        res = MarketsAPIResponse(**data)
-        return res.clock
+        return self._parse(MarketsAPIResponse, data, "clock")
 
     def get_calendar(self, month: int = None, year: int = None) -> List[Hours]:
         """
@@ -531,8 +1046,7 @@ class TradierAPI:
         url = "/v1/markets/calendar"
         params = {"month": month, "year": year}
         data = self.get(url, params)
-        res = MarketsAPIResponse(**data)
-        return res.calendar.days.day
+        return self._parse(MarketsAPIResponse, data, "calendar", "days", "day")
 
     def search_companies(self, query: str, indexes: bool = True) -> List[Security]:
         """
@@ -542,11 +1056,8 @@ class TradierAPI:
         url = "/v1/markets/search"
         params = {"q": query, "indexes": indexes}
         data = self.get(url, params)
-        res = MarketsAPIResponse(**data)
-        if res.securities is not None:
-            return res.securities.security
-        else:
-            return []
+        res = self._parse(MarketsAPIResponse, data, "securities", "security")
+        return res if res is not None else []
 
     def lookup_symbol(
         self, query: str, exchanges: str = None, types: str = None
@@ -558,11 +1069,13 @@ class TradierAPI:
         url = "/v1/markets/lookup"
         params = {"q": query, "exchanges": exchanges, "types": types}
         data = self.get(url, params)
-        res = MarketsAPIResponse(**ensure_list(data, "securities", "security"))
-        if res.securities is not None:
-            return res.securities.security
-        else:
-            return []
+        res = self._parse(
+            MarketsAPIResponse,
+            data,
+            "securities",
+            "security",
+        )
+        return res if res is not None else []
 
 
 @dataclass
@@ -577,16 +1090,112 @@ class TradierOrderError(Exception):
     errors: List[str]
 
 
-def ensure_list(data, key1, key2=None):
-    """The API is inconsitent in how empty responses are returned. This ensures that we always get an empty list."""
-    if key2 is None:
-        key2 = key1[:-1]
+def split_symbols(symbols: Union[str, Iterable[str]]) -> List[str]:
+    """Normalizes a comma separated string or an iterable of symbols into a list without blanks or duplicates."""
+    if isinstance(symbols, str):
+        symbols = symbols.split(",")
+    seen = set()
+    result = []
+    for symbol in symbols:
+        symbol = symbol.strip()
+        if symbol and symbol.upper() not in seen:
+            seen.add(symbol.upper())
+            result.append(symbol)
+    return result
 
-    if isinstance(data[key1], list):
-        data[key1] = {}
-        data[key1][key2] = []
-    elif data[key1].get(key2) is None:
-        data[key1][key2] = []
-    elif not isinstance(data[key1].get(key2), list):
-        data[key1][key2] = [data[key1][key2]]
-    return data
+
+def iter_pages(fetch_page: Callable[[int], list], limit: int = None) -> Iterator:
+    """
+    Yields the items of pages 1, 2, ... returned by fetch_page, requesting page n + 1 in a background thread while
+    the items of page n are consumed. Stops after an empty page or a page shorter than limit.
+    """
+    pool = ThreadPoolExecutor(max_workers=1)
+    try:
+        page = 1
+        future = pool.submit(fetch_page, page)
+        while True:
+            items = future.result()
+            if not items:
+                return
+            if limit is not None and len(items) < limit:
+                yield from items
+                return
+            page += 1
+            future = pool.submit(fetch_page, page)
+            yield from items
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def chunked(items: list, size: int) -> List[list]:
+    """Splits a list into consecutive chunks of at most size items."""
+    return [items[i : i + size] for i in range(0, len(items), size)]
+
+
+def merge_quotes(symbols: List[str], results: list) -> Union[Quotes, dict]:
+    """Combines the Quotes of several batches, ordering quotes by the position of their symbol in the input. Raw
+    parse mode results are merged into a dict of the same shape."""
+    position = {symbol.upper(): i for i, symbol in enumerate(symbols)}
+    if results and isinstance(results[0], dict):
+        quotes = [q for res in results for q in res.get("quote", [])]
+        quotes.sort(key=lambda q: position.get(q["symbol"].upper(), len(position)))
+        unmatched = []
+        for res in results:
+            missing = (res.get("unmatched_symbols") or {}).get("symbol", [])
+            unmatched.extend(missing if isinstance(missing, list) else [missing])
+        merged = {"quote": quotes}
+        if unmatched:
+            merged["unmatched_symbols"] = {"symbol": unmatched}
+        return merged
+
+    quotes = [q for res in results for q in res.quotes]
+    quotes.sort(key=lambda q: position.get(q.symbol.upper(), len(position)))
+    unmatched = [
+        symbol
+        for res in results
+        if res.unmatched_symbols is not None
+        for symbol in res.unmatched_symbols.symbol
+    ]
+    return Quotes(
+        quote=quotes,
+        unmatched_symbols=UnmatchedSymbols(symbol=unmatched) if unmatched else None,
+    )
+
+
+# Statuses of orders that never reached the market, so an order with the same tag may be sent again.
+RESUBMITTABLE_STATUSES = ("rejected", "error")
+
+
+def new_order_tag() -> str:
+    """a unique order tag (tags may hold letters, numbers and dashes)"""
+    return f"bulk-{uuid.uuid4().hex}"
+
+
+def check_unique_tags(specs: List[dict]):
+    """Raises ValueError if two order specs of the same account share a tag."""
+    seen = set()
+    for spec in specs:
+        key = (spec["account_id"], spec.get("tag"))
+        if key[1]:
+            if key in seen:
+                raise ValueError(
+                    f"order tag {key[1]!r} is used by several orders of {key[0]}"
+                )
+            seen.add(key)
+
+
+def is_uncertain_failure(e: Exception) -> bool:
+    """whether a request failed without telling whether the order was placed"""
+    if isinstance(e, TradierAPIError):
+        return e.code >= 500
+    return isinstance(e, requests.RequestException)
+
+
+def check_order_errors(data: dict):
+    """Raises TradierOrderError if an order response contains errors."""
+    errors = data.get("errors")
+    if errors:
+        error_list = errors.get("error", [])
+        raise TradierOrderError(
+            error_list if isinstance(error_list, list) else [error_list]
+        )
@@ -0,0 +1,225 @@
+"""
+Recording of real Tradier responses into cassettes, for replaying them offline with LocalTradierServer.
+
+Both clients take a transport: a requests adapter for TradierAPI, an httpx transport for AsyncTradierAPI. Record a
+session by passing a recording transport, then save the cassette:
+
+    cassette = Cassette()
+    t = TradierAPI(token, account_id, transport=RecordingAdapter(cassette, redact={account_id: "VA000000"}))
+    t.get_positions()
+    cassette.save("tests/fixtures/cassette.json")
+
+and replay it with LocalTradierServer(cassette=Cassette.load(...)). Request headers, and with them the token, are
+never recorded; redact replaces other sensitive strings, such as the account number, in paths, parameters and bodies.
+"""
+
+import json
+import threading
+from typing import Dict, List, Mapping, Optional, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+import requests
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover - optional dependency
+    httpx = None
+
+# Response headers worth replaying; the rest (dates, cookies, server details) only make fixtures noisy.
+RECORDED_HEADERS = (
+    "Content-Type",
+    "X-Ratelimit-Allowed",
+    "X-Ratelimit-Available",
+    "X-Ratelimit-Expiry",
+    "X-Ratelimit-Used",
+)
+
+
+def request_params(query: str, body=None) -> Dict[str, str]:
+    """the query string and form body parameters of a request"""
+    if isinstance(body, bytes):
+        body = body.decode("utf-8")
+    params = parse_qsl(query, keep_blank_values=True)
+    if body:
+        params += parse_qsl(body, keep_blank_values=True)
+    return dict(params)
+
+
+class Cassette:
+    """
+    Recorded interactions, each a dict of method, path, params, status, headers and body (the decoded JSON when the
+    response was JSON). Interactions with the same method, path and parameters are replayed in the order they were
+    recorded, repeating the last one once they run out.
+
+    A request whose parameters match no interaction finds nothing, so a replayed request with wrong parameters fails
+    instead of returning another request's response. Pass match_params=False to answer it with the first interaction
+    recorded for the same method and path.
+    """
+
+    def __init__(self, interactions: List[dict] = None, match_params: bool = True):
+        self.match_params = match_params
+        self.interactions: List[dict] = []
+        self._index: Dict[Tuple, List[dict]] = {}
+        self._by_path: Dict[Tuple[str, str], List[dict]] = {}
+        self._played: Dict[Tuple, int] = {}
+        self._lock = threading.Lock()
+        for interaction in interactions or []:
+            self._add(interaction)
+
+    def __len__(self) -> int:
+        return len(self.interactions)
+
+    @staticmethod
+    def key(method: str, path: str, params: Mapping[str, str]) -> Tuple:
+        return method.upper(), path, tuple(sorted(params.items()))
+
+    def _add(self, interaction: dict):
+        with self._lock:
+            self.interactions.append(interaction)
+            key = self.key(
+                interaction["method"], interaction["path"], interaction["params"]
+            )
+            self._index.setdefault(key, []).append(interaction)
+            self._by_path.setdefault(key[:2], []).append(interaction)
+
+    def add(
+        self,
+        method: str,
+        path: str,
+        params: Mapping[str, str],
+        status: int,
+        headers: Mapping[str, str],
+        body: bytes,
+    ):
+        try:
+            body = json.loads(body)
+        except ValueError:
+            body = body.decode("utf-8", "replace")
+        self._add(
+            {
+                "method": method.upper(),
+                "path": path,
+                "params": dict(params),
+                "status": status,
+                "headers": {k: headers[k] for k in RECORDED_HEADERS if k in headers},
+                "body": body,
+            }
+        )
+
+    def find(self, method: str, path: str, params: Mapping[str, str]) -> Optional[dict]:
+        """
+        The next interaction recorded for a request, or None if none matches its method, path and parameters (with
+        match_params=False, the first one recorded for the method and path).
+        """
+        key = self.key(method, path, params)
+        with self._lock:
+            matches = self._index.get(key)
+            if matches:
+                played = self._played.get(key, 0)
+                self._played[key] = played + 1
+                return matches[min(played, len(matches) - 1)]
+            if self.match_params:
+                return None
+            matches = self._by_path.get(key[:2])
+            return matches[0] if matches else None
+
+    def rewind(self):
+        """replays every interaction from the start again"""
+        with self._lock:
+            self._played.clear()
+
+    @classmethod
+    def load(cls, path: str, match_params: bool = True) -> "Cassette":
+        with open(path) as f:
+            return cls(json.load(f)["interactions"], match_params)
+
+    def save(self, path: str):
+        with open(path, "w") as f:
+            json.dump({"interactions": self.interactions}, f, indent=1)
+
+
+def redacted(text: str, redact: Mapping[str, str]) -> str:
+    for secret, replacement in redact.items():
+        text = text.replace(secret, replacement)
+    return text
+
+
+class _Recorder:
+    def __init__(self, cassette: Cassette, redact: Mapping[str, str] = None):
+        self.cassette = cassette
+        self.redact = dict(redact or {})
+
+    def record(self, method, url, body, status, headers, content: bytes):
+        url = urlsplit(redacted(str(url), self.redact))
+        if isinstance(body, bytes):
+            body = body.decode("utf-8")
+        params = request_params(url.query, redacted(body or "", self.redact))
+        content = redacted(content.decode("utf-8"), self.redact).encode("utf-8")
+        self.cassette.add(method, url.path, params, status, headers, content)
+
+
+class RecordingAdapter(requests.adapters.HTTPAdapter):
+    """requests transport adapter for TradierAPI that sends requests normally and records every response"""
+
+    def __init__(self, cassette: Cassette, redact: Mapping[str, str] = None, **kwargs):
+        super().__init__(**kwargs)
+        self.recorder = _Recorder(cassette, redact)
+
+    def send(self, request, **kwargs):
+        response = super().send(request, **kwargs)
+        self.recorder.record(
+            request.method,
+            request.url,
+            request.body,
+            response.status_code,
+            response.headers,
+            response.content,
+        )
+        return response
+
+
+class AsyncRecordingTransport:
+    """httpx transport for AsyncTradierAPI that sends requests through transport and records every response"""
+
+    def __init__(
+        self,
+        cassette: Cassette,
+        redact: Mapping[str, str] = None,
+        transport: "httpx.AsyncBaseTransport" = None,
+    ):
+        if httpx is None:
+            raise ImportError(
+                "AsyncRecordingTransport requires httpx. Install it with `pip install tradier-python[async]`."
+            )
+        self.recorder = _Recorder(cassette, redact)
+        self.transport = transport or httpx.AsyncHTTPTransport()
+
+    async def handle_async_request(self, request):
+        response = await self.transport.handle_async_request(request)
+        content = await response.aread()
+        self.recorder.record(
+            request.method,
+            request.url,
+            request.content,
+            response.status_code,
+            response.headers,
+            content,
+        )
+        # the content has been decoded already, so it is passed on without the headers describing its encoding
+        headers = [
+            (k, v)
+            for k, v in response.headers.multi_items()
+            if k.lower()
+            not in ("content-encoding", "content-length", "transfer-encoding")
+        ]
+        return httpx.Response(response.status_code, headers=headers, content=content)
+
+    async def __aenter__(self):
+        await self.transport.__aenter__()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.transport.__aexit__(*exc_info)
+
+    async def aclose(self):
+        await self.transport.aclose()
@@ -0,0 +1,155 @@
+import json
+import threading
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+import requests
+
+from tradier_python import TradierAPI
+
+
+def _quote(symbol, **fields):
+    quote = {
+        "symbol": symbol,
+        "description": f"{symbol} Inc",
+        "exch": "Q",
+        "type": "stock",
+        "last": 100.0,
+        "change": 1.0,
+        "volume": 1000,
+        "open": 99.0,
+        "high": 101.0,
+        "low": 98.5,
+        "close": None,
+        "bid": 99.95,
+        "ask": 100.05,
+        "change_percentage": 1.0,
+        "average_volume": 5000,
+        "last_volume": 100,
+        "trade_date": 1633708800000,
+        "prevclose": 99.0,
+        "week_52_high": 120.0,
+        "week_52_low": 80.0,
+        "bidsize": 2,
+        "bidexch": "Q",
+        "bid_date": 1633708800000,
+        "asksize": 3,
+        "askexch": "Q",
+        "ask_date": 1633708800000,
+        "root_symbols": symbol,
+    }
+    quote.update(fields)
+    return quote
+
+
+def _option(underlying, expiration, strike, option_type, **fields):
+    expiration = str(expiration)
+    symbol = "{}{}{}{:08d}".format(
+        underlying,
+        expiration[2:].replace("-", ""),
+        option_type[0].upper(),
+        round(strike * 1000),
+    )
+    option = _quote(
+        symbol,
+        type="option",
+        underlying=underlying,
+        strike=strike,
+        open_interest=100,
+        contract_size=100,
+        expiration_date=expiration,
+        expiration_type="standard",
+        option_type=option_type,
+        root_symbol=underlying,
+    )
+    option.update(fields)
+    return option
+
+
+@pytest.fixture
+def make_quote():
+    """factory for quote payloads shaped like /v1/markets/quotes responses"""
+    return _quote
+
+
+@pytest.fixture
+def make_option():
+    """factory for option quote payloads shaped like /v1/markets/options/chains responses"""
+    return _option
+
+
+class StubAdapter(requests.adapters.BaseAdapter):
+    """Answers requests from registered handlers instead of the network. Handlers receive the PreparedRequest and
+    return a (status, json_body) or (status, json_body, headers) tuple, or a requests.Response.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.handlers = {}
+        self.requests = []
+        self.lock = threading.Lock()
+
+    def route(self, method, path, handler):
+        self.handlers[(method.upper(), path)] = handler
+
+    def send(self, request, **kwargs):
+        with self.lock:
+            self.requests.append(request)
+        path = urlsplit(request.url).path
+        handler = self.handlers.get((request.method, path))
+        headers = {}
+        if handler is None:
+            status, body = 404, {"error": f"no stub for {request.method} {path}"}
+        else:
+            result = handler(request)
+            if isinstance(result, requests.Response):
+                return result
+            status, body, *rest = result
+            headers = rest[0] if rest else {}
+        response = requests.Response()
+        response.status_code = status
+        response._content = json.dumps(body).encode("utf-8")
+        response._content_consumed = True
+        response.headers["Content-Type"] = "application/json"
+        response.headers.update(headers)
+        response.url = request.url
+        response.request = request
+        return response
+
+    @staticmethod
+    def query(request) -> dict:
+        """flattened query string or form body of a stubbed request"""
+        if request.body:
+            body = request.body
+            if isinstance(body, bytes):
+                body = body.decode("utf-8")
+            return {k: v[-1] for k, v in parse_qs(body).items()}
+        return {k: v[-1] for k, v in parse_qs(urlsplit(request.url).query).items()}
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def stub():
+    return StubAdapter()
+
+
+@pytest.fixture
+def make_api(stub):
+    """factory for TradierAPI clients whose sessions are all wired to the StubAdapter"""
+
+    def make(**kwargs):
+        kwargs.setdefault("default_account_id", "VA000000")
+        t = TradierAPI(token="token", **kwargs)
+        t.session.mount("https://", stub)
+        t.trading_session.mount("https://", stub)
+        return t
+
+    return make
+
+
+@pytest.fixture
+def api(make_api):
+    """TradierAPI wired to a StubAdapter"""
+    return make_api()
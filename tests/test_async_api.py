@@ -0,0 +1,122 @@
+import asyncio
+from datetime import date
+
+import pytest
+
+httpx = pytest.importorskip("httpx")
+
+from tradier_python import AsyncTradierAPI
+from tradier_python.async_api import clean_params
+from tradier_python.models import *
+
+
+def make_client(handler) -> AsyncTradierAPI:
+    return AsyncTradierAPI(
+        token="token",
+        default_account_id="VA000000",
+        transport=httpx.MockTransport(handler),
+    )
+
+
+def test_clean_params_matches_requests():
+    params = {"symbol": "SPY", "expiration": date(2022, 6, 17), "greeks": False}
+    params["strikes"] = None
+    assert clean_params(params) == {
+        "symbol": "SPY",
+        "expiration": "2022-06-17",
+        "greeks": "False",
+    }
+
+
+def test_get_quotes(make_quote):
+    seen = []
+
+    def handler(request):
+        seen.append(request)
+        return httpx.Response(200, json={"quotes": {"quote": make_quote("SPY")}})
+
+    async def run():
+        async with make_client(handler) as t:
+            return await t.get_quotes("SPY")
+
+    quotes = asyncio.run(run())
+    assert [q.symbol for q in quotes] == ["SPY"]
+    assert isinstance(quotes[0], Quote)
+    assert seen[0].url.path == "/v1/markets/quotes"
+    assert seen[0].headers["Authorization"] == "Bearer token"
+
+
+def test_concurrent_requests(make_quote):
+    def handler(request):
+        symbol = request.url.params["symbols"]
+        return httpx.Response(200, json={"quotes": {"quote": [make_quote(symbol)]}})
+
+    async def run():
+        async with make_client(handler) as t:
+            return await asyncio.gather(*(t.get_quotes(s) for s in ["A", "B", "C"]))
+
+    results = asyncio.run(run())
+    assert [r[0].symbol for r in results] == ["A", "B", "C"]
+
+
+def test_error_status():
+    def handler(request):
+        return httpx.Response(401, text="Invalid Access Token")
+
+    async def run():
+        async with make_client(handler) as t:
+            await t.get_clock()
+
+    from tradier_python import TradierAPIError
+
+    with pytest.raises(TradierAPIError) as exc:
+        asyncio.run(run())
+    assert exc.value.code == 401
+
+
+def test_get_quotes_batches(make_quote):
+    from urllib.parse import parse_qs
+
+    def handler(request):
+        assert request.method == "POST"
+        symbols = parse_qs(request.content.decode())["symbols"][0].split(",")
+        return httpx.Response(
+            200, json={"quotes": {"quote": [make_quote(s) for s in symbols]}}
+        )
+
+    async def run():
+        async with make_client(handler) as t:
+            return await t.get_quotes([f"S{i}" for i in range(7)], batch_size=3)
+
+    quotes = asyncio.run(run())
+    assert [q.symbol for q in quotes] == [f"S{i}" for i in range(7)]
+
+
+def test_get_option_surface(make_option):
+    def handler(request):
+        if request.url.path.endswith("/expirations"):
+            return httpx.Response(
+                200, json={"expirations": {"date": ["2022-06-24", "2022-06-17"]}}
+            )
+        expiration = request.url.params["expiration"]
+        option = make_option("SPY", expiration, 400.0, "call")
+        return httpx.Response(200, json={"options": {"option": [option]}})
+
+    async def run():
+        async with make_client(handler) as t:
+            return await t.get_option_surface("SPY", max_workers=2)
+
+    surface = asyncio.run(run())
+    assert list(surface) == [date(2022, 6, 17), date(2022, 6, 24)]
+    assert surface[date(2022, 6, 17)][0].strike == 400.0
+
+
+def test_get_option_surface_without_options():
+    def handler(request):
+        return httpx.Response(200, json={"expirations": None})
+
+    async def run():
+        async with make_client(handler) as t:
+            return await t.get_option_surface("NOPT")
+
+    assert asyncio.run(run()) == {}
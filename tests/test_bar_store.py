@@ -0,0 +1,96 @@
+from datetime import date, timedelta
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from tradier_python.bar_store import BarStore, merge_ranges, subtract_ranges
+
+
+def test_subtract_ranges():
+    covered = [
+        (date(2021, 1, 10), date(2021, 1, 20)),
+        (date(2021, 1, 21), date(2021, 1, 25)),
+    ]
+    assert merge_ranges(covered) == [(date(2021, 1, 10), date(2021, 1, 25))]
+    assert subtract_ranges(date(2021, 1, 1), date(2021, 1, 31), covered) == [
+        (date(2021, 1, 1), date(2021, 1, 9)),
+        (date(2021, 1, 26), date(2021, 1, 31)),
+    ]
+    assert subtract_ranges(date(2021, 1, 12), date(2021, 1, 15), covered) == []
+
+
+@pytest.fixture
+def history(stub):
+    """serves one bar per weekday of the requested range, with the day of the month as price"""
+
+    def handler(request):
+        params = stub.query(request)
+        day, end = date.fromisoformat(params["start"]), date.fromisoformat(
+            params["end"]
+        )
+        bars = []
+        while day <= end:
+            if day.weekday() < 5:
+                price = float(day.day)
+                bars.append(
+                    {
+                        "date": day.isoformat(),
+                        "open": price,
+                        "high": price + 1,
+                        "low": price - 1,
+                        "close": price + 0.5,
+                        "volume": 1000,
+                    }
+                )
+            day += timedelta(days=1)
+        return 200, {"history": {"day": bars} if bars else None}
+
+    stub.route("GET", "/v1/markets/history", handler)
+    return lambda: [stub.query(r) for r in stub.requests]
+
+
+def test_update_fetches_only_gaps(api, history, tmp_path):
+    store = BarStore(api, str(tmp_path))
+    assert store.update("AAPL", date(2021, 3, 1), date(2021, 3, 31)) == 23
+    assert store.update("AAPL", date(2021, 3, 10), date(2021, 3, 20)) == 0
+    assert store.update("AAPL", date(2021, 2, 20), date(2021, 4, 3)) == 7
+    assert store.gaps("AAPL", date(2021, 2, 20), date(2021, 4, 3)) == []
+
+    assert [(q["start"], q["end"]) for q in history()] == [
+        ("2021-03-01", "2021-03-31"),
+        ("2021-02-20", "2021-02-28"),
+        ("2021-04-01", "2021-04-03"),
+    ]
+    bars = store.load("AAPL")
+    assert isinstance(bars["close"], np.memmap)
+    assert len(bars["date"]) == 30
+    assert (np.diff(bars["date"]) > np.timedelta64(0, "D")).all()
+
+
+def test_load_slices_by_date(api, history, tmp_path):
+    store = BarStore(api, str(tmp_path))
+    store.update("AAPL", date(2021, 3, 1), date(2021, 3, 31))
+    bars = store.load("AAPL", start=date(2021, 3, 6), end=date(2021, 3, 12))
+    assert bars["date"].tolist() == [date(2021, 3, d) for d in (8, 9, 10, 11, 12)]
+    assert bars["open"].tolist() == [8.0, 9.0, 10.0, 11.0, 12.0]
+    assert bars["volume"].dtype == np.int64
+    assert store.load("MSFT") is None
+
+
+def test_today_is_never_covered(api, history, tmp_path):
+    store = BarStore(api, str(tmp_path))
+    today = date.today()
+    store.update("AAPL", today - timedelta(days=10))
+    assert store.gaps("AAPL", today - timedelta(days=10)) == [(today, today)]
+
+
+def test_update_many(api, history, tmp_path):
+    store = BarStore(api, str(tmp_path), max_workers=4)
+    symbols = [f"S{i}" for i in range(10)]
+    counts = store.update_many(symbols, date(2021, 3, 1), date(2021, 3, 5))
+    assert counts == {symbol: 5 for symbol in symbols}
+    assert {q["symbol"] for q in history()} == set(symbols)
+    assert store.update_many(symbols, date(2021, 3, 1), date(2021, 3, 5)) == {
+        symbol: 0 for symbol in symbols
+    }
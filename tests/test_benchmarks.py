@@ -0,0 +1,42 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir, "benchmarks"))
+
+bench_suite = pytest.importorskip("bench_suite")
+
+
+def test_suite_runs_on_every_shape():
+    results = bench_suite.run(scale=0.001, repeat=1)
+    assert set(results) == set(bench_suite.SHAPES)
+    for result in results.values():
+        assert result["items"] >= 1
+        assert set(result["parse"]) == {"full", "construct", "raw"}
+        assert result["client"]["full"]["total"] > 0
+    assert bench_suite.regressions(results, results, 1.0) == []
+
+
+def test_regressions():
+    def result(parse, client):
+        modes = ("full", "construct", "raw")
+        return {
+            "quotes": {
+                "parse": {m: {"parse": parse} for m in modes},
+                "client": {m: {"total": client} for m in modes},
+            }
+        }
+
+    found = bench_suite.regressions(result(0.002, 0.010), result(0.001, 0.010), 1.25)
+    assert len(found) == 3 and all("parse" in line for line in found)
+
+
+def test_load_benchmark():
+    bench_load = pytest.importorskip("bench_load")
+    results = bench_load.run(
+        requests=20, workers=4, latency=0.0, jitter=0.0, error_rate=0.5, seed=1
+    )
+    assert sum(results["statuses"].values()) == 20
+    assert results["errors"] == results["statuses"].get(503, 0) > 0
+    assert results["endpoints"]["GET /v1/markets/quotes"]["count"] == 10
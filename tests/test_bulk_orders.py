@@ -0,0 +1,184 @@
+import asyncio
+import threading
+
+import pytest
+
+from tradier_python import OrderDetails, TradierAPIError, TradierOrderError
+
+
+class Broker:
+    """records placed orders by tag; specs for symbol "BAD" are rejected, and "FLAKY" fails with a 502 once after
+    the order has been placed"""
+
+    def __init__(self, stub, existing=()):
+        self.stub = stub
+        self.orders = list(existing)
+        self.lock = threading.Lock()
+        self.flaked = False
+        stub.route("POST", "/v1/accounts/VA000000/orders", self.place)
+        stub.route("GET", "/v1/accounts/VA000000/orders", self.list)
+
+    def place(self, request):
+        params = self.stub.query(request)
+        if params["symbol"] == "BAD":
+            return 200, {
+                "errors": {"error": "Backoffice rejected override of the order."}
+            }
+        with self.lock:
+            order = {"id": 100 + len(self.orders), "status": "ok", "tag": params["tag"]}
+            order.update(symbol=params["symbol"])
+            self.orders.append(order)
+        if params["symbol"] == "FLAKY" and not self.flaked:
+            self.flaked = True
+            return 502, {"error": "bad gateway"}
+        return 200, {"order": {"id": order["id"], "status": "ok", "partner_id": None}}
+
+    def list(self, request):
+        orders = [dict(o, status="open") for o in self.orders]
+        return 200, {"orders": {"order": orders} if orders else "null"}
+
+    def posts(self):
+        return [r for r in self.stub.requests if r.method == "POST"]
+
+
+def spec(symbol, **kwargs):
+    return dict(
+        order_class="equity",
+        symbol=symbol,
+        side="buy",
+        quantity=1,
+        order_type="market",
+        duration="day",
+        **kwargs,
+    )
+
+
+def test_submit_orders_in_input_order(api, stub):
+    broker = Broker(stub)
+    symbols = [f"S{i}" for i in range(20)] + ["BAD"]
+    results = api.submit_orders([spec(s) for s in symbols], max_workers=4)
+
+    assert all(isinstance(r, OrderDetails) for r in results[:-1])
+    assert isinstance(results[-1], TradierOrderError)
+    by_id = {o["id"]: o["symbol"] for o in broker.orders}
+    assert [by_id[r.id] for r in results[:-1]] == symbols[:-1]
+    assert len({o["tag"] for o in broker.orders}) == 20
+    assert not [r for r in stub.requests if r.method == "GET"]
+
+
+def test_submit_orders_skips_existing_tags(api, stub):
+    broker = Broker(stub, [{"id": 7, "status": "ok", "tag": "rebal-1", "symbol": "A"}])
+    results = api.submit_orders([spec("A", tag="rebal-1"), spec("B", tag="rebal-2")])
+
+    assert [r.id for r in results] == [7, 101]
+    assert [broker.stub.query(r)["tag"] for r in broker.posts()] == ["rebal-2"]
+
+
+def test_submit_orders_rejects_duplicate_tags(api, stub):
+    broker = Broker(stub)
+    specs = [spec(s, tag="rebal") for s in ("SPY", "QQQ", "IWM")]
+    with pytest.raises(ValueError):
+        api.submit_orders(specs)
+    assert not stub.requests
+
+    specs = [spec(s, tag=f"rebal-{s}") for s in ("SPY", "QQQ", "IWM")]
+    api.submit_orders(specs)
+    results = api.submit_orders(specs)
+    assert [r.id for r in results] == [100, 101, 102]
+    assert sorted(o["symbol"] for o in broker.orders) == ["IWM", "QQQ", "SPY"]
+
+
+def test_submit_orders_retry_finds_placed_order(api, stub):
+    broker = Broker(stub)
+    (result,) = api.submit_orders([spec("FLAKY")])
+
+    assert result.id == 100
+    assert len(broker.posts()) == 1 and len(broker.orders) == 1
+
+    broker = Broker(stub)
+    broker.flaked = False
+    (result,) = api.submit_orders([spec("FLAKY")], retries=0)
+    assert isinstance(result, TradierAPIError) and result.code == 502
+
+
+def test_cancel_orders(api, stub):
+    for order_id in (1, 2):
+        stub.route(
+            "DELETE",
+            f"/v1/accounts/VA000000/orders/{order_id}",
+            lambda r: (200, {"order": {"id": 1, "status": "ok", "partner_id": None}}),
+        )
+    results = api.cancel_orders([1, 3, 2])
+    assert isinstance(results[0], OrderDetails) and isinstance(results[2], OrderDetails)
+    assert isinstance(results[1], TradierAPIError) and results[1].code == 404
+
+
+def test_async_submit_orders():
+    httpx = pytest.importorskip("httpx")
+    from tradier_python import AsyncTradierAPI
+
+    placed = []
+
+    def handler(request):
+        if request.method == "GET":
+            return httpx.Response(200, json={"orders": "null"})
+        placed.append(request.url.params["symbol"])
+        if request.url.params["symbol"] == "BAD":
+            return httpx.Response(200, json={"errors": {"error": "rejected"}})
+        order = {"id": len(placed), "status": "ok", "partner_id": None}
+        return httpx.Response(200, json={"order": order})
+
+    async def run():
+        async with AsyncTradierAPI(
+            token="token",
+            default_account_id="VA000000",
+            transport=httpx.MockTransport(handler),
+        ) as t:
+            return await t.submit_orders(
+                [spec("A", tag="a"), spec("BAD"), spec("C")], max_workers=2
+            )
+
+    results = asyncio.run(run())
+    assert isinstance(results[0], OrderDetails) and isinstance(results[2], OrderDetails)
+    assert isinstance(results[1], TradierOrderError)
+    assert sorted(placed) == ["A", "BAD", "C"]
+
+    async def duplicate():
+        async with AsyncTradierAPI(
+            token="token",
+            default_account_id="VA000000",
+            transport=httpx.MockTransport(handler),
+        ) as t:
+            return await t.submit_orders([spec("A", tag="a"), spec("B", tag="a")])
+
+    with pytest.raises(ValueError):
+        asyncio.run(duplicate())
+    assert sorted(placed) == ["A", "BAD", "C"]
+
+
+def test_async_cancel_orders():
+    httpx = pytest.importorskip("httpx")
+    from tradier_python import AsyncTradierAPI
+
+    async def handler(request):
+        if request.url.path.endswith("/3"):
+            return httpx.Response(404, json={"error": "not found"})
+        if request.url.path.endswith("/4"):
+            raise asyncio.CancelledError
+        order = {"id": 1, "status": "ok", "partner_id": None}
+        return httpx.Response(200, json={"order": order})
+
+    async def run(order_ids):
+        async with AsyncTradierAPI(
+            token="token",
+            default_account_id="VA000000",
+            transport=httpx.MockTransport(handler),
+        ) as t:
+            return await t.cancel_orders(order_ids)
+
+    results = asyncio.run(run([1, 3, 2]))
+    assert isinstance(results[0], OrderDetails) and isinstance(results[2], OrderDetails)
+    assert isinstance(results[1], TradierAPIError) and results[1].code == 404
+
+    with pytest.raises(asyncio.CancelledError):
+        asyncio.run(run([1, 4]))
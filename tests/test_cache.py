@@ -0,0 +1,114 @@
+from datetime import date
+
+from tradier_python import TradierAPI
+from tradier_python.cache import MemoryCacheBackend, ResponseCache, SqliteCacheBackend
+
+EXPIRATIONS = {"expirations": {"date": ["2022-06-17", "2022-06-24"]}}
+
+
+def cached_api(make_api, stub, cache):
+    t = make_api(cache=cache)
+    stub.route("GET", "/v1/markets/options/expirations", lambda r: (200, EXPIRATIONS))
+    stub.route("GET", "/v1/markets/clock", lambda r: (200, {"clock": None}))
+    return t
+
+
+def test_reference_endpoint_is_cached(make_api, stub):
+    t = cached_api(make_api, stub, ResponseCache())
+    first = t.get_option_expirations("SPY")
+    second = t.get_option_expirations("SPY")
+    assert first == second == [date(2022, 6, 17), date(2022, 6, 24)]
+    assert len(stub.requests) == 1
+
+    t.get_option_expirations("QQQ")
+    assert len(stub.requests) == 2
+
+
+def test_uncached_endpoint(make_api, stub):
+    t = cached_api(make_api, stub, ResponseCache())
+    t.get_clock()
+    t.get_clock()
+    assert len(stub.requests) == 2
+
+
+def test_ttl_expiry(make_api, stub, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("tradier_python.cache.time.time", lambda: now[0])
+    t = cached_api(
+        make_api, stub, ResponseCache(ttls={"/v1/markets/options/expirations": 60})
+    )
+    t.get_option_expirations("SPY")
+    now[0] += 30
+    t.get_option_expirations("SPY")
+    assert len(stub.requests) == 1
+    now[0] += 31
+    t.get_option_expirations("SPY")
+    assert len(stub.requests) == 2
+
+
+def test_invalidate(make_api, stub):
+    cache = ResponseCache()
+    t = cached_api(make_api, stub, cache)
+    t.get_option_expirations("SPY")
+    t.get_option_expirations("QQQ")
+
+    path = "/v1/markets/options/expirations"
+    cache.invalidate(path, {"symbol": "SPY", "includeAllRoots": None, "strikes": None})
+    t.get_option_expirations("SPY")
+    t.get_option_expirations("QQQ")
+    assert len(stub.requests) == 3
+
+    cache.invalidate(path)
+    t.get_option_expirations("QQQ")
+    assert len(stub.requests) == 4
+
+
+def test_memory_lru():
+    backend = MemoryCacheBackend(maxsize=2)
+    for key in "abc":
+        backend.set(key, "/p", 0.0, key)
+    assert backend.get("a") is None
+    assert backend.get("c") == (0.0, "c")
+
+
+def test_sqlite_survives_restart(make_api, stub, tmp_path):
+    filename = str(tmp_path / "cache.sqlite")
+    t = cached_api(make_api, stub, ResponseCache(SqliteCacheBackend(filename)))
+    t.get_option_expirations("SPY")
+    t.cache.backend.close()
+
+    t = cached_api(make_api, stub, ResponseCache(SqliteCacheBackend(filename)))
+    assert len(t.get_option_expirations("SPY")) == 2
+    assert len(stub.requests) == 1
+
+
+def test_sqlite_lru(tmp_path):
+    backend = SqliteCacheBackend(str(tmp_path / "cache.sqlite"), maxsize=2)
+    for key in "abc":
+        backend.set(key, "/p", 0.0, key)
+    assert backend.get("a") is None
+    backend.clear("/p")
+    assert backend.get("c") is None
+
+
+def test_sqlite_hits_do_not_write(tmp_path):
+    filename = str(tmp_path / "cache.sqlite")
+    backend = SqliteCacheBackend(filename, maxsize=2)
+    backend.set("a", "/p", 0.0, "a")
+    backend.set("b", "/p", 0.0, "b")
+    changes = backend._db.total_changes
+    for _ in range(10):
+        assert backend.get("a") == (0.0, "a")
+    assert backend._db.total_changes == changes
+
+    # the hit on a is written with the next set, so b is the one evicted
+    backend.set("c", "/p", 0.0, "c")
+    assert backend.get("b") is None
+    assert backend.get("a") == (0.0, "a")
+    backend.get("c")
+    backend.close()
+
+    backend = SqliteCacheBackend(filename, maxsize=2)
+    backend.set("d", "/p", 0.0, "d")
+    assert backend.get("a") is None
+    assert backend.get("c") == (0.0, "c")
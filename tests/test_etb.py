@@ -0,0 +1,71 @@
+import json
+import threading
+import time
+
+from tradier_python import EtbIndex
+
+
+def securities(*symbols):
+    return {
+        "securities": {
+            "security": [
+                {"symbol": s, "exchange": "Q", "type": "stock", "description": s}
+                for s in symbols
+            ]
+        }
+    }
+
+
+def test_refresh_and_lookup(api, stub):
+    stub.route("GET", "/v1/markets/etb", lambda r: (200, securities("AAPL", "SPY")))
+    etb = EtbIndex(api)
+    assert "AAPL" not in etb and etb.stale
+    etb.refresh()
+    assert "AAPL" in etb and "aapl" in etb and "GME" not in etb
+    assert len(etb) == 2 and not etb.stale
+
+
+def test_persists_with_fetch_time(api, stub, tmp_path):
+    stub.route("GET", "/v1/markets/etb", lambda r: (200, securities("AAPL")))
+    path = str(tmp_path / "etb.json")
+    EtbIndex(api, path=path).refresh()
+    with open(path) as f:
+        assert json.load(f)["symbols"] == ["AAPL"]
+
+    etb = EtbIndex(api, path=path)
+    assert "AAPL" in etb and etb.wait(0)
+    assert etb.age < 60
+    assert len(stub.requests) == 1
+
+
+def test_background_refresh_never_blocks_lookups(api, stub, tmp_path):
+    path = tmp_path / "etb.json"
+    path.write_text(json.dumps({"fetched": time.time() - 86400, "symbols": ["OLD"]}))
+    release = threading.Event()
+
+    def slow(request):
+        release.wait(5)
+        return 200, securities("NEW")
+
+    stub.route("GET", "/v1/markets/etb", slow)
+    etb = EtbIndex(api, path=str(path)).start(check_interval=0.01)
+    assert "OLD" in etb and etb.stale
+    release.set()
+    deadline = time.time() + 5
+    while "NEW" not in etb and time.time() < deadline:
+        time.sleep(0.01)
+    etb.stop()
+    assert "NEW" in etb and "OLD" not in etb
+    assert json.loads(path.read_text())["symbols"] == ["NEW"]
+
+
+def test_background_refresh_keeps_list_on_error(api, stub):
+    stub.route("GET", "/v1/markets/etb", lambda r: (500, {"error": "down"}))
+    etb = EtbIndex(api)
+    etb._set(["AAPL"], time.time() - 86400)
+    etb.start(check_interval=0.01)
+    deadline = time.time() + 5
+    while etb.last_error is None and time.time() < deadline:
+        time.sleep(0.01)
+    etb.stop()
+    assert etb.last_error is not None and "AAPL" in etb
@@ -0,0 +1,109 @@
+import asyncio
+import threading
+
+import pytest
+
+from tradier_python import ClosedPosition, Event
+
+
+def _event(n):
+    return {
+        "amount": float(n),
+        "date": "2021-10-08T00:00:00Z",
+        "type": "trade",
+        "trade": {
+            "commission": 0.0,
+            "description": "SPY",
+            "price": 400.0,
+            "quantity": 1.0,
+            "symbol": "SPY",
+            "trade_type": "Equity",
+        },
+    }
+
+
+def _closed_position(n):
+    return {
+        "close_date": "2021-10-08T00:00:00.000Z",
+        "cost": 100.0,
+        "gain_loss": float(n),
+        "gain_loss_percent": 1.0,
+        "open_date": "2021-10-01T00:00:00.000Z",
+        "proceeds": 101.0,
+        "quantity": 1.0,
+        "symbol": "SPY",
+        "term": 7,
+    }
+
+
+def paged(stub, total, page_body):
+    """handler serving total items in pages of the requested limit, "null" after the last"""
+
+    def handler(request):
+        params = stub.query(request)
+        page, limit = int(params["page"]), int(params["limit"])
+        items = list(range((page - 1) * limit, min(page * limit, total)))
+        return 200, page_body(items)
+
+    return handler
+
+
+def test_iter_history(api, stub):
+    def body(items):
+        if not items:
+            return {"history": "null"}
+        if len(items) == 1:
+            return {"history": {"event": _event(items[0])}}
+        return {"history": {"event": [_event(n) for n in items]}}
+
+    stub.route("GET", "/v1/accounts/VA000000/history", paged(stub, 7, body))
+    events = list(api.iter_history(limit=3))
+    assert all(isinstance(e, Event) for e in events)
+    assert [e.amount for e in events] == [float(n) for n in range(7)]
+    assert [stub.query(r)["page"] for r in stub.requests] == ["1", "2", "3"]
+
+    stub.requests.clear()
+    stub.route("GET", "/v1/accounts/VA000000/history", paged(stub, 6, body))
+    assert len(list(api.iter_history(limit=3))) == 6
+    assert [stub.query(r)["page"] for r in stub.requests] == ["1", "2", "3"]
+
+
+def test_iter_gain_loss_prefetches_next_page(api, stub):
+    requested = threading.Condition()
+
+    def body(items):
+        with requested:
+            requested.notify_all()
+        return {"gainloss": {"closed_position": [_closed_position(n) for n in items]}}
+
+    stub.route("GET", "/v1/accounts/VA000000/gainloss", paged(stub, 4, body))
+    positions = api.iter_gain_loss(limit=2)
+    first = next(positions)
+    assert isinstance(first, ClosedPosition)
+    with requested:
+        assert requested.wait_for(lambda: len(stub.requests) == 2, timeout=5)
+    assert [p.gain_loss for p in positions] == [1.0, 2.0, 3.0]
+    assert [stub.query(r)["page"] for r in stub.requests] == ["1", "2", "3"]
+
+
+def test_async_iter_history():
+    httpx = pytest.importorskip("httpx")
+    from tradier_python import AsyncTradierAPI
+
+    def handler(request):
+        page = int(request.url.params["page"])
+        if page > 2:
+            return httpx.Response(200, json={"history": "null"})
+        return httpx.Response(
+            200, json={"history": {"event": [_event(page), _event(page)]}}
+        )
+
+    async def run():
+        async with AsyncTradierAPI(
+            token="token",
+            default_account_id="VA000000",
+            transport=httpx.MockTransport(handler),
+        ) as t:
+            return [e.amount async for e in t.iter_history(limit=2)]
+
+    assert asyncio.run(run()) == [1.0, 1.0, 2.0, 2.0]
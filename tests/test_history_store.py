@@ -0,0 +1,90 @@
+from datetime import date
+
+from tradier_python import Event, HistoryStore
+
+
+def _trade(day, symbol, amount):
+    return {
+        "amount": amount,
+        "date": f"2021-10-{day:02d}T00:00:00Z",
+        "type": "trade",
+        "trade": {
+            "commission": 0.0,
+            "description": symbol,
+            "price": 10.0,
+            "quantity": 1.0,
+            "symbol": symbol,
+            "trade_type": "Equity",
+        },
+    }
+
+
+def _dividend(day, amount):
+    return {
+        "amount": amount,
+        "date": f"2021-10-{day:02d}T00:00:00Z",
+        "type": "journal",
+        "journal": {"description": "dividend", "quantity": 0.0},
+    }
+
+
+class History:
+    """serves events newest first, honoring start, page and limit"""
+
+    def __init__(self, stub):
+        self.events = []
+        self.stub = stub
+        stub.route("GET", "/v1/accounts/VA000000/history", self)
+
+    def __call__(self, request):
+        params = self.stub.query(request)
+        events = sorted(self.events, key=lambda e: e["date"], reverse=True)
+        if "start" in params:
+            events = [e for e in events if e["date"][:10] >= params["start"]]
+        page, limit = int(params["page"]), int(params["limit"])
+        events = events[(page - 1) * limit : page * limit]
+        return 200, {"history": {"event": events} if events else "null"}
+
+
+def test_sync_fetches_only_new_events(api, stub, tmp_path):
+    history = History(stub)
+    history.events = [_trade(1, "SPY", -10.0), _trade(2, "AAPL", -10.0)]
+    history.events += [_trade(2, "AAPL", -10.0), _dividend(2, 1.5)]
+    path = str(tmp_path / "history.jsonl")
+
+    store = HistoryStore(api, path, page_size=2)
+    assert store.sync() == 4
+    assert "start" not in stub.query(stub.requests[0])
+
+    stub.requests.clear()
+    history.events += [_trade(2, "AAPL", -10.0), _trade(3, "SPY", 10.0)]
+    assert store.sync() == 2
+    assert {stub.query(r)["start"] for r in stub.requests} == {"2021-10-02"}
+    assert store.sync() == 0
+
+    reopened = HistoryStore(api, path)
+    assert len(reopened) == 6
+    assert reopened.last_date == "2021-10-03T00:00:00Z"
+    assert [e.amount for e in reopened.query(symbol="AAPL")] == [-10.0] * 3
+
+
+def test_query(api, stub, tmp_path):
+    history = History(stub)
+    history.events = [
+        _trade(1, "SPY", -1.0),
+        _dividend(2, 2.0),
+        _trade(3, "AAPL", -3.0),
+        _trade(4, "SPY", 4.0),
+    ]
+    store = HistoryStore(api, str(tmp_path / "history.jsonl"))
+    store.sync()
+
+    assert all(isinstance(e, Event) for e in store.query())
+    assert [e.amount for e in store.query(event_type="trade")] == [-1.0, -3.0, 4.0]
+    assert [e.amount for e in store.query(symbol="SPY", start=date(2021, 10, 2))] == [
+        4.0
+    ]
+    assert [
+        e.amount for e in store.query(start=date(2021, 10, 2), end=date(2021, 10, 3))
+    ] == [2.0, -3.0]
+    assert store.query(event_type="journal", symbol="SPY") == []
@@ -0,0 +1,48 @@
+import subprocess
+import sys
+
+import pytest
+
+import tradier_python
+
+
+def loaded_modules(statement: str) -> set:
+    """the top level modules loaded by running statement in a fresh interpreter"""
+    code = f"{statement}\nimport sys\nprint(' '.join(sys.modules))"
+    output = subprocess.run(
+        [sys.executable, "-c", code], check=True, capture_output=True, text=True
+    ).stdout
+    return {name.split(".")[0] for name in output.split()}
+
+
+def test_package_import_is_lazy():
+    loaded = loaded_modules("import tradier_python")
+    assert not loaded & {"pydantic", "requests", "httpx", "numpy", "websockets"}
+
+
+@pytest.mark.parametrize(
+    "statement",
+    [
+        "from tradier_python import TradierAPI",
+        "from tradier_python import TradierAPI, Quote, RateLimiter, ResponseCache",
+    ],
+)
+def test_client_import_skips_optional_dependencies(statement):
+    loaded = loaded_modules(statement)
+    assert "requests" in loaded
+    assert not loaded & {"httpx", "numpy", "websockets"}
+
+
+def test_exports():
+    assert tradier_python.TradierAPI.__module__ == "tradier_python.tradier_api"
+    assert tradier_python.Quote.__module__ == "tradier_python.models"
+    assert {"TradierAPI", "OrderTracker", "Quote"} <= set(tradier_python.__all__)
+    assert "MarketStream" in dir(tradier_python)
+    with pytest.raises(AttributeError):
+        tradier_python.NoSuchName
+
+    # the deferred-build BaseModel and the models' own imports are not part of the API
+    leaked = {"BaseModel", "pydantic", "parsing", "ConfigDict", "model_validator"}
+    assert not leaked & set(tradier_python.__all__)
+    with pytest.raises(AttributeError):
+        tradier_python.BaseModel
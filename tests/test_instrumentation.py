@@ -0,0 +1,195 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from tradier_python import AsyncTradierAPI, MetricsCollector, TradierAPIError
+from tradier_python.cache import ResponseCache
+from tradier_python.instrumentation import endpoint_name
+
+CLOCK = {
+    "clock": {
+        "date": "2021-10-08",
+        "description": "Market is open from 09:30 to 16:00",
+        "state": "open",
+        "timestamp": 1633708800,
+        "next_change": "16:00",
+        "next_state": "postmarket",
+    }
+}
+RATELIMIT_HEADERS = {
+    "X-Ratelimit-Allowed": "120",
+    "X-Ratelimit-Available": "117",
+    "X-Ratelimit-Expiry": "1633708860000",
+}
+
+
+def test_endpoint_name():
+    assert endpoint_name("/v1/markets/quotes") == "/v1/markets/quotes"
+    assert (
+        endpoint_name("/v1/accounts/VA000000/orders/123")
+        == "/v1/accounts/{account_id}/orders/{order_id}"
+    )
+
+
+def test_request_metrics(make_api, stub):
+    seen = []
+    api = make_api(hooks=[seen.append])
+    stub.route(
+        "GET",
+        "/v1/markets/clock",
+        lambda r: (200, CLOCK, RATELIMIT_HEADERS),
+    )
+    api.get_clock()
+
+    (metrics,) = seen
+    assert metrics.endpoint == "GET /v1/markets/clock"
+    assert metrics.lane == "data"
+    assert metrics.status == 200
+    assert metrics.bytes == len(json.dumps(CLOCK))
+    assert metrics.validate > 0
+    assert metrics.total == pytest.approx(
+        metrics.queued
+        + metrics.wait
+        + metrics.transfer
+        + metrics.decode
+        + metrics.validate
+    )
+    assert (metrics.ratelimit_allowed, metrics.ratelimit_available) == (120, 117)
+    assert metrics.ratelimit_expiry == 1633708860.0
+
+
+def test_unparsed_and_failed_requests_are_reported(make_api, stub):
+    seen = []
+    api = make_api(hooks=[seen.append])
+    stub.route("GET", "/v1/markets/clock", lambda r: (200, {"clock": None}))
+    stub.route("GET", "/v1/markets/calendar", lambda r: (500, {"error": "down"}))
+
+    api.get("/v1/markets/clock", {})
+    assert seen == []
+    with pytest.raises(TradierAPIError):
+        api.get_calendar()
+    assert [(m.path, m.status) for m in seen] == [
+        ("/v1/markets/clock", 200),
+        ("/v1/markets/calendar", 500),
+    ]
+
+    api.get("/v1/markets/clock", {})
+    api.flush_metrics()
+    assert len(seen) == 3
+
+
+def test_failing_hook_warns(make_api, stub):
+    def hook(metrics):
+        raise RuntimeError("boom")
+
+    api = make_api(hooks=[hook])
+    stub.route("GET", "/v1/markets/clock", lambda r: (200, {"clock": None}))
+    with pytest.warns(RuntimeWarning, match="boom"):
+        api.get_clock()
+
+
+def test_collector(make_api, stub):
+    collector = MetricsCollector()
+    api = make_api(hooks=[collector], cache=ResponseCache())
+    stub.route(
+        "GET",
+        "/v1/accounts/VA000000/orders/1",
+        lambda r: (200, {"order": None}, RATELIMIT_HEADERS),
+    )
+    stub.route(
+        "GET",
+        "/v1/markets/options/expirations",
+        lambda r: (200, {"expirations": {"date": ["2021-10-15"]}}),
+    )
+    api.get_order(1)
+    api.get_order(1)
+    api.get_option_expirations("SPY")
+    api.get_option_expirations("SPY")
+
+    summary = collector.summary()
+    orders = summary["GET /v1/accounts/{account_id}/orders/{order_id}"]
+    assert orders["count"] == 2
+    assert orders["statuses"] == {200: 2}
+    assert orders["total"]["count"] == 2
+    assert orders["ratelimit"] == (120, 117, 1633708860.0)
+    expirations = summary["GET /v1/markets/options/expirations"]
+    assert expirations["count"] == 2
+    assert expirations["cached"] == 1
+    assert expirations["validate"]["count"] == 1
+
+    histogram = collector.histogram(
+        "GET /v1/accounts/{account_id}/orders/{order_id}", buckets=(10.0,)
+    )
+    assert histogram == {"<=10.0": 2, ">10.0": 0}
+
+
+def test_cache_hit_does_not_take_pending_metrics(make_api, stub):
+    seen = []
+    api = make_api(hooks=[seen.append], cache=ResponseCache())
+    stub.route("GET", "/v1/markets/clock", lambda r: (200, CLOCK))
+    stub.route(
+        "GET",
+        "/v1/markets/options/expirations",
+        lambda r: (200, {"expirations": {"date": ["2021-10-15"]}}),
+    )
+    api.get_option_expirations("SPY")
+    api.get("/v1/markets/clock", {})
+    api.get_option_expirations("SPY")
+
+    assert [(m.path, m.cached) for m in seen] == [
+        ("/v1/markets/options/expirations", False),
+        ("/v1/markets/clock", False),
+        ("/v1/markets/options/expirations", True),
+    ]
+    assert seen[1].validate == 0
+
+
+def test_submit_orders_reports_order_lookup(make_api, stub):
+    seen = []
+    api = make_api(hooks=[seen.append])
+    order = {"id": 7, "status": "open", "tag": "rebal-1"}
+    stub.route(
+        "GET",
+        "/v1/accounts/VA000000/orders",
+        lambda r: (200, {"orders": {"order": [order]}}),
+    )
+    spec = dict(
+        order_class="equity",
+        symbol="A",
+        side="buy",
+        quantity=1,
+        order_type="market",
+        duration="day",
+        tag="rebal-1",
+    )
+    (result,) = api.submit_orders([spec])
+
+    assert result.id == 7
+    (metrics,) = seen
+    assert metrics.endpoint == "GET /v1/accounts/{account_id}/orders"
+    assert metrics.validate == 0
+
+
+def test_async_request_metrics():
+    seen = []
+
+    def handler(request):
+        return httpx.Response(200, json=CLOCK)
+
+    async def main():
+        t = AsyncTradierAPI(
+            token="token",
+            hooks=[seen.append],
+            transport=httpx.MockTransport(handler),
+        )
+        await asyncio.gather(t.get_clock(), t.get_clock())
+        await t.get("/v1/markets/clock", {})
+        await t.aclose()
+
+    asyncio.run(main())
+    assert len(seen) == 3
+    assert all(m.endpoint == "GET /v1/markets/clock" for m in seen)
+    assert [m.validate > 0 for m in seen] == [True, True, False]
+    assert all(m.bytes > 0 for m in seen)
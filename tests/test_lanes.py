@@ -0,0 +1,56 @@
+import threading
+
+import pytest
+
+from tradier_python.stats import LatencyStats
+
+
+def test_latency_stats():
+    stats = LatencyStats(maxlen=100)
+    for ms in range(1, 101):
+        stats.add(ms / 1000)
+    summary = stats.summary()
+    assert summary["count"] == 100
+    assert summary["mean"] == pytest.approx(0.0505)
+    assert summary["p50"] == 0.051
+    assert summary["max"] == 0.1
+    assert LatencyStats().summary()["p99"] == 0.0
+
+
+def test_orders_use_trading_lane(api, stub):
+    stub.route(
+        "POST",
+        "/v1/accounts/VA000000/orders",
+        lambda r: (200, {"order": {"id": 1, "status": "ok", "partner_id": None}}),
+    )
+    stub.route("GET", "/v1/markets/clock", lambda r: (200, {"clock": None}))
+
+    sessions = []
+    for session in (api.session, api.trading_session):
+        send = session.send
+
+        def tracking_send(request, _send=send, _session=session, **kwargs):
+            sessions.append(_session)
+            return _send(request, **kwargs)
+
+        session.send = tracking_send
+
+    api.get_clock()
+    api.order_equity("SPY", "buy", 1, "market", "day")
+    assert sessions == [api.session, api.trading_session]
+
+    stats = api.latency_stats()
+    assert stats["data"]["count"] == 1
+    assert stats["trading"]["count"] == 1
+
+
+def test_trading_keepalive(api, stub):
+    pinged = threading.Event()
+    stub.route("HEAD", "/", lambda r: pinged.set() or (200, {}))
+    api.start_trading_keepalive(interval=0.01)
+    try:
+        assert pinged.wait(1)
+        pinged.clear()
+        assert pinged.wait(1)
+    finally:
+        api.close()
@@ -0,0 +1,281 @@
+from datetime import date, datetime
+
+import pytest
+
+from tradier_python.models import *
+from tradier_python.option_chain import OptionChainIndex
+
+EXPIRATIONS = ["2022-06-17", "2022-06-24", "2022-07-15", "2022-09-16"]
+
+
+def route_surface(stub, make_option):
+    stub.route(
+        "GET",
+        "/v1/markets/options/expirations",
+        lambda r: (200, {"expirations": {"date": list(reversed(EXPIRATIONS))}}),
+    )
+
+    def chains(request):
+        expiration = stub.query(request)["expiration"]
+        options = [
+            make_option("SPY", expiration, strike, option_type)
+            for strike in (400.0, 410.0)
+            for option_type in ("call", "put")
+        ]
+        return 200, {"options": {"option": options}}
+
+    stub.route("GET", "/v1/markets/options/chains", chains)
+
+
+def test_get_option_surface(api, stub, make_option):
+    route_surface(stub, make_option)
+    surface = api.get_option_surface("SPY", max_workers=3)
+
+    assert list(surface) == [date.fromisoformat(e) for e in EXPIRATIONS]
+    for expiration, chain in surface.items():
+        assert len(chain) == 4
+        assert all(q.expiration_date == expiration for q in chain)
+    assert len(stub.requests) == 1 + len(EXPIRATIONS)
+
+
+def test_iter_option_surface_given_expirations(api, stub, make_option):
+    route_surface(stub, make_option)
+    wanted = [date(2022, 6, 24), date(2022, 6, 17)]
+    seen = [e for e, chain in api.iter_option_surface("SPY", wanted)]
+
+    assert sorted(seen) == sorted(wanted)
+    assert all("expirations" not in r.url for r in stub.requests)
+
+
+@pytest.mark.parametrize("validate", ["full", "construct", "raw"])
+def test_option_surface_without_options(make_api, stub, validate):
+    stub.route(
+        "GET",
+        "/v1/markets/options/expirations",
+        lambda r: (200, {"expirations": None}),
+    )
+    api = make_api(validate=validate)
+    assert api.get_option_surface("NOPT") == {}
+    assert list(api.iter_option_surface("NOPT")) == []
+
+
+def chain_payload(make_option, expiration="2022-06-17"):
+    options = []
+    for strike in (380.0, 390.0, 400.0, 410.0, 420.0):
+        for option_type, sign in (("call", 1), ("put", -1)):
+            delta = sign * (0.5 - (strike - 400.0) / 100.0 * sign)
+            greeks = {
+                "delta": delta,
+                "gamma": 0.01,
+                "theta": -0.1,
+                "vega": 0.2,
+                "rho": 0.05,
+                "phi": -0.05,
+                "bid_iv": 0.2,
+                "mid_iv": 0.21,
+                "ask_iv": 0.22,
+                "smv_vol": 0.21,
+                "updated_at": "2022-06-01 15:00:00",
+            }
+            options.append(
+                make_option(
+                    "SPY", expiration, strike, option_type, greeks=greeks, last=None
+                )
+            )
+    return {"options": {"option": options}}
+
+
+def test_option_chain_frame(api, stub, make_option):
+    np = pytest.importorskip("numpy")
+    stub.route(
+        "GET", "/v1/markets/options/chains", lambda r: (200, chain_payload(make_option))
+    )
+    frame = api.get_option_chain_frame("SPY", date(2022, 6, 17), greeks=True)
+
+    assert len(frame) == 10
+    assert frame.strike.dtype == np.float64
+    assert np.isnan(frame.last).all()
+    assert frame["expiration"][0] == np.datetime64("2022-06-17")
+    assert len(frame.calls()) == len(frame.puts()) == 5
+
+    near = frame.filter_moneyness(400.0, 0.97, 1.03)
+    assert sorted(set(near.strike)) == [390.0, 400.0, 410.0]
+    assert len(frame.filter_delta(0.45, 0.55)) == 2
+    assert len(frame.filter_dte(0, 30, today=date(2022, 6, 1))) == 10
+    assert len(frame.filter_dte(0, 10, today=date(2022, 6, 1))) == 0
+
+    quotes = near.puts().to_quotes()
+    assert all(isinstance(q, Quote) and q.option_type == "put" for q in quotes)
+    assert frame.quote(0).symbol == frame.symbol[0]
+
+
+def test_option_chain_frame_empty(api, stub):
+    pytest.importorskip("numpy")
+    stub.route("GET", "/v1/markets/options/chains", lambda r: (200, {"options": None}))
+    frame = api.get_option_chain_frame("SPY", date(2022, 6, 17))
+    assert len(frame) == 0
+
+
+def test_occ_symbols():
+    from tradier_python.occ import (
+        OptionSymbol,
+        decode_option_symbol,
+        decode_option_symbols,
+        encode_option_symbol,
+        encode_option_symbols,
+    )
+
+    aapl = OptionSymbol("AAPL", date(2022, 6, 17), "call", 270.0)
+    assert encode_option_symbol("AAPL", date(2022, 6, 17), "C", 270) == (
+        "AAPL220617C00270000"
+    )
+    assert decode_option_symbol("AAPL220617C00270000") == aapl
+    assert aapl.symbol == "AAPL220617C00270000"
+    assert decode_option_symbol("SPXW  221230P04512500").strike == 4512.5
+
+    contracts = [
+        ("SPY", "2022-06-17", OptionType.PUT, 412.5),
+        ("SPY", "2022-06-17", "call", 0.5),
+    ]
+    symbols = encode_option_symbols(contracts)
+    assert symbols == ["SPY220617P00412500", "SPY220617C00000500"]
+    assert [s.strike for s in decode_option_symbols(symbols)] == [412.5, 0.5]
+
+    for bad in (
+        "AAPL",
+        "220617C00270000",
+        "AAPL220617X00270000",
+        "AAPL221317C00270000",
+    ):
+        with pytest.raises(ValueError):
+            decode_option_symbol(bad)
+    with pytest.raises(ValueError):
+        encode_option_symbol("AAPL", date(2022, 6, 17), "straddle", 270)
+
+
+def test_option_chain_index(api, stub, make_option):
+    route_surface(stub, make_option)
+    chain = api.get_option_chain_index("SPY", date(2022, 6, 17))
+
+    assert len(chain) == 4
+    assert chain.expirations == [date(2022, 6, 17)]
+    put = chain.get(date(2022, 6, 17), 410, "put")
+    assert put.symbol == "SPY220617P00410000" and put in list(chain)
+    assert chain["2022-06-17", 400.0, "C"].option_type == "call"
+    assert chain.get(date(2022, 6, 17), 405, "put") is None
+    with pytest.raises(KeyError):
+        chain[date(2022, 6, 24), 400.0, "call"]
+    assert chain.by_symbol(put.symbol) is put and put.symbol in chain
+    assert chain.key(put.symbol).strike == 410.0
+
+    surface = api.get_option_surface("SPY")
+    chain = OptionChainIndex(q for quotes in surface.values() for q in quotes)
+    assert chain.expirations == [date.fromisoformat(e) for e in EXPIRATIONS]
+    assert chain.strikes(date(2022, 7, 15), "put") == [400.0, 410.0]
+    assert chain.nearest(date(2022, 7, 15), 404.9, "put").strike == 400.0
+    assert chain.nearest(date(2022, 7, 15), 405.0, "put").strike == 400.0
+    assert chain.nearest(date(2022, 7, 15), 1000, "call").strike == 410.0
+    assert chain.nearest(date(2022, 7, 16), 400, "call") is None
+    assert [q.strike for q in chain.between(date(2022, 7, 15), 395, 410, "call")] == [
+        400.0,
+        410.0,
+    ]
+    assert chain.between(date(2022, 7, 15), 401, 409, "call") == []
+
+
+@pytest.mark.parametrize("validate", ["full", "construct", "raw"])
+def test_option_chain_index_empty(make_api, stub, validate):
+    stub.route("GET", "/v1/markets/options/chains", lambda r: (200, {"options": None}))
+    chain = make_api(validate=validate).get_option_chain_index(
+        "NOPT", date(2022, 6, 17)
+    )
+    assert len(chain) == 0 and chain.expirations == []
+    assert chain.get(date(2022, 6, 17), 400, "call") is None
+
+
+def test_option_chain_index_raw(make_api, stub, make_option):
+    route_surface(stub, make_option)
+    chain = make_api(validate="raw").get_option_chain_index("SPY", date(2022, 6, 17))
+    assert chain.get(date(2022, 6, 17), 400, "put")["symbol"] == "SPY220617P00400000"
+
+
+def test_greeks_engine():
+    np = pytest.importorskip("numpy")
+    from tradier_python.greeks import black76, black_scholes, implied_volatility
+
+    # Hull's example: S=42, K=40, r=10%, sigma=20%, T=0.5 prices the call at 4.76 and the put at 0.81
+    g = black_scholes(["call", "P"], 42.0, 40.0, 0.5, 0.2, 0.1)
+    assert np.allclose(g["price"], [4.7594, 0.8086], atol=1e-4)
+    assert np.allclose(g["delta"], [0.7791, -0.2209], atol=1e-4)
+    assert g["gamma"][0] == pytest.approx(g["gamma"][1])
+    assert g["vega"][0] == pytest.approx(0.0881, abs=1e-4)
+    # put-call parity
+    assert g["price"][0] - g["price"][1] == pytest.approx(42 - 40 * np.exp(-0.05))
+
+    h = 1e-5
+    up = black_scholes(["call", "put"], 42.0, 40.0, 0.5, 0.2 + h, 0.1)
+    assert np.allclose((up["price"] - g["price"]) / h / 100, g["vega"], rtol=1e-3)
+    later = black_scholes(["call", "put"], 42.0, 40.0, 0.5 - h, 0.2, 0.1)
+    assert np.allclose((later["price"] - g["price"]) / h / 365, g["theta"], rtol=1e-3)
+
+    strikes = np.linspace(80, 120, 41)
+    vols = np.linspace(0.1, 0.9, 41)
+    types = np.where(strikes < 100, "put", "call")
+    prices = black_scholes(types, 100.0, strikes, 0.25, vols, 0.03, 0.01)["price"]
+    iv = implied_volatility(types, prices, 100.0, strikes, 0.25, 0.03, 0.01)
+    assert np.allclose(iv, vols, atol=1e-6)
+    bad = implied_volatility("call", [0.0, 150.0, np.nan], 100.0, 100.0, 0.25)
+    assert np.isnan(bad).all()
+
+    futures = black76("call", 100.0, 100.0, 1.0, 0.2, 0.05)
+    assert futures["price"] == pytest.approx(np.exp(-0.05) * 7.9656, abs=1e-4)
+
+
+def test_option_chain_frame_with_greeks(api, stub, make_option):
+    np = pytest.importorskip("numpy")
+    from tradier_python.greeks import black_scholes
+
+    stub.route(
+        "GET", "/v1/markets/options/chains", lambda r: (200, chain_payload(make_option))
+    )
+    frame = api.get_option_chain_frame("SPY", date(2022, 6, 17))
+    orats_delta = frame.delta.copy()
+    years = 16.25 / 365
+    value = black_scholes(frame.option_type, 400.0, frame.strike, years, 0.2, 0.01)
+    frame.columns["bid"][:] = value["price"] - 0.05
+    frame.columns["ask"][:] = value["price"] + 0.05
+    frame.columns["bid"][1] = frame.columns["ask"][1] = 0.0
+    computed = frame.with_greeks(400.0, rate=0.01, now=datetime(2022, 6, 1, 10, 0))
+
+    assert np.allclose(computed.mid_iv[2:], 0.2, atol=1e-3)
+    assert np.allclose(computed.delta[2:], value["delta"][2:], atol=1e-3)
+    assert (computed.bid_iv[2:] < computed.mid_iv[2:]).all()
+    assert (computed.mid_iv[2:] < computed.ask_iv[2:]).all()
+    assert np.isnan(computed.mid_iv[1]) and np.isnan(computed.delta[1])
+    assert (frame.delta == orats_delta).all()
+
+    quote = computed[4].quote(0)
+    assert quote.greeks.delta == pytest.approx(computed.delta[4])
+    assert quote.greeks.updated_at == "2022-06-01 10:00:00"
+    assert frame.quote(4).greeks.delta == orats_delta[4]
+
+
+def test_option_chain_index_roots(make_option):
+    expiration = date(2022, 6, 17)
+    spx = make_option("SPX", expiration, 4500.0, "put", bid=10.0)
+    spxw = make_option("SPXW", expiration, 4500.0, "put", bid=11.0)
+    chain = OptionChainIndex(
+        [spx, spxw, make_option("SPXW", expiration, 4510.0, "put")]
+    )
+
+    assert len(chain) == 3 and chain.roots == ["SPX", "SPXW"]
+    assert chain.get(expiration, 4500, "put", root="SPX")["bid"] == 10.0
+    assert chain.get(expiration, 4500, "put", root="spxw")["bid"] == 11.0
+    assert chain.strikes(expiration, "put", root="SPXW") == [4500.0, 4510.0]
+    assert len(chain.between(expiration, 4400, 4600, "put", root="SPXW")) == 2
+    assert chain.nearest(expiration, 4508, "put", root="SPX") is spx
+    with pytest.raises(ValueError):
+        chain.get(expiration, 4500, "put")
+    with pytest.raises(ValueError):
+        chain.between(expiration, 4400, 4600, "put")
+    assert chain.get(expiration, 4500, "call") is None
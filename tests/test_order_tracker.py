@@ -0,0 +1,91 @@
+import pytest
+
+from tradier_python import Order, OrderTracker
+
+
+def _order(id, symbol, status, exec_quantity=0.0, **fields):
+    order = {
+        "id": id,
+        "type": "limit",
+        "symbol": symbol,
+        "side": "buy",
+        "quantity": 10.0,
+        "status": status,
+        "duration": "day",
+        "price": 100.0,
+        "avg_fill_price": 100.0 if exec_quantity else 0.0,
+        "exec_quantity": exec_quantity,
+        "last_fill_price": 100.0 if exec_quantity else 0.0,
+        "last_fill_quantity": exec_quantity,
+        "remaining_quantity": 10.0 - exec_quantity,
+        "create_date": "2021-10-08T14:30:00.000Z",
+        "transaction_date": "2021-10-08T14:30:00.000Z",
+        "class": "equity",
+    }
+    order.update(fields)
+    return order
+
+
+@pytest.fixture
+def book(stub):
+    orders = []
+    stub.route(
+        "GET",
+        "/v1/accounts/VA000000/orders",
+        lambda r: (
+            200,
+            {"orders": {"order": [dict(o) for o in orders]} if orders else "null"},
+        ),
+    )
+    return orders
+
+
+def test_refresh_reports_changes(api, book):
+    tracker = OrderTracker(api)
+    assert tracker.refresh() == []
+
+    book[:] = [_order(1, "SPY", "open"), _order(2, "AAPL", "pending")]
+    changes = tracker.refresh()
+    assert [(c.kind, c.order.id) for c in changes] == [("new", 1), ("new", 2)]
+    assert all(isinstance(c.order, Order) and c.previous is None for c in changes)
+    first = tracker.get(1)
+
+    book[1] = _order(2, "AAPL", "open")
+    assert [(c.kind, c.order.id) for c in tracker.refresh()] == [("updated", 2)]
+    assert tracker.get(1) is first
+
+    book[0] = _order(1, "SPY", "partially_filled", 4.0)
+    book[1] = _order(2, "AAPL", "canceled")
+    changes = tracker.refresh()
+    assert [(c.kind, c.order.id) for c in changes] == [
+        ("partial_fill", 1),
+        ("canceled", 2),
+    ]
+    assert changes[0].previous is first
+
+    book[0] = _order(1, "SPY", "filled", 10.0)
+    assert [c.kind for c in tracker.refresh()] == ["filled"]
+    assert tracker.refresh() == []
+    assert [o.id for o in tracker.by_status("filled")] == [1]
+
+
+def test_open_orders_by_symbol(api, book):
+    tracker = OrderTracker(api)
+    book[:] = [
+        _order(1, "SPY", "open"),
+        _order(2, "SPY", "partially_filled", 5.0),
+        _order(3, "SPY", "filled", 10.0),
+        _order(
+            4, "SPY", "open", option_symbol="SPY211015C00440000", **{"class": "option"}
+        ),
+    ]
+    tracker.refresh()
+    assert [o.id for o in tracker.open_orders("SPY")] == [1, 2, 4]
+    assert [o.id for o in tracker.open_orders("SPY211015C00440000")] == [4]
+    assert tracker.open_orders("AAPL") == []
+
+    book[:] = [_order(1, "SPY", "canceled"), _order(2, "SPY", "filled", 10.0)]
+    tracker.refresh()
+    assert tracker.open_orders("SPY") == []
+    assert tracker.open_orders("SPY211015C00440000") == []
+    assert len(tracker) == 2
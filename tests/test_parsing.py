@@ -0,0 +1,164 @@
+from datetime import datetime
+
+import pytest
+
+from tradier_python import TradierAPI
+from tradier_python.models import *
+from tradier_python.parsing import construct, get_decoder, orjson, parse_response
+
+
+def order_payload(**fields):
+    order = {
+        "id": 228175,
+        "type": "limit",
+        "symbol": "SPY",
+        "side": "buy",
+        "quantity": 1.0,
+        "status": "open",
+        "duration": "day",
+        "price": 1.0,
+        "avg_fill_price": 0.0,
+        "exec_quantity": 0.0,
+        "last_fill_price": 0.0,
+        "last_fill_quantity": 0.0,
+        "remaining_quantity": 1.0,
+        "create_date": "2021-10-08T15:00:00.000Z",
+        "transaction_date": "2021-10-08T15:00:00.000Z",
+        "class": "equity",
+        "tag": "rebalance-1",
+    }
+    order.update(fields)
+    return order
+
+
+def test_construct_matches_full(make_option):
+    greeks = {
+        "delta": 0.5,
+        "gamma": 0.01,
+        "theta": -0.1,
+        "vega": 0.2,
+        "rho": 0.05,
+        "phi": -0.05,
+        "bid_iv": 0.2,
+        "mid_iv": 0.21,
+        "ask_iv": 0.22,
+        "smv_vol": 0.21,
+        "updated_at": "2022-06-01 15:00:00",
+    }
+    data = {
+        "options": {
+            "option": [make_option("SPY", "2022-06-17", 400.0, "call", greeks=greeks)]
+        }
+    }
+    full = parse_response("full", MarketsAPIResponse, data, "options", "option")
+    fast = parse_response("construct", MarketsAPIResponse, data, "options", "option")
+
+    assert isinstance(fast[0], Quote)
+    assert isinstance(fast[0].greeks, Greeks)
+    assert fast[0].greeks.delta == full[0].greeks.delta
+    assert fast[0].strike == full[0].strike
+    assert fast[0].root_symbols == full[0].root_symbols
+    # values are not converted in construct mode
+    assert isinstance(full[0].bid_date, datetime)
+    assert fast[0].bid_date == data["options"]["option"][0]["bid_date"]
+
+
+def test_construct_aliases_and_singletons():
+    data = {"orders": {"order": order_payload()}}
+    orders = construct(AccountsAPIResponse, data).orders.order
+    assert len(orders) == 1
+    assert orders[0].order_class == "equity"
+    assert orders[0].leg is None
+
+    positions = construct(Positions, {})
+    assert positions.position == []
+    assert positions.position is not construct(Positions, {}).position
+
+
+def test_raw_mode_path():
+    data = {"calendar": {"month": 6, "year": 2022, "days": {"day": []}}}
+    assert (
+        parse_response("raw", MarketsAPIResponse, data, "calendar", "days", "day") == []
+    )
+    assert parse_response("raw", MarketsAPIResponse, {}, "securities", "x") is None
+
+
+def test_invalid_mode():
+    with pytest.raises(ValueError):
+        TradierAPI(token="token", validate="fast")
+
+
+@pytest.mark.parametrize("mode", ["full", "construct", "raw"])
+def test_client_modes(make_api, stub, make_quote, mode):
+    t = make_api(validate=mode)
+    stub.route(
+        "GET",
+        "/v1/markets/quotes",
+        lambda r: (200, {"quotes": {"quote": make_quote("SPY")}}),
+    )
+    stub.route(
+        "POST",
+        "/v1/accounts/VA1/orders",
+        lambda r: (200, {"errors": {"error": "Backoffice rejected override."}}),
+    )
+
+    quotes = t.get_quotes("SPY")
+    symbol = quotes[0]["symbol"] if mode == "raw" else quotes[0].symbol
+    assert symbol == "SPY"
+
+    from tradier_python.tradier_api import TradierOrderError
+
+    with pytest.raises(TradierOrderError) as exc:
+        t.order_equity("SPY", "buy", 1, "market", "day", account_id="VA1")
+    assert exc.value.errors == ["Backoffice rejected override."]
+
+
+@pytest.mark.parametrize("mode", ["full", "construct", "raw"])
+def test_empty_and_singleton_lists(mode):
+    def parse(data, *path):
+        return parse_response(mode, AccountsAPIResponse, data, *path)
+
+    assert parse({"positions": "null"}, "positions", "position") == []
+    assert parse({"orders": []}, "orders", "order") == []
+    assert parse({"history": {"event": None}}, "history", "event") == []
+
+    data = {"orders": {"order": order_payload()}}
+    (order,) = parse(data, "orders", "order")
+    assert isinstance(data["orders"]["order"], dict)  # the response is not modified
+    order_id = order["id"] if mode == "raw" else order.id
+    assert order_id == data["orders"]["order"]["id"]
+
+
+def test_single_leg_order():
+    leg = {
+        "id": 2,
+        "type": "market",
+        "symbol": "SPY",
+        "side": "buy_to_open",
+        "quantity": 1.0,
+        "status": "filled",
+        "duration": "day",
+        "price": None,
+        "avg_fill_price": 1.0,
+        "exec_quantity": 1.0,
+        "last_fill_price": 1.0,
+        "last_fill_quantity": 1.0,
+        "remaining_quantity": 0.0,
+        "create_date": "2021-10-08T14:30:00.000Z",
+        "transaction_date": "2021-10-08T14:30:00.000Z",
+        "class": "option",
+        "option_symbol": "SPY211015C00440000",
+    }
+    order = Order(**order_payload(leg=leg))
+    assert [l.option_symbol for l in order.leg] == ["SPY211015C00440000"]
+
+
+def test_decoder():
+    body = b'{"clock": null}'
+    assert get_decoder("json")(body) == {"clock": None}
+    assert get_decoder(lambda b: {"decoded": b})(body) == {"decoded": body}
+    with pytest.raises(ValueError):
+        get_decoder("ujson")
+    if orjson is not None:
+        assert get_decoder() is orjson.loads
+        assert get_decoder("orjson")(body) == {"clock": None}
@@ -0,0 +1,128 @@
+import asyncio
+import time
+from urllib.parse import parse_qs
+
+import pytest
+
+from tradier_python import AsyncQuoteWatcher, AsyncTradierAPI, QuoteWatcher
+from tradier_python.quote_watcher import QuoteTable
+
+
+@pytest.fixture
+def market(stub, make_quote):
+    """current quotes by symbol, served by the stubbed quotes endpoint"""
+    quotes = {}
+
+    def handler(request):
+        symbols = stub.query(request)["symbols"].split(",")
+        found = [dict(quotes[s]) for s in symbols if s in quotes]
+        return 200, {"quotes": {"quote": found}}
+
+    stub.route("POST", "/v1/markets/quotes", handler)
+    for symbol in ("SPY", "QQQ", "IWM"):
+        quotes[symbol] = make_quote(symbol)
+    return quotes
+
+
+def test_quote_table():
+    table = QuoteTable(("bid", "ask"))
+    for symbol in ("A", "B", "C"):
+        table.add(symbol)
+    assert table.update({"symbol": "B", "bid": 1.0}) == {"bid": 1.0}
+    assert table.update({"symbol": "B", "bid": 1.0}) == {}
+    assert table.update({"symbol": "C", "bid": 2.0, "ask": 2.5}) == {
+        "bid": 2.0,
+        "ask": 2.5,
+    }
+    assert table.update({"symbol": "C", "ask": 2.5}) == {"bid": None}
+    assert table.update({"symbol": "D", "bid": 1.0}) is None
+
+    table.remove("A")
+    assert table.symbols == ["C", "B"] and "A" not in table
+    assert table.get("C") == {"bid": None, "ask": 2.5}
+    assert table.get("B") == {"bid": 1.0, "ask": None}
+    table.remove("B")
+    assert len(table) == 1 and len(table.columns[0]) == 1
+
+
+def test_quote_watcher(api, stub, market):
+    watcher = QuoteWatcher(api, batch_size=2)
+    seen = {"a": [], "b": []}
+    a = watcher.subscribe(seen["a"].append, ["spy", "QQQ"])
+    watcher.subscribe(seen["b"].append, "QQQ,IWM")
+
+    first = watcher.refresh()
+    assert sorted(c.symbol for c in first) == ["IWM", "QQQ", "SPY"]
+    assert set(first[0].changed) == {
+        "bid",
+        "ask",
+        "last",
+        "bidsize",
+        "asksize",
+        "volume",
+    }
+    assert len(stub.requests) == 2
+    assert sorted(
+        s for r in stub.requests for s in stub.query(r)["symbols"].split(",")
+    ) == ["IWM", "QQQ", "SPY"]
+
+    assert watcher.refresh() == []
+    market["QQQ"]["bid"] = 99.97
+    market["IWM"]["last"] = 101.0
+    changes = watcher.refresh()
+    assert sorted(changes) == [("IWM", {"last": 101.0}), ("QQQ", {"bid": 99.97})]
+    assert seen["a"][-1] == [("QQQ", {"bid": 99.97})]
+    assert sorted(seen["b"][-1]) == sorted(changes)
+    assert len(seen["a"]) == 2 and len(seen["b"]) == 2
+    assert watcher.snapshot("qqq")["bid"] == 99.97
+
+    late = []
+    watcher.subscribe(late.append, ["QQQ", "DIA"])
+    (snapshot,) = late
+    assert snapshot == [("QQQ", watcher.snapshot("QQQ"))]
+    assert snapshot[0].changed["bid"] == 99.97
+
+    watcher.unsubscribe(a)
+    assert sorted(watcher.symbols) == ["DIA", "IWM", "QQQ"] and "SPY" not in watcher
+
+
+def test_quote_watcher_thread(api, market):
+    watcher = QuoteWatcher(api, interval=0.01)
+
+    def broken(changes):
+        raise ValueError("broken")
+
+    watcher.subscribe(broken, ["SPY"])
+    with pytest.warns(RuntimeWarning, match="broken"):
+        watcher.start()
+        deadline = time.monotonic() + 5
+        while watcher.polls < 3 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        watcher.stop()
+    assert watcher.polls >= 3 and watcher.last_error is None
+
+
+def test_async_quote_watcher(make_quote):
+    httpx = pytest.importorskip("httpx")
+    bids = iter([1.0, 1.0, 2.0])
+
+    def handler(request):
+        symbols = parse_qs(request.content.decode())["symbols"][0].split(",")
+        quotes = [make_quote(s, bid=next(bids)) for s in symbols]
+        return httpx.Response(200, json={"quotes": {"quote": quotes}})
+
+    async def main():
+        t = AsyncTradierAPI("token", transport=httpx.MockTransport(handler))
+        watcher = AsyncQuoteWatcher(t, interval=0.01)
+        seen = []
+        watcher.subscribe(seen.append, ["SPY"])
+        task = asyncio.create_task(watcher.run())
+        while watcher.polls < 3:
+            await asyncio.sleep(0.01)
+        task.cancel()
+        await t.aclose()
+        return seen
+
+    seen = asyncio.run(main())
+    assert len(seen) == 2
+    assert seen[1] == [("SPY", {"bid": 2.0})]
@@ -0,0 +1,73 @@
+from tradier_python.models import *
+from tradier_python.tradier_api import chunked, split_symbols
+
+
+def quotes_handler(stub, make_quote, unmatched=("XXXX",)):
+    def handler(request):
+        symbols = stub.query(request)["symbols"].split(",")
+        quotes = [make_quote(s) for s in reversed(symbols) if s not in unmatched]
+        body = {"quote": quotes}
+        missing = [s for s in symbols if s in unmatched]
+        if missing:
+            body["unmatched_symbols"] = {
+                "symbol": missing[0] if len(missing) == 1 else missing
+            }
+        return 200, {"quotes": body}
+
+    return handler
+
+
+def test_split_symbols():
+    assert split_symbols("SPY, qqq,,SPY") == ["SPY", "qqq"]
+    assert split_symbols(iter(["A", "B", "a"])) == ["A", "B"]
+    assert chunked([1, 2, 3, 4, 5], 2) == [[1, 2], [3, 4], [5]]
+
+
+def test_get_quotes_single_request(api, stub, make_quote):
+    stub.route("GET", "/v1/markets/quotes", quotes_handler(stub, make_quote))
+    quotes = api.get_quotes("SPY,QQQ")
+    assert [q.symbol for q in quotes] == ["SPY", "QQQ"]
+    assert len(stub.requests) == 1
+    assert stub.requests[0].method == "GET"
+
+
+def test_get_quotes_batches_in_input_order(api, stub, make_quote):
+    stub.route("POST", "/v1/markets/quotes", quotes_handler(stub, make_quote))
+    symbols = [f"S{i}" for i in range(25)] + ["XXXX"] + ["T1", "T2"]
+    res = api.get_quotes_batched(symbols, batch_size=10, max_workers=3)
+
+    assert [q.symbol for q in res.quotes] == [s for s in symbols if s != "XXXX"]
+    assert res.unmatched_symbols.symbol == ["XXXX"]
+    assert len(stub.requests) == 3
+    assert all(r.method == "POST" for r in stub.requests)
+    assert all("symbols" not in r.url for r in stub.requests)
+
+
+def test_get_quotes_unmatched_across_batches(api, stub, make_quote):
+    stub.route(
+        "POST",
+        "/v1/markets/quotes",
+        quotes_handler(stub, make_quote, unmatched=("BAD1", "BAD2")),
+    )
+    res = api.get_quotes_batched(["A", "BAD1", "B", "BAD2"], batch_size=2)
+    assert [q.symbol for q in res.quotes] == ["A", "B"]
+    assert res.unmatched_symbols.symbol == ["BAD1", "BAD2"]
+
+
+def test_get_quotes_raw_without_matches(make_api, stub, make_quote):
+    def handler(request):
+        symbols = stub.query(request)["symbols"].split(",")
+        if symbols == ["ZZZZ"]:
+            return 200, {"quotes": {"unmatched_symbols": {"symbol": "ZZZZ"}}}
+        if symbols == ["YYYY"]:
+            return 200, {"quotes": "null"}
+        return 200, {"quotes": {"quote": make_quote(symbols[0])}}
+
+    stub.route("GET", "/v1/markets/quotes", handler)
+    stub.route("POST", "/v1/markets/quotes", handler)
+    api = make_api(validate="raw")
+    assert api.get_quotes("ZZZZ") == []
+    assert api.get_quotes("YYYY") == []
+    res = api.get_quotes_batched(["SPY", "ZZZZ", "YYYY"], batch_size=1)
+    assert [q["symbol"] for q in res["quote"]] == ["SPY"]
+    assert res["unmatched_symbols"] == {"symbol": ["ZZZZ"]}
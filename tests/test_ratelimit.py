@@ -0,0 +1,74 @@
+import time
+
+import pytest
+
+from tradier_python import TradierAPI, TradierAPIError
+from tradier_python.ratelimit import RateLimiter, TokenBucket
+
+
+def ratelimit_headers(allowed, available, seconds_left):
+    return {
+        "X-Ratelimit-Allowed": str(allowed),
+        "X-Ratelimit-Used": str(allowed - available),
+        "X-Ratelimit-Available": str(available),
+        "X-Ratelimit-Expiry": str(int((time.time() + seconds_left) * 1000)),
+    }
+
+
+def test_category():
+    assert RateLimiter.category("GET", "/v1/markets/quotes") == "market"
+    assert RateLimiter.category("POST", "/v1/markets/quotes") == "market"
+    assert RateLimiter.category("POST", "/v1/accounts/VA1/orders") == "trading"
+    assert RateLimiter.category("DELETE", "/v1/accounts/VA1/orders/1") == "trading"
+    assert RateLimiter.category("GET", "/v1/accounts/VA1/orders") == "standard"
+    assert RateLimiter.category("GET", "/v1/user/profile") == "standard"
+
+
+def test_bucket_queues_when_empty():
+    bucket = TokenBucket(limit=2, window=60.0)
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == pytest.approx(30.0, rel=0.01)
+    assert bucket.reserve() == pytest.approx(60.0, rel=0.01)
+
+
+def test_bucket_spreads_remaining_quota():
+    bucket = TokenBucket(limit=120, window=60.0)
+    bucket.update(allowed=120, available=10, expiry=time.time() + 20)
+    assert bucket.tokens == 10
+    assert bucket.rate == pytest.approx(0.5, rel=0.01)
+
+
+def test_market_burst_does_not_delay_trading():
+    limiter = RateLimiter({"market": 1, "trading": 1})
+    limiter.reserve("GET", "/v1/markets/quotes")
+    assert limiter.reserve("GET", "/v1/markets/quotes") > 0
+    assert limiter.reserve("POST", "/v1/accounts/VA1/orders") == 0
+
+
+def test_client_updates_from_headers(make_api, stub):
+    limiter = RateLimiter()
+    t = make_api(rate_limiter=limiter)
+    stub.route(
+        "GET",
+        "/v1/markets/clock",
+        lambda r: (200, {"clock": None}, ratelimit_headers(60, 5, 30)),
+    )
+    t.get_clock()
+    market = limiter.buckets["market"]
+    assert market.capacity == 60
+    assert market.tokens <= 5
+    assert limiter.buckets["standard"].capacity == 120
+
+
+def test_throttled_response_exhausts_bucket(make_api, stub):
+    limiter = RateLimiter()
+    t = make_api(rate_limiter=limiter)
+    stub.route(
+        "GET",
+        "/v1/markets/clock",
+        lambda r: (429, {"error": "quota"}, ratelimit_headers(60, 0, 10)),
+    )
+    with pytest.raises(TradierAPIError):
+        t.get_clock()
+    assert limiter.reserve("GET", "/v1/markets/clock") > 5
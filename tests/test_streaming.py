@@ -0,0 +1,344 @@
+import asyncio
+import itertools
+import json
+import threading
+import time
+
+import pytest
+import requests
+
+from tradier_python import TradierAPI, TradierAPIError
+from tradier_python.local_server import LocalStreamServer, LocalTradierServer
+from tradier_python.streaming import (
+    ACCOUNT_SESSION_PATH,
+    MARKET_SESSION_PATH,
+    AccountStream,
+    EventParser,
+    MarketStream,
+    StreamQuote,
+    StreamSummary,
+    StreamTrade,
+)
+
+
+def test_parser_handles_split_chunks():
+    data = (
+        b'{"type":"quote","symbol":"SPY","bid":281.84,"bidsz":60,"bidexch":"M",'
+        b'"biddate":"1557757189000","ask":281.85,"asksz":6,"askexch":"Z","askdate":"1557757190000"}\n'
+        b'{"type":"trade","symbol":"SPY","exch":"J","price":"281.85","size":"100","cvol":"30178960",'
+        b'"date":"1557757190000","last":"281.85"}'
+        b'{"type":"summary","symbol":"SPY","open":"282.42","high":"283.49","low":"281.53",'
+        b'"prevClose":"288.1"}\n'
+    )
+    parser = EventParser()
+    events = []
+    for i in range(0, len(data), 7):
+        events.extend(parser.feed(data[i : i + 7]))
+
+    assert [type(e) for e in events] == [StreamQuote, StreamTrade, StreamSummary]
+    assert events[0].bid == 281.84 and events[0].askdate == 1557757190000
+    assert events[1].price == 281.85 and events[1].cvol == 30178960
+    assert events[2].prev_close == 288.1
+
+
+def test_parser_keeps_multibyte_characters():
+    parser = EventParser(convert=dict)
+    data = '{"type":"x","note":"é"}'.encode("utf-8")
+    assert parser.feed(data[:-3]) == []
+    assert parser.feed(data[-3:]) == [{"type": "x", "note": "é"}]
+
+
+@pytest.fixture
+def server():
+    with LocalStreamServer() as server:
+        yield server
+
+
+def test_market_stream(server):
+    t = TradierAPI(token="token", endpoint=server.url)
+    stream = MarketStream(t, ["SPY", "QQQ"], event_filter=["quote", "trade"])
+    events = list(itertools.islice(stream, 20))
+    stream.close()
+
+    assert {e.symbol for e in events} == {"SPY", "QQQ"}
+    assert {type(e) for e in events} == {StreamQuote, StreamTrade}
+    assert server.connections == [["SPY", "QQQ"]]
+
+
+def test_market_stream_reconnects():
+    with LocalStreamServer(max_events=5) as server:
+        t = TradierAPI(token="token", endpoint=server.url)
+        stream = MarketStream(t, ["SPY"], reconnect_delay=0.01)
+        events = list(itertools.islice(stream, 12))
+        stream.close()
+
+    assert len(events) == 12
+    assert stream.reconnects == 2
+    assert len(server.sessions) == 3
+
+
+def test_market_stream_subscribe(server):
+    t = TradierAPI(token="token", endpoint=server.url)
+    stream = MarketStream(t, ["SPY"])
+    seen = set()
+    for n, event in enumerate(stream):
+        seen.add(event.symbol)
+        if n == 5:
+            threading.Thread(target=stream.subscribe, args=("IWM",)).start()
+        if "IWM" in seen:
+            stream.unsubscribe("SPY")
+            break
+    for event in itertools.islice(stream, 5):
+        assert event.symbol == "IWM"
+    stream.close()
+    assert server.connections[:2] == [["SPY"], ["SPY", "IWM"]]
+    assert server.connections[-1] == ["IWM"]
+
+
+def test_async_market_stream(server):
+    pytest.importorskip("httpx")
+    from tradier_python import AsyncTradierAPI
+    from tradier_python.streaming import AsyncMarketStream
+
+    async def run():
+        async with AsyncTradierAPI(token="token", endpoint=server.url) as t:
+            stream = AsyncMarketStream(t, ["SPY"], event_filter=["trade"])
+            events = []
+            async for event in stream:
+                events.append(event)
+                if len(events) == 3:
+                    stream.subscribe("QQQ")
+                if len(events) == 10:
+                    stream.close()
+            return events
+
+    events = asyncio.run(asyncio.wait_for(run(), 10))
+    assert len(events) == 10
+    assert all(isinstance(e, StreamTrade) for e in events)
+    assert server.connections[-1] == ["SPY", "QQQ"]
+
+
+def test_market_stream_raises_permanent_errors():
+    with LocalTradierServer() as server:
+        t = TradierAPI(token="token", endpoint=server.url)
+        stream = MarketStream(t, ["SPY"], reconnect_delay=0.01)
+        with pytest.raises(TradierAPIError) as exc:
+            next(iter(stream))
+        assert exc.value.code == 404 and stream.last_error is exc.value
+
+    session = {"stream": {"url": None, "sessionid": "abc"}}
+    with LocalTradierServer({MARKET_SESSION_PATH: session}) as server:
+        session["stream"]["url"] = server.url + "v1/markets/events"
+        t = TradierAPI(token="token", endpoint=server.url)
+        with pytest.raises(requests.HTTPError):
+            next(iter(MarketStream(t, ["SPY"], reconnect_delay=0.01)))
+
+
+def test_market_stream_retries_server_errors():
+    with LocalTradierServer(error_rate=1.0) as server:
+        t = TradierAPI(token="token", endpoint=server.url)
+        stream = MarketStream(t, ["SPY"], reconnect_delay=0.01)
+        thread = threading.Thread(target=lambda: list(stream))
+        thread.start()
+        while stream.reconnects < 3:
+            time.sleep(0.01)
+        stream.close()
+        thread.join(5)
+    assert not thread.is_alive()
+    assert stream.last_error.code == 503
+
+
+def test_async_market_stream_raises_permanent_errors():
+    pytest.importorskip("httpx")
+    from tradier_python import AsyncTradierAPI
+    from tradier_python.streaming import AsyncMarketStream
+
+    async def run(url):
+        async with AsyncTradierAPI(token="token", endpoint=url) as t:
+            stream = AsyncMarketStream(t, ["SPY"], reconnect_delay=0.01)
+            with pytest.raises(TradierAPIError):
+                async for _ in stream:
+                    pass
+            return stream
+
+    with LocalTradierServer() as server:
+        stream = asyncio.run(asyncio.wait_for(run(server.url), 10))
+    assert stream.last_error.code == 404
+
+
+def _order(id, status, exec_quantity, **fields):
+    order = {
+        "id": id,
+        "type": "limit",
+        "symbol": "SPY",
+        "side": "buy",
+        "quantity": 10.0,
+        "status": status,
+        "duration": "day",
+        "price": 400.0,
+        "avg_fill_price": 400.0 if exec_quantity else 0.0,
+        "exec_quantity": exec_quantity,
+        "last_fill_price": 400.0 if exec_quantity else 0.0,
+        "last_fill_quantity": exec_quantity,
+        "remaining_quantity": 10.0 - exec_quantity,
+        "create_date": "2021-10-08T14:30:00.000Z",
+        "transaction_date": "2021-10-08T14:30:00.000Z",
+        "class": "equity",
+    }
+    order.update(fields)
+    return order
+
+
+def _order_event(id, status, executed):
+    return json.dumps(
+        {
+            "id": id,
+            "event": "order",
+            "status": status,
+            "type": "limit",
+            "price": 400.0,
+            "stop_price": 0.0,
+            "avg_fill_price": 400.0,
+            "executed_quantity": executed,
+            "last_fill_quantity": executed,
+            "remaining_quantity": 10.0 - executed,
+            "transaction_date": "2021-10-08T14:31:00.000Z",
+            "create_date": "2021-10-08T14:30:00.000Z",
+            "account": "VA000000",
+        }
+    )
+
+
+def test_account_stream_yields_deltas(api, stub):
+    ws_server = pytest.importorskip("websockets.sync.server")
+    subscriptions = []
+
+    def handler(websocket):
+        subscriptions.append(json.loads(websocket.recv()))
+        websocket.send(json.dumps({"event": "heartbeat"}))
+        websocket.send(_order_event(1, "open", 0.0))
+        websocket.send(_order_event(1, "partially_filled", 4.0))
+        websocket.send(_order_event(1, "partially_filled", 4.0))
+        websocket.send(_order_event(2, "filled", 10.0))
+        websocket.recv()
+
+    with ws_server.serve(handler, "127.0.0.1", 0) as server:
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        url = f"ws://127.0.0.1:{server.socket.getsockname()[1]}"
+        stub.route(
+            "POST",
+            ACCOUNT_SESSION_PATH,
+            lambda r: (200, {"stream": {"url": url, "sessionid": "abc"}}),
+        )
+        stub.route(
+            "GET",
+            "/v1/accounts/VA000000/orders",
+            lambda r: (200, {"orders": {"order": _order(1, "open", 0.0)}}),
+        )
+        stream = AccountStream(api)
+        events = list(itertools.islice(stream, 2))
+        stream.close()
+        server.shutdown()
+
+    assert subscriptions == [{"events": ["order"], "sessionid": "abc"}]
+    assert [(e.id, e.status, e.executed_quantity) for e in events] == [
+        (1, "partially_filled", 4.0),
+        (2, "filled", 10.0),
+    ]
+    assert {e.source for e in events} == {"stream"}
+    assert stream.orders[2].remaining_quantity == 0.0
+    assert stream.polls == 1
+
+
+def test_account_stream_falls_back_to_polling(api, stub):
+    pytest.importorskip("websockets")
+    polls = iter(
+        [
+            _order(1, "open", 0.0),
+            [_order(1, "open", 0.0), _order(2, "pending", 0.0)],
+            [_order(1, "partially_filled", 5.0), _order(2, "pending", 0.0)],
+            [_order(1, "filled", 10.0), _order(2, "canceled", 0.0)],
+        ]
+    )
+    stub.route(
+        "POST",
+        ACCOUNT_SESSION_PATH,
+        lambda r: (200, {"stream": {"url": "ws://127.0.0.1:9", "sessionid": "abc"}}),
+    )
+    stub.route(
+        "GET",
+        "/v1/accounts/VA000000/orders",
+        lambda r: (200, {"orders": {"order": next(polls)}}),
+    )
+    stream = AccountStream(api, poll_interval=0, reconnect_delay=0.01)
+    events = list(itertools.islice(stream, 4))
+    stream.close()
+
+    assert [(e.id, e.status, e.source) for e in events] == [
+        (2, "pending", "poll"),
+        (1, "partially_filled", "poll"),
+        (1, "filled", "poll"),
+        (2, "canceled", "poll"),
+    ]
+    assert stream.polls == 4
+    assert isinstance(stream.last_error, OSError)
+
+
+def test_account_stream_raises_permanent_errors(api, stub):
+    exceptions = pytest.importorskip("websockets.exceptions")
+    stub.route(
+        "GET", "/v1/accounts/VA000000/orders", lambda r: (200, {"orders": "null"})
+    )
+    stub.route("POST", ACCOUNT_SESSION_PATH, lambda r: (401, {"fault": "invalid"}))
+    stream = AccountStream(api, reconnect_delay=0.01)
+    with pytest.raises(TradierAPIError) as exc:
+        next(iter(stream))
+    assert exc.value.code == 401 and stream.last_error is exc.value
+
+    stub.route(
+        "POST",
+        ACCOUNT_SESSION_PATH,
+        lambda r: (200, {"stream": {"url": "http://127.0.0.1:9", "sessionid": "abc"}}),
+    )
+    stream = AccountStream(api, reconnect_delay=0.01)
+    with pytest.raises(exceptions.InvalidURI):
+        next(iter(stream))
+
+
+def test_async_account_stream():
+    httpx = pytest.importorskip("httpx")
+    ws_server = pytest.importorskip("websockets.asyncio.server")
+    from tradier_python import AsyncTradierAPI
+    from tradier_python.streaming import AsyncAccountStream
+
+    async def handler(websocket):
+        await websocket.recv()
+        await websocket.send(_order_event(1, "filled", 10.0))
+        await websocket.wait_closed()
+
+    async def run():
+        async with ws_server.serve(handler, "127.0.0.1", 0) as server:
+            url = f"ws://127.0.0.1:{server.sockets[0].getsockname()[1]}"
+
+            def rest(request):
+                if request.url.path == ACCOUNT_SESSION_PATH:
+                    return httpx.Response(
+                        200, json={"stream": {"url": url, "sessionid": "abc"}}
+                    )
+                return httpx.Response(
+                    200, json={"orders": {"order": _order(1, "open", 0.0)}}
+                )
+
+            t = AsyncTradierAPI(
+                token="token",
+                default_account_id="VA000000",
+                transport=httpx.MockTransport(rest),
+            )
+            stream = AsyncAccountStream(t)
+            async for event in stream:
+                await stream.close()
+            await t.aclose()
+            return event
+
+    event = asyncio.run(asyncio.wait_for(run(), 10))
+    assert (event.id, event.status, event.source) == (1, "filled", "stream")
@@ -0,0 +1,153 @@
+import asyncio
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from tradier_python import TimesalesData, TradierAPIError
+from tradier_python.parsing import JSONArrayParser
+
+
+def ticks(start: str, end: str) -> list:
+    """a tick every 10 seconds from start through end, inclusive of the whole end minute"""
+    t = datetime.strptime(start, "%Y-%m-%d %H:%M")
+    stop = datetime.strptime(end, "%Y-%m-%d %H:%M") + timedelta(minutes=1)
+    data = []
+    while t < stop:
+        data.append(
+            {
+                "time": t.isoformat(),
+                "timestamp": int(t.timestamp()),
+                "price": 100.0 + t.minute / 100,
+                "volume": 100,
+            }
+        )
+        t += timedelta(seconds=10)
+    return data
+
+
+@pytest.fixture
+def timesales(stub):
+    def handler(request):
+        params = stub.query(request)
+        return 200, {"series": {"data": ticks(params["start"], params["end"])}}
+
+    stub.route("GET", "/v1/markets/timesales", handler)
+    return lambda: [stub.query(r) for r in stub.requests]
+
+
+def test_parser_handles_split_chunks():
+    doc = json.dumps(
+        {"series": {"data": ticks("2021-10-08 09:30", "2021-10-08 09:31")}}
+    )
+    doc = doc.encode("utf-8")
+    for size in (1, 5, 64):
+        parser = JSONArrayParser("data")
+        items = []
+        for i in range(0, len(doc), size):
+            items.extend(parser.feed(doc[i : i + size]))
+        parser.close()
+        assert len(items) == 12 and items[0]["time"] == "2021-10-08T09:30:00"
+
+
+def test_parser_lone_object_and_null():
+    parser = JSONArrayParser("data")
+    assert parser.feed(b'{"series": {"data": {"time": "x"}}}') == [{"time": "x"}]
+    assert JSONArrayParser("data").feed(b'{"series": null}') == []
+    parser = JSONArrayParser("data")
+    parser.feed(b'{"series": {"data": [{"time": "x"}, {"ti')
+    with pytest.raises(ValueError):
+        parser.close()
+
+
+def test_iter_time_and_sales_windows(api, timesales):
+    records = list(
+        api.iter_time_and_sales(
+            "SPY", datetime(2021, 10, 8, 9, 30), datetime(2021, 10, 8, 12, 30)
+        )
+    )
+    assert [(q["start"], q["end"]) for q in timesales()] == [
+        ("2021-10-08 09:30", "2021-10-08 10:30"),
+        ("2021-10-08 10:30", "2021-10-08 11:30"),
+        ("2021-10-08 11:30", "2021-10-08 12:30"),
+    ]
+    assert all(isinstance(r, TimesalesData) for r in records)
+    times = [r.time for r in records]
+    assert times == sorted(set(times))
+    assert times[0] == datetime(2021, 10, 8, 9, 30)
+    assert times[-1] == datetime(2021, 10, 8, 12, 30)
+    assert len(records) == 3 * 60 * 6 + 1
+
+
+def test_iter_time_and_sales_normalizes_bounds(api, timesales):
+    start = datetime(2021, 10, 8, 9, 30, 15, 500, tzinfo=timezone.utc)
+    records = list(
+        api.iter_time_and_sales(
+            "SPY", start, start + timedelta(hours=1), window=timedelta(minutes=20)
+        )
+    )
+    assert timesales()[0]["start"] == "2021-10-08 09:30"
+    times = [r.time for r in records]
+    assert times == sorted(set(times))
+    assert times[0] == datetime(2021, 10, 8, 9, 30)
+    assert times[-1] == datetime(2021, 10, 8, 10, 30)
+    assert len(records) == 60 * 6 + 1
+
+
+def test_iter_time_and_sales_chunks(make_api, timesales):
+    np = pytest.importorskip("numpy")
+    api = make_api(validate="raw")
+    chunks = list(
+        api.iter_time_and_sales(
+            "SPY",
+            datetime(2021, 10, 8, 9, 30),
+            datetime(2021, 10, 8, 10, 0),
+            window=timedelta(minutes=10),
+            chunk_size=50,
+        )
+    )
+    assert [len(c["time"]) for c in chunks] == [50, 50, 50, 31]
+    assert chunks[0]["time"].dtype == np.dtype("datetime64[s]")
+    assert np.isnan(chunks[0]["open"]).all()
+    assert chunks[-1]["time"][-1] == np.datetime64("2021-10-08T10:00:00")
+
+
+def test_iter_time_and_sales_raises_errors(api, stub, timesales):
+    def handler(request):
+        if stub.query(request)["start"] == "2021-10-08 10:30":
+            return 400, {"error": "bad window"}
+        return 200, {"series": {"data": ticks("2021-10-08 09:30", "2021-10-08 09:35")}}
+
+    stub.route("GET", "/v1/markets/timesales", handler)
+    records = api.iter_time_and_sales(
+        "SPY", datetime(2021, 10, 8, 9, 30), datetime(2021, 10, 8, 12, 30)
+    )
+    assert next(records).time == datetime(2021, 10, 8, 9, 30)
+    with pytest.raises(TradierAPIError):
+        list(records)
+
+
+def test_async_iter_time_and_sales():
+    httpx = pytest.importorskip("httpx")
+    from tradier_python import AsyncTradierAPI
+
+    def handler(request):
+        params = request.url.params
+        return httpx.Response(
+            200, json={"series": {"data": ticks(params["start"], params["end"])}}
+        )
+
+    async def run():
+        async with AsyncTradierAPI(
+            token="token", transport=httpx.MockTransport(handler)
+        ) as t:
+            return [
+                r
+                async for r in t.iter_time_and_sales(
+                    "SPY", datetime(2021, 10, 8, 9, 30), datetime(2021, 10, 8, 11, 30)
+                )
+            ]
+
+    records = asyncio.run(run())
+    assert len(records) == 2 * 60 * 6 + 1
+    assert len({r.time for r in records}) == len(records)
@@ -0,0 +1,136 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from tradier_python import AsyncTradierAPI, TradierAPI, TradierAPIError
+from tradier_python.local_server import LocalTradierServer
+from tradier_python.transport import AsyncRecordingTransport, Cassette, RecordingAdapter
+
+POSITIONS = {
+    "positions": {
+        "position": {
+            "cost_basis": 207.01,
+            "date_acquired": "2018-08-08T14:41:11.405Z",
+            "id": 130089,
+            "quantity": 1.0,
+            "symbol": "AAPL",
+        }
+    }
+}
+
+
+def interaction(method, path, params, body, status=200):
+    return {
+        "method": method,
+        "path": path,
+        "params": params,
+        "status": status,
+        "headers": {},
+        "body": body,
+    }
+
+
+def test_record_and_replay(tmp_path):
+    upstream = {"/v1/accounts/6YA05708/positions": POSITIONS}
+    cassette = Cassette()
+    with LocalTradierServer(upstream) as server:
+        adapter = RecordingAdapter(cassette, redact={"6YA05708": "VA000000"})
+        t = TradierAPI("token", "6YA05708", endpoint=server.url, transport=adapter)
+        recorded = t.get_positions()
+        with pytest.raises(TradierAPIError):
+            t.get_clock()
+    assert [(i["path"], i["status"]) for i in cassette.interactions] == [
+        ("/v1/accounts/VA000000/positions", 200),
+        ("/v1/markets/clock", 404),
+    ]
+
+    path = tmp_path / "cassette.json"
+    cassette.save(path)
+    with LocalTradierServer(cassette=Cassette.load(path)) as server:
+        t = TradierAPI("token", "VA000000", endpoint=server.url)
+        assert t.get_positions() == recorded
+        with pytest.raises(TradierAPIError) as exc:
+            t.get_clock()
+        assert exc.value.code == 404
+
+
+def test_cassette_replays_in_order():
+    cassette = Cassette(
+        [
+            interaction("GET", "/v1/markets/quotes", {"symbols": "SPY"}, {"n": 1}),
+            interaction("GET", "/v1/markets/quotes", {"symbols": "SPY"}, {"n": 2}),
+            interaction("GET", "/v1/markets/quotes", {"symbols": "QQQ"}, {"n": 3}),
+        ]
+    )
+    spy = {"symbols": "SPY"}
+    assert cassette.find("GET", "/v1/markets/quotes", spy)["body"] == {"n": 1}
+    assert cassette.find("GET", "/v1/markets/quotes", spy)["body"] == {"n": 2}
+    assert cassette.find("GET", "/v1/markets/quotes", spy)["body"] == {"n": 2}
+    other = {"symbols": "IWM"}
+    assert cassette.find("GET", "/v1/markets/quotes", other) is None
+    assert cassette.find("POST", "/v1/markets/quotes", spy) is None
+    cassette.rewind()
+    assert cassette.find("GET", "/v1/markets/quotes", spy)["body"] == {"n": 1}
+
+    cassette.match_params = False
+    assert cassette.find("GET", "/v1/markets/quotes", other)["body"] == {"n": 1}
+    assert cassette.find("POST", "/v1/markets/quotes", spy) is None
+
+
+def test_server_simulates_production():
+    responses = {"/v1/markets/clock": {"clock": None}}
+    with LocalTradierServer(responses, rate_limits={"market": 5}) as server:
+        t = TradierAPI("token", endpoint=server.url)
+        codes = []
+        for _ in range(7):
+            try:
+                t.get("/v1/markets/clock", {})
+                codes.append(200)
+            except TradierAPIError as e:
+                codes.append(e.code)
+        assert codes == [200] * 5 + [429] * 2
+        response = t.session.get(server.url + "v1/markets/clock")
+        assert response.headers["X-Ratelimit-Allowed"] == "5"
+        assert response.headers["X-Ratelimit-Available"] == "0"
+
+    def statuses(seed):
+        with LocalTradierServer(responses, error_rate=0.3, seed=seed) as server:
+            for _ in range(50):
+                TradierAPI("token", endpoint=server.url).session.get(
+                    server.url + "v1/markets/clock"
+                )
+            return server.statuses
+
+    assert statuses(1) == statuses(1)
+    assert 0 < statuses(1)[503] < 50
+
+    with LocalTradierServer(responses, latency=(0.02, 0.03)) as server:
+        start = time.perf_counter()
+        TradierAPI("token", endpoint=server.url).get("/v1/markets/clock", {})
+        assert time.perf_counter() - start >= 0.02
+
+
+def test_async_recording_transport():
+    def handler(request):
+        return httpx.Response(200, json=POSITIONS)
+
+    cassette = Cassette()
+
+    async def main():
+        transport = AsyncRecordingTransport(
+            cassette,
+            redact={"6YA05708": "VA000000"},
+            transport=httpx.MockTransport(handler),
+        )
+        t = AsyncTradierAPI("token", "6YA05708", transport=transport)
+        positions = await t.get_positions()
+        await t.aclose()
+        return positions
+
+    positions = asyncio.run(main())
+    assert positions[0].symbol == "AAPL"
+    (recorded,) = cassette.interactions
+    assert recorded["path"] == "/v1/accounts/VA000000/positions"
+    assert recorded["body"] == POSITIONS